@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""Compares zlib-stream transport compression to uncompressed gateway traffic.
+
+Usage::
+
+    python benchmarks/gateway_compression.py [traffic.jsonl] [--frame-size BYTES]
+
+The traffic file holds one raw gateway payload per line, as recorded from
+a real connection. Without one, synthetic GUILD_CREATE and MESSAGE_CREATE
+dispatches are generated instead.
+"""
+
+import argparse
+import json
+import random
+import time
+import zlib
+
+from clamor.gateway.compression import ZlibStreamInflater
+
+
+def synthetic_traffic(count=2000):
+    payloads = []
+    for seq in range(count):
+        if seq % 100 == 0:
+            data = {
+                'id': str(random.getrandbits(63)),
+                'name': 'Guild {}'.format(seq),
+                'members': [
+                    {'user': {'id': str(random.getrandbits(63)), 'username': 'user{}'.format(i),
+                              'discriminator': '{:04}'.format(i % 10000), 'avatar': None},
+                     'roles': [], 'joined_at': '2019-05-01T12:00:00.000000+00:00',
+                     'deaf': False, 'mute': False}
+                    for i in range(1000)
+                ],
+            }
+            event = 'GUILD_CREATE'
+        else:
+            data = {
+                'id': str(random.getrandbits(63)),
+                'channel_id': str(random.getrandbits(63)),
+                'content': 'Message number {}'.format(seq),
+                'author': {'id': str(random.getrandbits(63)), 'username': 'someone'},
+                'embeds': [], 'attachments': [], 'mentions': [],
+            }
+            event = 'MESSAGE_CREATE'
+
+        payloads.append(json.dumps({'op': 0, 's': seq, 't': event, 'd': data}).encode('utf-8'))
+
+    return payloads
+
+
+def compress_traffic(payloads, frame_size):
+    compressor = zlib.compressobj()
+    messages = []
+    for payload in payloads:
+        data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        messages.append([data[i:i + frame_size] for i in range(0, len(data), frame_size)])
+
+    return messages
+
+
+def bench_plain(payloads):
+    start = time.perf_counter()
+    for payload in payloads:
+        json.loads(payload.decode('utf-8'))
+
+    return time.perf_counter() - start
+
+
+def bench_zlib(messages):
+    inflater = ZlibStreamInflater()
+
+    start = time.perf_counter()
+    for frames in messages:
+        for frame in frames:
+            message = inflater.feed(frame)
+            if message is not None:
+                json.loads(message.decode('utf-8'))
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('traffic', nargs='?', help='A file with one gateway payload per line')
+    parser.add_argument('--frame-size', type=int, default=4096,
+                        help='The maximum size of a WebSocket frame')
+    args = parser.parse_args()
+
+    if args.traffic:
+        with open(args.traffic, 'rb') as f:
+            payloads = [line.rstrip(b'\n') for line in f if line.strip()]
+    else:
+        payloads = synthetic_traffic()
+
+    messages = compress_traffic(payloads, args.frame_size)
+
+    plain_size = sum(len(p) for p in payloads)
+    zlib_size = sum(len(f) for frames in messages for f in frames)
+
+    plain_time = bench_plain(payloads)
+    zlib_time = bench_zlib(messages)
+
+    print('{} payloads'.format(len(payloads)))
+    print('uncompressed: {:>12,} bytes {:>8.3f}s'.format(plain_size, plain_time))
+    print('zlib-stream:  {:>12,} bytes {:>8.3f}s'.format(zlib_size, zlib_time))
+    print('ratio: {:.2f}x smaller, {:.2f}x decode time'.format(
+        plain_size / zlib_size, zlib_time / plain_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""Compares decoding ETF gateway payloads to decoding JSON ones.
+
+Usage::
+
+    python benchmarks/gateway_etf.py [traffic.jsonl] [--rounds N]
+
+The traffic file holds one raw JSON gateway payload per line, as recorded
+from a real connection, e.g. GUILD_CREATE and MESSAGE_CREATE dispatches.
+Every payload is also encoded as ETF to compare both formats on the same
+data. Without a traffic file, synthetic payloads are generated instead.
+"""
+
+import argparse
+import json
+import time
+
+from clamor.gateway import etf
+
+from gateway_compression import synthetic_traffic
+
+
+def bench(decode, payloads, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            decode(payload)
+
+    return time.perf_counter() - start
+
+
+def decode_json(payload):
+    # Binary frames have to be decoded first, just like on the gateway.
+    return json.loads(payload.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('traffic', nargs='?', help='A file with one gateway payload per line')
+    parser.add_argument('--rounds', type=int, default=3, help='How often to decode all payloads')
+    args = parser.parse_args()
+
+    if args.traffic:
+        with open(args.traffic, 'rb') as f:
+            payloads = [line.rstrip(b'\n') for line in f if line.strip()]
+    else:
+        payloads = synthetic_traffic()
+
+    etf_payloads = [etf.encode(decode_json(payload)) for payload in payloads]
+
+    json_size = sum(len(p) for p in payloads)
+    etf_size = sum(len(p) for p in etf_payloads)
+
+    json_time = bench(decode_json, payloads, args.rounds)
+    etf_time = bench(etf.decode, etf_payloads, args.rounds)
+
+    print('{} payloads, {} rounds'.format(len(payloads), args.rounds))
+    print('json: {:>12,} bytes {:>8.3f}s'.format(json_size, json_time))
+    print('etf:  {:>12,} bytes {:>8.3f}s'.format(etf_size, etf_time))
+
+
+if __name__ == '__main__':
+    main()
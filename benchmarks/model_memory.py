@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the memory of guild members as models to raw payloads.
+
+Usage::
+
+    python benchmarks/model_memory.py [--members N] [--roles N]
+
+Synthetic members of a single large guild are generated, serialized as
+the API would send them and then decoded, once into plain dicts and once
+into :class:`~clamor.models.Member` models. The memory each representation
+keeps alive is measured with :mod:`tracemalloc`.
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from clamor.models import Member
+from clamor.rest import json_dumps, json_loads
+
+NAMES = ('alex', 'sam', 'charlie', 'jamie', 'robin', 'kim', 'max', 'nico', 'jo', 'lou')
+
+
+def synthetic_members(count, role_count):
+    roles = [str(random.getrandbits(63)) for _ in range(role_count)]
+
+    members = []
+    for i in range(count):
+        members.append({
+            'user': {
+                'id': str(random.getrandbits(63)),
+                'username': '{}{}'.format(random.choice(NAMES), i % 500),
+                'discriminator': '{:04}'.format(random.randrange(1, 10000)),
+                'avatar': '{:032x}'.format(random.getrandbits(128)) if i % 3 else None,
+            },
+            'nick': random.choice(NAMES) if i % 4 == 0 else None,
+            'roles': random.sample(roles, random.randrange(0, 4)),
+            'joined_at': '2019-05-01T12:{:02}:{:02}.000000+00:00'.format(i // 60 % 60, i % 60),
+            'premium_since': None,
+            'deaf': False,
+            'mute': False,
+        })
+
+    return json_dumps(members)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=100000, help='The amount of members')
+    parser.add_argument('--roles', type=int, default=50, help='The amount of roles in the guild')
+    args = parser.parse_args()
+
+    payload = synthetic_members(args.members, args.roles)
+
+    dicts, dict_size = measure(lambda: json_loads(payload))
+    del dicts
+
+    models, model_size = measure(lambda: [Member.from_dict(m) for m in json_loads(payload)])
+    del models
+
+    print('{:,} members'.format(args.members))
+    print('dicts:  {:>14,} bytes {:>8.1f} bytes/member'.format(
+        dict_size, dict_size / args.members))
+    print('models: {:>14,} bytes {:>8.1f} bytes/member'.format(
+        model_size, model_size / args.members))
+    print('ratio: {:.2f}x smaller'.format(dict_size / model_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the throughput of HTTP.make_request against a mock Discord API.
+
+Usage::
+
+    python benchmarks/rest_load.py [--requests N] [--concurrency N] [--channels N]
+                                   [--bucket-limit N] [--bucket-reset SECONDS]
+                                   [--global-limit N] [--latency SECONDS]
+                                   [--error-rate P] [--in-process]
+
+Workers send messages to a few channels, so requests spread over one
+bucket per channel. By default, the mock API is served over a local TCP
+port to include the whole HTTP stack. With --in-process, requests are
+handed to the mock API directly to measure clamor's own overhead.
+"""
+
+import argparse
+import itertools
+import time
+
+import anyio
+
+from clamor import HTTP, RetryPolicy, Routes
+from clamor.testing import MockDiscord, MockServer, MockSession
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return 0.0
+
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def run_load(http, total, concurrency, channels):
+    latencies = []
+    failures = []
+    counter = itertools.count()
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= total:
+                return
+
+            start = time.perf_counter()
+            try:
+                await http.make_request(Routes.CREATE_MESSAGE, dict(channel=i % channels + 1),
+                                        json={'content': 'Message {}'.format(i)})
+            except Exception as error:
+                failures.append(error)
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for _ in range(concurrency):
+            await tg.spawn(worker)
+
+    return time.perf_counter() - start, latencies, failures
+
+
+async def main(args):
+    api = MockDiscord(bucket_limit=args.bucket_limit,
+                      bucket_reset=args.bucket_reset,
+                      global_limit=args.global_limit or None,
+                      latency=args.latency,
+                      error_rate=args.error_rate,
+                      seed=0)
+    policy = RetryPolicy(max_retries=10, base=0.01)
+
+    async with anyio.create_task_group() as tg:
+        if args.in_process:
+            http = HTTP('token', session=MockSession(api), retry_policy=policy)
+        else:
+            server = MockServer(api)
+            await tg.spawn(server.serve)
+            await server.wait_listening()
+
+            http = HTTP('token', base_url=server.base_url, connections=args.concurrency,
+                        retry_policy=policy)
+
+        elapsed, latencies, failures = await run_load(
+            http, args.requests, args.concurrency, args.channels)
+
+        await http.close()
+        await tg.cancel_scope.cancel()
+
+    print('{:,} requests, {} workers, {} buckets'.format(
+        args.requests, args.concurrency, args.channels))
+    print('throughput: {:>10.1f} requests/s'.format(len(latencies) / elapsed))
+    print('p50:        {:>10.2f} ms'.format(percentile(latencies, 0.50) * 1000))
+    print('p99:        {:>10.2f} ms'.format(percentile(latencies, 0.99) * 1000))
+    print('sent:       {:>10,} ({:,} retried)'.format(api.requests, api.requests - args.requests))
+    print('429s:       {:>10,} ({:,} global)'.format(api.rate_limited, api.global_rate_limited))
+    print('5xx:        {:>10,}'.format(api.injected_errors))
+    print('failed:     {:>10,}'.format(len(failures)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='The amount of requests')
+    parser.add_argument('--concurrency', type=int, default=50, help='The amount of workers')
+    parser.add_argument('--channels', type=int, default=10, help='The amount of buckets')
+    parser.add_argument('--bucket-limit', type=int, default=50,
+                        help='The requests per bucket and window')
+    parser.add_argument('--bucket-reset', type=float, default=1.0,
+                        help='The duration of a bucket window')
+    parser.add_argument('--global-limit', type=int, default=0,
+                        help='The requests per second across buckets, 0 disables it')
+    parser.add_argument('--latency', type=float, default=0.0, help='The latency of the API')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='The probability of server errors')
+    parser.add_argument('--in-process', action='store_true',
+                        help="Don't serve the mock API over TCP")
+
+    anyio.run(main, parser.parse_args())
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from .cache import *
+from .store import *
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+from typing import Iterable, Optional, Union
+
+from .store import EntityStore
+
+__all__ = (
+    'Cache',
+)
+
+_Snowflake = Union[int, str]
+
+
+class Cache:
+    r"""An in-memory cache for Discord entities.
+
+    Entities are stored as the raw payloads the API returns,
+    in one :class:`~clamor.cache.store.EntityStore` per type.
+    IDs are normalized to integers, members are keyed by
+    tuples of guild and user ID.
+
+    Channels, roles, members and emojis are indexed by the guild
+    they belong to, so all channels of a guild, for example, can
+    be retrieved without a request once they were fetched once.
+
+    Passing a cache to endpoint wrappers makes them serve reads
+    from it and keep it up to date with the responses they receive.
+
+    .. warning::
+
+        Payloads are shared between the cache and everyone who reads
+        them from it, so they must not be modified.
+
+    Parameters
+    ----------
+    \**kwargs : dict
+        See below.
+
+    Keyword Arguments
+    -----------------
+    max_sizes : Dict[str, int], optional
+        The maximum amount of entities per type, e.g. ``{'members': 10000}``.
+        Types that are left out use :attr:`~Cache.MAX_SIZES`.
+    ttls : Dict[str, float], optional
+        The amount of seconds entities stay fresh per type.
+        Types that are left out use :attr:`~Cache.TTLS`.
+    enabled : bool
+        Whether to cache anything at all, defaults to ``True``.
+
+    Attributes
+    ----------
+    guilds : :class:`~clamor.cache.store.EntityStore`
+        The cached guilds.
+    channels : :class:`~clamor.cache.store.EntityStore`
+        The cached channels, indexed by guild.
+    roles : :class:`~clamor.cache.store.EntityStore`
+        The cached roles, indexed by guild.
+    members : :class:`~clamor.cache.store.EntityStore`
+        The cached guild members, indexed by guild.
+    users : :class:`~clamor.cache.store.EntityStore`
+        The cached users.
+    emojis : :class:`~clamor.cache.store.EntityStore`
+        The cached emojis, indexed by guild.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        cache = Cache(max_sizes={'members': 50000}, ttls={'guilds': 60})
+        guilds = GuildWrapper(token, guild_id, cache=cache)
+
+        await guilds.get_guild_roles()  # Makes a request.
+        await guilds.get_guild_roles()  # Served from the cache.
+    """
+
+    #: The entity types that are cached.
+    TYPES = ('guilds', 'channels', 'roles', 'members', 'users', 'emojis')
+
+    #: The default maximum amounts of entities per type.
+    MAX_SIZES = {
+        'guilds': 2500,
+        'channels': 50000,
+        'roles': 50000,
+        'members': 100000,
+        'users': 100000,
+        'emojis': 50000,
+    }
+
+    #: The default amounts of seconds entities stay fresh per type.
+    TTLS = {
+        'guilds': 300.0,
+        'channels': 300.0,
+        'roles': 300.0,
+        'members': 120.0,
+        'users': 600.0,
+        'emojis': 600.0,
+    }
+
+    __slots__ = TYPES
+
+    def __init__(self, **kwargs):
+        max_sizes = dict(self.MAX_SIZES, **kwargs.get('max_sizes', {}))
+        ttls = dict(self.TTLS, **kwargs.get('ttls', {}))
+
+        unknown = (set(max_sizes) | set(ttls)) - set(self.TYPES)
+        if unknown:
+            raise ValueError('Unknown entity types: {}'.format(', '.join(sorted(unknown))))
+
+        enabled = kwargs.get('enabled', True)
+        for name in self.TYPES:
+            max_size = max_sizes[name] if enabled else 0
+            setattr(self, name, EntityStore(max_size, ttls[name]))
+
+    def __repr__(self) -> str:
+        return '<Cache {}>'.format(' '.join(
+            '{}={}'.format(name, len(getattr(self, name))) for name in self.TYPES))
+
+    def clear(self):
+        """Removes all cached entities."""
+
+        for name in self.TYPES:
+            getattr(self, name).clear()
+
+    # Guilds
+
+    def get_guild(self, guild_id: _Snowflake) -> Optional[dict]:
+        """Gets a cached guild by its ID."""
+
+        return self.guilds.get(int(guild_id))
+
+    def add_guild(self, guild: dict):
+        """Caches a guild along with the roles, emojis,
+        channels and members that its payload contains.
+        """
+
+        guild_id = int(guild['id'])
+        self.guilds.set(guild_id, guild)
+
+        if 'roles' in guild:
+            self.set_roles(guild_id, guild['roles'])
+        if 'emojis' in guild:
+            self.set_emojis(guild_id, guild['emojis'])
+        if 'channels' in guild:
+            self.set_channels(guild_id, guild['channels'])
+        for member in guild.get('members', ()):
+            self.add_member(guild_id, member)
+
+    def remove_guild(self, guild_id: _Snowflake):
+        """Removes a guild and everything that belongs to it."""
+
+        guild_id = int(guild_id)
+        self.guilds.delete(guild_id)
+
+        for store in (self.channels, self.roles, self.members, self.emojis):
+            store.delete_children(guild_id)
+
+    # Channels
+
+    def get_channel(self, channel_id: _Snowflake) -> Optional[dict]:
+        """Gets a cached channel by its ID."""
+
+        return self.channels.get(int(channel_id))
+
+    def get_channels(self, guild_id: _Snowflake) -> Optional[list]:
+        """Gets all channels of a guild if they are all cached."""
+
+        return self.channels.children(int(guild_id))
+
+    def add_channel(self, channel: dict, guild_id: _Snowflake = None):
+        """Caches a channel."""
+
+        guild_id = guild_id or channel.get('guild_id')
+        self.channels.set(int(channel['id']), channel,
+                          int(guild_id) if guild_id is not None else None)
+
+    def set_channels(self, guild_id: _Snowflake, channels: Iterable[dict]):
+        """Caches the complete list of channels of a guild."""
+
+        self.channels.set_children(int(guild_id), ((int(c['id']), c) for c in channels))
+
+    def remove_channel(self, channel_id: _Snowflake):
+        """Removes a cached channel."""
+
+        self.channels.delete(int(channel_id))
+
+    # Roles
+
+    def get_role(self, role_id: _Snowflake) -> Optional[dict]:
+        """Gets a cached role by its ID."""
+
+        return self.roles.get(int(role_id))
+
+    def get_roles(self, guild_id: _Snowflake) -> Optional[list]:
+        """Gets all roles of a guild if they are all cached."""
+
+        return self.roles.children(int(guild_id))
+
+    def add_role(self, guild_id: _Snowflake, role: dict):
+        """Caches a role."""
+
+        self.roles.set(int(role['id']), role, int(guild_id))
+
+    def set_roles(self, guild_id: _Snowflake, roles: Iterable[dict]):
+        """Caches the complete list of roles of a guild."""
+
+        self.roles.set_children(int(guild_id), ((int(r['id']), r) for r in roles))
+
+    def remove_role(self, role_id: _Snowflake):
+        """Removes a cached role."""
+
+        self.roles.delete(int(role_id))
+
+    # Members
+
+    def get_member(self, guild_id: _Snowflake, user_id: _Snowflake) -> Optional[dict]:
+        """Gets a cached guild member by guild and user ID."""
+
+        return self.members.get((int(guild_id), int(user_id)))
+
+    def add_member(self, guild_id: _Snowflake, member: dict):
+        """Caches a guild member and its user."""
+
+        guild_id = int(guild_id)
+        user = member['user']
+
+        self.members.set((guild_id, int(user['id'])), member, guild_id)
+        self.add_user(user)
+
+    def remove_member(self, guild_id: _Snowflake, user_id: _Snowflake):
+        """Removes a cached guild member."""
+
+        self.members.delete((int(guild_id), int(user_id)))
+
+    # Users
+
+    def get_user(self, user_id: _Snowflake) -> Optional[dict]:
+        """Gets a cached user by its ID."""
+
+        return self.users.get(int(user_id))
+
+    def add_user(self, user: dict):
+        """Caches a user."""
+
+        self.users.set(int(user['id']), user)
+
+    # Emojis
+
+    def get_emoji(self, emoji_id: _Snowflake) -> Optional[dict]:
+        """Gets a cached emoji by its ID."""
+
+        return self.emojis.get(int(emoji_id))
+
+    def get_emojis(self, guild_id: _Snowflake) -> Optional[list]:
+        """Gets all emojis of a guild if they are all cached."""
+
+        return self.emojis.children(int(guild_id))
+
+    def add_emoji(self, guild_id: _Snowflake, emoji: dict):
+        """Caches an emoji."""
+
+        self.emojis.set(int(emoji['id']), emoji, int(guild_id))
+
+    def set_emojis(self, guild_id: _Snowflake, emojis: Iterable[dict]):
+        """Caches the complete list of emojis of a guild."""
+
+        self.emojis.set_children(int(guild_id), ((int(e['id']), e) for e in emojis))
+
+    def remove_emoji(self, emoji_id: _Snowflake):
+        """Removes a cached emoji."""
+
+        self.emojis.delete(int(emoji_id))
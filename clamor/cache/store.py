@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+__all__ = (
+    'EntityStore',
+)
+
+
+class EntityStore:
+    """Holds entities of one type, indexed by ID and by parent.
+
+    Entities are evicted in least recently used order once the store
+    is full and are considered stale once their time to live has passed.
+    Stale entities are dropped lazily when they are accessed.
+
+    Besides looking entities up by their ID, the children of a parent,
+    e.g. the channels of a guild, can be retrieved. Since entities may
+    be added one by one, this only works once a parent's full set of
+    children has been stored with :meth:`~EntityStore.set_children`,
+    and stops working once any of them was evicted.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum amount of entities to hold. Unlimited if ``None``,
+        ``0`` disables the store.
+    ttl : float, optional
+        The amount of seconds entities are fresh for. Forever if ``None``.
+
+    Attributes
+    ----------
+    max_size : int, optional
+        The maximum amount of entities to hold.
+    ttl : float, optional
+        The amount of seconds entities are fresh for.
+    hits : int
+        The amount of lookups that found a fresh entity.
+    misses : int
+        The amount of lookups that didn't.
+    """
+
+    __slots__ = ('max_size', 'ttl', 'hits', 'misses',
+                 '_entries', '_parents', '_children', '_complete')
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        # Keys mapped to tuples of entity and expiry deadline.
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, Tuple[Any, Optional[float]]]
+        self._parents = {}  # type: Dict[Hashable, Hashable]
+        self._children = {}  # type: Dict[Hashable, set]
+        self._complete = set()
+
+    def __repr__(self) -> str:
+        return '<EntityStore size={} max_size={} ttl={}>'.format(
+            len(self._entries), self.max_size, self.ttl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the store holds any entities at all."""
+
+        return self.max_size != 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Gets a fresh entity by its ID.
+
+        Parameters
+        ----------
+        key : Hashable
+            The ID of the entity.
+
+        Returns
+        -------
+        Any, optional
+            The entity, ``None`` if it isn't stored or stale.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        entity, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entity
+
+    def set(self, key: Hashable, entity: Any, parent: Hashable = None):
+        """Stores an entity.
+
+        Parameters
+        ----------
+        key : Hashable
+            The ID of the entity.
+        entity : Any
+            The entity to store.
+        parent : Hashable, optional
+            The ID of the entity's parent.
+        """
+
+        if self.max_size == 0:
+            return
+
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+
+        self._entries[key] = entity, expires_at
+        self._entries.move_to_end(key)
+
+        if parent is not None:
+            previous = self._parents.get(key)
+            if previous is not None and previous != parent:
+                self._unlink(key, previous)
+
+            self._parents[key] = parent
+            self._children.setdefault(parent, set()).add(key)
+
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self.delete(oldest)
+
+    def delete(self, key: Hashable) -> Optional[Any]:
+        """Removes an entity.
+
+        Parameters
+        ----------
+        key : Hashable
+            The ID of the entity.
+
+        Returns
+        -------
+        Any, optional
+            The removed entity, ``None`` if it wasn't stored.
+        """
+
+        entry = self._entries.pop(key, None)
+
+        parent = self._parents.pop(key, None)
+        if parent is not None:
+            self._unlink(key, parent)
+            # The parent's children aren't all known anymore.
+            self._complete.discard(parent)
+
+        return entry[0] if entry is not None else None
+
+    def _unlink(self, key: Hashable, parent: Hashable):
+        children = self._children.get(parent)
+        if children is not None:
+            children.discard(key)
+            if not children:
+                del self._children[parent]
+
+    def children(self, parent: Hashable) -> Optional[List[Any]]:
+        """Gets all children of a parent.
+
+        Parameters
+        ----------
+        parent : Hashable
+            The ID of the parent.
+
+        Returns
+        -------
+        List[Any], optional
+            The children, ``None`` if they aren't all known or any is stale.
+        """
+
+        if parent not in self._complete:
+            self.misses += 1
+            return None
+
+        children = []
+        for key in list(self._children.get(parent, ())):
+            entity = self.get(key)
+            if entity is None:
+                return None
+
+            children.append(entity)
+
+        return children
+
+    def set_children(self, parent: Hashable, entities: Iterable[Tuple[Hashable, Any]]):
+        """Replaces all children of a parent.
+
+        Parameters
+        ----------
+        parent : Hashable
+            The ID of the parent.
+        entities : Iterable[Tuple[Hashable, Any]]
+            Tuples of ID and entity of all children.
+        """
+
+        if self.max_size == 0:
+            return
+
+        self.delete_children(parent)
+
+        keys = set()
+        for key, entity in entities:
+            self.set(key, entity, parent)
+            keys.add(key)
+
+        # Storing the children might have evicted some of them right away.
+        if keys <= self._children.get(parent, set()):
+            self._complete.add(parent)
+
+    def delete_children(self, parent: Hashable):
+        """Removes all children of a parent.
+
+        Parameters
+        ----------
+        parent : Hashable
+            The ID of the parent.
+        """
+
+        for key in list(self._children.get(parent, ())):
+            self.delete(key)
+
+        self._complete.discard(parent)
+
+    def clear(self):
+        """Removes all entities."""
+
+        self._entries.clear()
+        self._parents.clear()
+        self._children.clear()
+        self._complete.clear()
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+from .ipc import *
+from .launcher import *
+from .limits import *
@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import logging
+import os
+import struct
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import anyio
+from anyio.exceptions import IncompleteRead
+from asks.req_structs import CaseInsensitiveDict
+
+from ..gateway.sharding import IdentifyLimiter
+from ..rest.codec import json_dumps, json_loads
+from ..rest.rate_limit import RateLimiter
+from ..rest.routes import Method
+
+__all__ = (
+    'IPCClient',
+    'IPCServer',
+)
+
+logger = logging.getLogger(__name__)
+
+# Messages are framed by their length as an unsigned 32-bit integer.
+_HEADER = struct.Struct('>I')
+
+
+async def _send_message(stream, message: dict):
+    data = json_dumps(message)
+    await stream.send_all(_HEADER.pack(len(data)) + data)
+
+
+async def _receive_message(stream) -> Optional[dict]:
+    try:
+        size, = _HEADER.unpack(await stream.receive_exactly(_HEADER.size))
+        return json_loads(await stream.receive_exactly(size))
+    except IncompleteRead:
+        return None
+
+
+def _bucket(bucket):
+    # JSON turns tuples into lists, but buckets are used as dictionary keys.
+    return tuple(bucket) if isinstance(bucket, list) else bucket
+
+
+class _Response:
+    __slots__ = ('status_code', 'headers')
+
+    def __init__(self, status_code: int, headers: dict):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+
+
+class _Peer:
+    __slots__ = ('cluster_id', 'stream', 'lock')
+
+    def __init__(self, cluster_id: int, stream):
+        self.cluster_id = cluster_id
+        self.stream = stream
+        self.lock = anyio.create_lock()
+
+    async def send(self, message: dict):
+        async with self.lock:
+            await _send_message(self.stream, message)
+
+
+class _Pending:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = anyio.create_event()
+        self.result = None
+        self.error = None
+
+
+class IPCServer:
+    r"""The central process that cluster processes talk to.
+
+    It owns the single :class:`~clamor.rest.rate_limit.RateLimiter`
+    all clusters share. Clusters reserve slots in buckets and report
+    the responses they receive through the server, so their combined
+    traffic respects per-bucket and global rate limits as if it was
+    sent by a single process.
+
+    Identifies of all clusters are coordinated by a shared
+    :class:`~clamor.gateway.sharding.IdentifyLimiter`, and
+    messages are relayed between clusters.
+
+    Messages are JSON objects framed by their length and
+    exchanged over a Unix domain socket.
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket to listen on.
+    \**kwargs : dict
+        See below.
+
+    Keyword Arguments
+    -----------------
+    rate_limiter : :class:`~clamor.rest.rate_limit.RateLimiter`, optional
+        The rate limiter to share.
+    identify_limiter : :class:`~clamor.gateway.sharding.IdentifyLimiter`, optional
+        The identify limiter to share.
+
+    Attributes
+    ----------
+    path : str
+        The path of the Unix socket.
+    rate_limiter : :class:`~clamor.rest.rate_limit.RateLimiter`
+        The rate limiter that is shared.
+    identify_limiter : :class:`~clamor.gateway.sharding.IdentifyLimiter`
+        The identify limiter that is shared.
+    """
+
+    #: The default amount of seconds to wait for answers to queries.
+    QUERY_TIMEOUT = 5.0
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        self.rate_limiter = kwargs.get('rate_limiter') or RateLimiter()
+        self.identify_limiter = kwargs.get('identify_limiter') or IdentifyLimiter()
+
+        self._peers = {}  # type: Dict[int, _Peer]
+        self._reservations = {}
+        self._queries = {}
+        self._ids = itertools.count()
+        self._listening = anyio.create_event()
+
+    def __repr__(self) -> str:
+        return '<IPCServer path={} clusters={}>'.format(self.path, len(self._peers))
+
+    @property
+    def clusters(self) -> List[int]:
+        """The IDs of the clusters that are currently connected."""
+
+        return list(self._peers)
+
+    async def wait_listening(self):
+        """Waits until the server accepts connections."""
+
+        await self._listening.wait()
+
+    async def serve(self):
+        """Accepts connections of clusters until cancelled."""
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        server = await anyio.create_unix_server(self.path)
+        await self._listening.set()
+
+        try:
+            async with anyio.create_task_group() as tg:
+                async for stream in server.accept_connections():
+                    await tg.spawn(self._serve_peer, stream)
+        finally:
+            await server.close()
+            os.remove(self.path)
+
+    async def broadcast(self, data: Any, sender: int = None):
+        """Sends data to all clusters.
+
+        Parameters
+        ----------
+        data : Any
+            The JSON serializable data to send.
+        sender : int, optional
+            The ID of the cluster that sent the data. It doesn't receive it itself.
+        """
+
+        message = {'op': 'broadcast', 'cluster': sender, 'data': data}
+        for peer in list(self._peers.values()):
+            if peer.cluster_id != sender:
+                await peer.send(message)
+
+    async def query(self, data: Any, timeout: float = QUERY_TIMEOUT, sender: int = None) -> list:
+        """Asks all clusters for an answer.
+
+        Parameters
+        ----------
+        data : Any
+            The JSON serializable query.
+        timeout : float
+            The amount of seconds to wait for answers, defaults to ``5``.
+        sender : int, optional
+            The ID of the cluster that sent the query. It isn't asked itself.
+
+        Returns
+        -------
+        list
+            The answers of all clusters that replied in time.
+        """
+
+        peers = [peer for peer in self._peers.values() if peer.cluster_id != sender]
+        query_id = next(self._ids)
+        answers = []
+        done = anyio.create_event()
+        self._queries[query_id] = (len(peers), answers, done)
+
+        try:
+            message = {'op': 'query', 'query': query_id, 'cluster': sender, 'data': data}
+            for peer in peers:
+                await peer.send(message)
+
+            if peers:
+                async with anyio.move_on_after(timeout):
+                    await done.wait()
+        finally:
+            del self._queries[query_id]
+
+        return answers
+
+    async def _serve_peer(self, stream):
+        hello = await _receive_message(stream)
+        if hello is None or hello.get('op') != 'hello':
+            await stream.close()
+            return
+
+        peer = _Peer(hello['cluster'], stream)
+        self._peers[peer.cluster_id] = peer
+        logger.info('Cluster %d connected', peer.cluster_id)
+
+        try:
+            async with anyio.create_task_group() as tg:
+                while True:
+                    message = await _receive_message(stream)
+                    if message is None:
+                        break
+
+                    await tg.spawn(self._handle, peer, message)
+
+                # The cluster is gone, so are its reservations.
+                await tg.cancel_scope.cancel()
+        finally:
+            del self._peers[peer.cluster_id]
+            logger.info('Cluster %d disconnected', peer.cluster_id)
+            await stream.close()
+
+    async def _handle(self, peer: _Peer, message: dict):
+        op = message['op']
+        request_id = message.get('id')
+
+        try:
+            if op == 'acquire':
+                # The reply is sent from within the reservation.
+                await self._acquire(peer, request_id, _bucket(message['bucket']))
+                return
+            elif op == 'release':
+                event = self._reservations.pop((peer.cluster_id, message['ref']), None)
+                if event is not None:
+                    await event.set()
+                return
+            elif op == 'update':
+                result = await self._update(message)
+            elif op == 'identify':
+                result = await self.identify_limiter.wait(message['shard'])
+            elif op == 'broadcast':
+                result = await self.broadcast(message['data'], peer.cluster_id)
+            elif op == 'query':
+                result = await self.query(message['data'], message['timeout'], peer.cluster_id)
+            elif op == 'answer':
+                await self._answer(message['query'], message['result'])
+                return
+            else:
+                raise ValueError('Unknown operation {}'.format(op))
+        except anyio.get_cancelled_exc_class():
+            raise
+        except Exception as error:
+            logger.exception('Failed to handle %s from cluster %d', op, peer.cluster_id)
+            if request_id is not None:
+                await peer.send({'op': 'reply', 'id': request_id, 'error': str(error)})
+            return
+
+        if request_id is not None:
+            await peer.send({'op': 'reply', 'id': request_id, 'result': result})
+
+    async def _acquire(self, peer: _Peer, request_id: int, bucket):
+        released = anyio.create_event()
+        self._reservations[(peer.cluster_id, request_id)] = released
+
+        try:
+            async with self.rate_limiter(bucket):
+                await peer.send({'op': 'reply', 'id': request_id, 'result': request_id})
+                await released.wait()
+        finally:
+            self._reservations.pop((peer.cluster_id, request_id), None)
+
+    async def _update(self, message: dict) -> Optional[str]:
+        route = message.get('route')
+        if route is not None:
+            route = Method(route[0]), route[1]
+
+        response = _Response(message['status'], message['headers'])
+        await self.rate_limiter.update_bucket(
+            _bucket(message['bucket']), response, route, message.get('fmt'))
+
+        if route is not None:
+            return self.rate_limiter.bucket_hashes.get(self.rate_limiter._route_key(route))
+
+        return None
+
+    async def _answer(self, query_id: int, result: Any):
+        query = self._queries.get(query_id)
+        if query is None:
+            # The query already timed out.
+            return
+
+        expected, answers, done = query
+        answers.append(result)
+        if len(answers) >= expected:
+            await done.set()
+
+
+class IPCClient:
+    """The connection of a cluster process to the :class:`~clamor.cluster.ipc.IPCServer`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket to connect to.
+    cluster_id : int
+        The ID of the cluster this process runs.
+
+    Attributes
+    ----------
+    cluster_id : int
+        The ID of the cluster this process runs.
+    on_broadcast : Callable[[int, Any], Awaitable[None]], optional
+        Called with the sending cluster and data of every broadcast.
+    on_query : Callable[[int, Any], Awaitable[Any]], optional
+        Called with the sending cluster and query, returns the answer.
+    """
+
+    def __init__(self, path: str, cluster_id: int):
+        self.path = path
+        self.cluster_id = cluster_id
+
+        self.on_broadcast = None  # type: Optional[Callable[[int, Any], Awaitable[None]]]
+        self.on_query = None  # type: Optional[Callable[[int, Any], Awaitable[Any]]]
+
+        self._stream = None
+        self._send_lock = anyio.create_lock()
+        self._pending = {}  # type: Dict[int, _Pending]
+        self._ids = itertools.count()
+
+    def __repr__(self) -> str:
+        return '<IPCClient path={0.path} cluster_id={0.cluster_id}>'.format(self)
+
+    async def connect(self, stream=None):
+        """Connects to the server.
+
+        Parameters
+        ----------
+        stream : :class:`~anyio.abc.Stream`, optional
+            An already opened stream to use instead of the Unix socket.
+        """
+
+        self._stream = stream or await anyio.connect_unix(self.path)
+        await self.send('hello', cluster=self.cluster_id)
+
+    async def close(self):
+        """Closes the connection to the server."""
+
+        if self._stream is not None:
+            await self._stream.close()
+            self._stream = None
+
+    async def run(self):
+        """Receives messages from the server until the connection is closed."""
+
+        async with anyio.create_task_group() as tg:
+            while True:
+                message = await _receive_message(self._stream)
+                if message is None:
+                    break
+
+                op = message['op']
+                if op == 'reply':
+                    pending = self._pending.pop(message['id'], None)
+                    if pending is not None:
+                        pending.result = message.get('result')
+                        pending.error = message.get('error')
+                        await pending.event.set()
+                elif op == 'broadcast' and self.on_broadcast is not None:
+                    await tg.spawn(self.on_broadcast, message['cluster'], message['data'])
+                elif op == 'query':
+                    await tg.spawn(self._answer, message)
+
+        # Nobody is going to answer anymore.
+        for pending in self._pending.values():
+            pending.error = 'Connection to the IPC server was closed'
+            await pending.event.set()
+
+    async def _answer(self, message: dict):
+        result = None
+        if self.on_query is not None:
+            result = await self.on_query(message['cluster'], message['data'])
+
+        await self.send('answer', query=message['query'], result=result)
+
+    async def send(self, op: str, **data):
+        r"""Sends a message without waiting for a reply.
+
+        Parameters
+        ----------
+        op : str
+            The operation to perform.
+        \**data : dict
+            The JSON serializable fields of the message.
+        """
+
+        data['op'] = op
+        async with self._send_lock:
+            await _send_message(self._stream, data)
+
+    async def request(self, op: str, **data) -> Any:
+        r"""Sends a message and waits for the reply.
+
+        Parameters
+        ----------
+        op : str
+            The operation to perform.
+        \**data : dict
+            The JSON serializable fields of the message.
+
+        Returns
+        -------
+        Any
+            The result of the operation.
+
+        Raises
+        ------
+        :exc:`RuntimeError`
+            Raised when the server failed to perform the operation.
+        """
+
+        request_id = next(self._ids)
+        pending = self._pending[request_id] = _Pending()
+
+        try:
+            await self.send(op, id=request_id, **data)
+            await pending.event.wait()
+        finally:
+            self._pending.pop(request_id, None)
+
+        if pending.error is not None:
+            raise RuntimeError(pending.error)
+
+        return pending.result
+
+    async def broadcast(self, data: Any):
+        """Sends data to all other clusters.
+
+        Parameters
+        ----------
+        data : Any
+            The JSON serializable data to send.
+        """
+
+        await self.request('broadcast', data=data)
+
+    async def query(self, data: Any, timeout: float = IPCServer.QUERY_TIMEOUT) -> list:
+        """Asks all other clusters for an answer.
+
+        Parameters
+        ----------
+        data : Any
+            The JSON serializable query.
+        timeout : float
+            The amount of seconds to wait for answers, defaults to ``5``.
+
+        Returns
+        -------
+        list
+            The answers of all clusters that replied in time.
+        """
+
+        return await self.request('query', data=data, timeout=timeout)
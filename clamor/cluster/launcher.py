@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import multiprocessing
+import os
+import tempfile
+from typing import Any, Awaitable, Callable, List
+
+import anyio
+
+from ..gateway.sharding import IdentifyLimiter, ShardManager
+from ..rest.endpoints import GatewayWrapper
+from ..rest.http import HTTP
+from .ipc import IPCClient, IPCServer
+from .limits import RemoteIdentifyLimiter, SharedRateLimiter
+
+__all__ = (
+    'Cluster',
+    'ClusterLauncher',
+    'split_shards',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def split_shards(shard_count: int, clusters: int) -> List[List[int]]:
+    """Splits shards into contiguous ranges of nearly equal size.
+
+    Parameters
+    ----------
+    shard_count : int
+        The total amount of shards.
+    clusters : int
+        The amount of ranges to split the shards into.
+
+    Returns
+    -------
+    List[List[int]]
+        The shard IDs of every cluster. Clusters without shards are omitted.
+    """
+
+    size, rest = divmod(shard_count, clusters)
+
+    ranges = []
+    start = 0
+    for cluster_id in range(clusters):
+        end = start + size + (1 if cluster_id < rest else 0)
+        if end > start:
+            ranges.append(list(range(start, end)))
+        start = end
+
+    return ranges
+
+
+class Cluster:
+    """Everything a cluster process needs to run its shards.
+
+    Instances of this class are passed to the setup function
+    of a :class:`~clamor.cluster.launcher.ClusterLauncher`.
+
+    Attributes
+    ----------
+    cluster_id : int
+        The ID of this cluster.
+    shard_ids : List[int]
+        The IDs of the shards this cluster runs.
+    ipc : :class:`~clamor.cluster.ipc.IPCClient`
+        The connection to the launcher.
+    http : :class:`~clamor.rest.http.HTTP`
+        An HTTP client that shares its rate limits with all other clusters.
+        Pass it to endpoint wrappers as ``http``.
+    manager : :class:`~clamor.gateway.sharding.ShardManager`
+        The manager that runs the shards of this cluster.
+    """
+
+    __slots__ = ('cluster_id', 'shard_ids', 'ipc', 'http', 'manager')
+
+    def __init__(self, cluster_id: int, shard_ids: List[int],
+                 ipc: IPCClient, http: HTTP, manager: ShardManager):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.ipc = ipc
+        self.http = http
+        self.manager = manager
+
+    def __repr__(self) -> str:
+        return '<Cluster id={0.cluster_id} shards={0.shard_ids}>'.format(self)
+
+    async def broadcast(self, data: Any):
+        """Sends data to all other clusters.
+
+        Parameters
+        ----------
+        data : Any
+            The JSON serializable data to send.
+        """
+
+        await self.ipc.broadcast(data)
+
+    async def query(self, data: Any, timeout: float = IPCServer.QUERY_TIMEOUT) -> list:
+        """Asks all other clusters for an answer.
+
+        Parameters
+        ----------
+        data : Any
+            The JSON serializable query.
+        timeout : float
+            The amount of seconds to wait for answers, defaults to ``5``.
+
+        Returns
+        -------
+        list
+            The answers of all clusters that replied in time.
+        """
+
+        return await self.ipc.query(data, timeout)
+
+
+class ClusterLauncher:
+    r"""Splits the shards of a bot across multiple processes.
+
+    Every process, a so-called cluster, runs a range of shards
+    with a :class:`~clamor.gateway.sharding.ShardManager`. This
+    spreads the work of decoding and handling events across
+    CPU cores.
+
+    The launcher process runs an :class:`~clamor.cluster.ipc.IPCServer`
+    which all clusters connect to. REST rate limits and identifies are
+    coordinated through it, and clusters can broadcast messages and
+    query each other.
+
+    Parameters
+    ----------
+    token : str
+        The token to use for authorization.
+    setup : Callable[[:class:`~clamor.cluster.launcher.Cluster`], Awaitable[None]]
+        A coroutine function that is run in every cluster process.
+        Clusters stop once it returns. As it is sent to other processes,
+        it has to be defined at the top level of a module.
+    \**kwargs : dict
+        See below. Any other keyword arguments are passed to
+        the :class:`~clamor.gateway.sharding.ShardManager` of every cluster.
+
+    Keyword Arguments
+    -----------------
+    clusters : int, optional
+        The amount of processes to start. Defaults to the amount of CPU cores.
+    shard_count : int, optional
+        The total amount of shards. Defaults to the recommended amount.
+    socket_path : str, optional
+        The path of the Unix socket for communication between processes.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        async def setup(cluster):
+            async with anyio.create_task_group() as tg:
+                await tg.spawn(cluster.manager.run)
+
+                async for shard_id, name, data in cluster.manager.events():
+                    ...
+
+        if __name__ == '__main__':
+            ClusterLauncher(token, setup, clusters=4).run()
+    """
+
+    def __init__(self, token: str, setup: Callable[[Cluster], Awaitable[None]], **kwargs):
+        self._token = token
+        self._setup = setup
+        self.clusters = kwargs.pop('clusters', None) or os.cpu_count() or 1
+        self.shard_count = kwargs.pop('shard_count', None)
+        self.socket_path = kwargs.pop('socket_path', None) or os.path.join(
+            tempfile.gettempdir(), 'clamor-{}.sock'.format(os.getpid()))
+        self._options = kwargs
+
+        self.server = None
+
+    def __repr__(self) -> str:
+        return '<ClusterLauncher clusters={0.clusters} shard_count={0.shard_count}>'.format(self)
+
+    def run(self):
+        """Starts all clusters and blocks until they have stopped."""
+
+        anyio.run(self._run)
+
+    async def _run(self):
+        info = await GatewayWrapper(self._token).get_gateway_bot()
+        if self.shard_count is None:
+            self.shard_count = info['shards']
+
+        max_concurrency = info.get('session_start_limit', {}).get('max_concurrency', 1)
+        self.server = IPCServer(self.socket_path,
+                                identify_limiter=IdentifyLimiter(max_concurrency))
+
+        # Spawned processes don't inherit any state of this one.
+        context = multiprocessing.get_context('spawn')
+        processes = []
+        for cluster_id, shard_ids in enumerate(split_shards(self.shard_count, self.clusters)):
+            processes.append(context.Process(
+                target=_run_cluster,
+                name='clamor-cluster-{}'.format(cluster_id),
+                args=(self._token, cluster_id, shard_ids, self.shard_count, max_concurrency,
+                      self.socket_path, self._setup, self._options),
+            ))
+
+        async with anyio.create_task_group() as tg:
+            await tg.spawn(self.server.serve)
+            await self.server.wait_listening()
+
+            logger.info('Starting %d clusters for %d shards', len(processes), self.shard_count)
+            async with anyio.create_task_group() as clusters:
+                for process in processes:
+                    process.start()
+                    await clusters.spawn(anyio.run_in_thread, process.join)
+
+            await tg.cancel_scope.cancel()
+
+
+def _run_cluster(token, cluster_id, shard_ids, shard_count, max_concurrency,
+                 socket_path, setup, options):
+    anyio.run(_cluster_main, token, cluster_id, shard_ids, shard_count, max_concurrency,
+              socket_path, setup, options)
+
+
+async def _cluster_main(token, cluster_id, shard_ids, shard_count, max_concurrency,
+                        socket_path, setup, options):
+    ipc = IPCClient(socket_path, cluster_id)
+    await ipc.connect()
+
+    http = HTTP(token, rate_limiter=SharedRateLimiter(ipc))
+    manager = ShardManager(
+        token,
+        shard_count=shard_count,
+        shard_ids=shard_ids,
+        gateway=GatewayWrapper(token, http=http),
+        identify_limiter=RemoteIdentifyLimiter(ipc, max_concurrency),
+        **options
+    )
+
+    try:
+        async with anyio.create_task_group() as tg:
+            await tg.spawn(ipc.run)
+
+            await setup(Cluster(cluster_id, shard_ids, ipc, http, manager))
+            await tg.cancel_scope.cancel()
+    finally:
+        await ipc.close()
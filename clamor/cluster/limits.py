@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from async_generator import async_generator, asynccontextmanager, yield_
+from asks.response_objects import Response
+
+from ..rest.rate_limit import Bucket, RateLimiter
+from ..rest.routes import APIRoute
+from .ipc import IPCClient
+
+__all__ = (
+    'RemoteIdentifyLimiter',
+    'SharedRateLimiter',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SharedRateLimiter(RateLimiter):
+    r"""A rate limiter that shares its state with other processes.
+
+    Reservations and responses are forwarded to the
+    :class:`~clamor.cluster.ipc.IPCServer`, which tracks the rate limits
+    of all processes in a single :class:`~clamor.rest.rate_limit.RateLimiter`.
+    Only the mapping of routes to bucket hashes is kept locally, so
+    that buckets can be determined without asking the server.
+
+    Parameters
+    ----------
+    client : :class:`~clamor.cluster.ipc.IPCClient`
+        The connection to the server.
+    \**kwargs : dict
+        Passed to :class:`~clamor.rest.rate_limit.RateLimiter`.
+
+    Attributes
+    ----------
+    client : :class:`~clamor.cluster.ipc.IPCClient`
+        The connection to the server.
+    """
+
+    def __init__(self, client: IPCClient, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+
+    @asynccontextmanager
+    @async_generator
+    async def __call__(self, bucket: Bucket):
+        ref = await self.client.request('acquire', bucket=bucket)
+
+        try:
+            await yield_(self)
+        finally:
+            await self.client.send('release', ref=ref)
+
+    async def cooldown_global(self) -> float:
+        # Handled by the server when a slot is acquired.
+        return 0.0
+
+    async def cooldown_bucket(self, bucket: Bucket) -> float:
+        # Handled by the server when a slot is acquired.
+        return 0.0
+
+    async def update_bucket(self,
+                            bucket: Bucket,
+                            response: Response,
+                            route: APIRoute = None,
+                            fmt: dict = None):
+        bucket_hash = await self.client.request(
+            'update',
+            bucket=bucket,
+            status=response.status_code,
+            headers=dict(response.headers),
+            route=[route[0].value, route[1]] if route is not None else None,
+            fmt=fmt,
+        )
+
+        if bucket_hash is not None:
+            self._hashes[self._route_key(route)] = bucket_hash
+
+
+class RemoteIdentifyLimiter:
+    """An identify limiter that is shared with other processes.
+
+    Parameters
+    ----------
+    client : :class:`~clamor.cluster.ipc.IPCClient`
+        The connection to the server.
+    max_concurrency : int
+        The amount of shards that may identify at once, defaults to ``1``.
+
+    Attributes
+    ----------
+    client : :class:`~clamor.cluster.ipc.IPCClient`
+        The connection to the server.
+    max_concurrency : int
+        The amount of shards that may identify at once.
+    """
+
+    __slots__ = ('client', 'max_concurrency')
+
+    def __init__(self, client: IPCClient, max_concurrency: int = 1):
+        self.client = client
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self) -> str:
+        return '<RemoteIdentifyLimiter max_concurrency={0.max_concurrency}>'.format(self)
+
+    async def wait(self, shard_id: int):
+        """Waits until the given shard may identify.
+
+        Parameters
+        ----------
+        shard_id : int
+            The ID of the shard that wants to identify.
+        """
+
+        await self.client.request('identify', shard=shard_id)
@@ -15,6 +15,7 @@ __all__ = (
     'Forbidden',
     'NotFound',
     'Hierarchied',
+    'GatewayError',
 )
 
 logger = logging.getLogger(__name__)
@@ -197,8 +198,8 @@ class RequestFailed(ClamorError):
         failed = 'Request to {0.bucket} failed with {0.error.value} {0.error.name}: {0.message}'
 
         # Try to get any useful data from the dict
-        error_code = data.get('code', 0)
         if isinstance(data, dict):
+            error_code = data.get('code', 0)
             try:
                 self.error = JSONErrorCode(error_code)
             except ValueError:
@@ -210,7 +211,7 @@ class RequestFailed(ClamorError):
 
         else:
             self.message = data
-            self.status_code = JSONErrorCode.UNKNOWN
+            self.error = JSONErrorCode.UNKNOWN
 
         if self.errors:
             errors = self._flatten_errors(self.errors)
@@ -291,3 +292,28 @@ class Hierarchied(ClamorError):
       *Even occurs if the bot has ``Kick/Ban Members`` permissions.*
     """
     pass
+
+
+class GatewayError(ClamorError):
+    """Raised when a gateway connection fails irrecoverably.
+
+    Parameters
+    ----------
+    message : str
+        A description of what went wrong.
+    code : int, optional
+        The close code the gateway sent, if any.
+
+    Attributes
+    ----------
+    code : int, optional
+        The close code the gateway sent, if any.
+    """
+
+    def __init__(self, message: str, code: int = None):
+        self.code = code
+
+        if code is not None:
+            message = '{} (close code {})'.format(message, code)
+
+        super().__init__(message)
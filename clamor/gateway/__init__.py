@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from .compression import *
+from .connection import *
+from .opcodes import *
+from .sharding import *
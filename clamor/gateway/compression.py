@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import zlib
+from typing import Optional, Union
+
+__all__ = (
+    'ZLIB_SUFFIX',
+    'ZlibStreamInflater',
+)
+
+#: The suffix every complete ``zlib-stream`` message ends with.
+ZLIB_SUFFIX = b'\x00\x00\xff\xff'
+
+
+class ZlibStreamInflater:
+    """Decompresses gateway messages sent with ``zlib-stream`` compression.
+
+    With ``zlib-stream``, the gateway keeps a single compression context
+    for the whole lifetime of a connection and splits the stream into
+    WebSocket frames arbitrarily. A message is complete once the data
+    ends with a ``Z_SYNC_FLUSH`` suffix.
+
+    Frames are collected in one growing buffer until the suffix arrives.
+    Messages that arrive in a single frame, which is by far the most
+    common case, are decompressed straight from the frame without being
+    copied into the buffer at all.
+
+    A new instance has to be created for every connection.
+
+    Attributes
+    ----------
+    compressed : int
+        The total amount of compressed bytes received.
+    decompressed : int
+        The total amount of bytes after decompression.
+    """
+
+    __slots__ = ('_inflator', '_buffer', 'compressed', 'decompressed')
+
+    def __init__(self):
+        self._inflator = zlib.decompressobj()
+        self._buffer = bytearray()
+
+        self.compressed = 0
+        self.decompressed = 0
+
+    def __repr__(self) -> str:
+        return '<ZlibStreamInflater ratio={:.2f}>'.format(self.ratio)
+
+    @property
+    def ratio(self) -> float:
+        """The compression ratio achieved so far."""
+
+        if not self.compressed:
+            return 0.0
+
+        return self.decompressed / self.compressed
+
+    def feed(self, frame: Union[bytes, bytearray, memoryview]) -> Optional[bytes]:
+        """Feeds a received frame into the inflater.
+
+        Parameters
+        ----------
+        frame : Union[bytes, bytearray, memoryview]
+            The frame as received from the WebSocket.
+
+        Returns
+        -------
+        bytes, optional
+            The decompressed message if the frame completed
+            one, ``None`` if more frames are needed.
+        """
+
+        self.compressed += len(frame)
+
+        if not self._buffer and frame[-4:] == ZLIB_SUFFIX:
+            data = frame
+        else:
+            self._buffer.extend(frame)
+            if self._buffer[-4:] != ZLIB_SUFFIX:
+                return None
+
+            data = self._buffer
+
+        message = self._inflator.decompress(data)
+        del self._buffer[:]
+
+        self.decompressed += len(message)
+        return message
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import random
+import sys
+import time
+from typing import Any, Optional, Tuple, Union
+
+import anyio
+from anysocks import open_connection
+from anysocks.exceptions import ConnectionClosed
+
+from ..exceptions import GatewayError
+from ..meta import __title__ as clamor_title
+from ..rest.codec import json_dumps, json_loads
+from ..rest.retry import RetryPolicy
+from . import etf
+from .compression import ZlibStreamInflater
+from .opcodes import CloseCode, Opcode
+
+__all__ = (
+    'Event',
+    'GatewayConnection',
+)
+
+logger = logging.getLogger(__name__)
+
+#: A type to denote dispatched events as tuples of event name and data.
+Event = Tuple[str, Any]
+
+
+class _EventStream:
+    __slots__ = ('_connection',)
+
+    def __init__(self, connection: 'GatewayConnection'):
+        self._connection = connection
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        event = await self._connection.get_event()
+        if event is None:
+            raise StopAsyncIteration
+
+        return event
+
+
+class GatewayConnection:
+    r"""A connection to the Discord gateway.
+
+    This takes care of the whole lifecycle of a gateway session.
+    It heartbeats in the background, identifies or resumes the
+    session and reconnects whenever the connection drops, the
+    gateway asks for it or heartbeats aren't acknowledged anymore.
+
+    Dispatched events are put into a bounded queue that can be
+    consumed with :meth:`~GatewayConnection.events`. The receiving
+    side does nothing but decode payloads and queue them up, so all
+    the actual work happens in the consumer's task.
+
+    Parameters
+    ----------
+    token : str
+        The token to use for authorization.
+    url : str
+        The gateway URL, as returned by
+        :meth:`~clamor.rest.endpoints.GatewayWrapper.get_gateway_bot`.
+    \**kwargs : dict
+        See below.
+
+    Keyword Arguments
+    -----------------
+    shard : Tuple[int, int]
+        A tuple of shard ID and total shard count, defaults to ``(0, 1)``.
+    large_threshold : int
+        The member count from which on offline members of a guild aren't
+        sent anymore, defaults to ``250``.
+    presence : dict, optional
+        The initial presence of the session.
+    identify_limiter : :class:`~clamor.gateway.sharding.IdentifyLimiter`, optional
+        Shared between connections to coordinate when they may identify.
+    queue_size : int
+        The maximum amount of dispatches that may be queued up
+        before receiving blocks, defaults to ``1000``.
+    compress : bool
+        Whether to use ``zlib-stream`` transport compression,
+        defaults to ``True``.
+    encoding : str
+        The payload encoding, either ``json`` or ``etf``.
+        Defaults to ``json``.
+
+    Attributes
+    ----------
+    url : str
+        The gateway URL.
+    shard : Tuple[int, int]
+        A tuple of shard ID and total shard count.
+    session_id : str, optional
+        The ID of the current session, ``None`` if there's none.
+    sequence : int, optional
+        The sequence number of the last dispatch.
+    latency : float, optional
+        The time between the last heartbeat and its acknowledgement in seconds.
+    compress : bool
+        Whether ``zlib-stream`` transport compression is used.
+    encoding : str
+        The payload encoding.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        gateway = GatewayWrapper(token)
+        url = (await gateway.get_gateway_bot())['url']
+
+        connection = GatewayConnection(token, url)
+
+        async with anyio.create_task_group() as tg:
+            await tg.spawn(connection.run)
+
+            async for name, data in connection.events():
+                if name == 'MESSAGE_CREATE':
+                    print(data['content'])
+    """
+
+    #: The gateway version to use.
+    GATEWAY_VERSION = 6
+    #: The default amount of dispatches that may be queued up.
+    QUEUE_SIZE = 1000
+    #: The supported payload encodings.
+    ENCODINGS = ('json', 'etf')
+
+    def __init__(self, token: str, url: str, **kwargs):
+        self._token = token
+        self.url = url
+        self.shard = tuple(kwargs.get('shard', (0, 1)))
+        self.large_threshold = kwargs.get('large_threshold', 250)
+        self.presence = kwargs.get('presence')
+        self.compress = kwargs.get('compress', True)
+        self.encoding = kwargs.get('encoding', 'json')
+        if self.encoding not in self.ENCODINGS:
+            raise ValueError('Unsupported encoding {}'.format(self.encoding))
+        self.identify_limiter = kwargs.get('identify_limiter')
+
+        self.session_id = None
+        self.sequence = None
+        self.latency = None
+
+        self._con = None
+        self._inflater = None
+        self._closing = False
+        self._acknowledged = True
+        self._last_heartbeat = None
+        self._backoff = RetryPolicy(base=1.0, cap=60.0)
+        self._failures = 0
+
+        self._send_lock = anyio.create_lock()
+        self._events = anyio.create_queue(kwargs.get('queue_size', self.QUEUE_SIZE))
+
+    def __repr__(self) -> str:
+        return '<GatewayConnection shard={0.shard} session={0.session_id}>'.format(self)
+
+    @property
+    def token(self) -> str:
+        """The token used for authorization."""
+
+        return self._token
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether a WebSocket connection is currently open."""
+
+        return self._con is not None
+
+    def _make_url(self) -> str:
+        url = '{}?v={}&encoding={}'.format(self.url, self.GATEWAY_VERSION, self.encoding)
+        if self.compress:
+            url += '&compress=zlib-stream'
+
+        return url
+
+    def events(self) -> _EventStream:
+        """Returns an async iterator over dispatched events.
+
+        The iterator yields tuples of event name and data and
+        stops once the connection has been closed for good.
+        """
+
+        return _EventStream(self)
+
+    async def get_event(self) -> Optional[Event]:
+        """Waits for the next dispatched event.
+
+        Returns
+        -------
+        Tuple[str, Any], optional
+            A tuple of event name and data, ``None`` if the
+            connection has been closed for good.
+        """
+
+        return await self._events.get()
+
+    async def run(self):
+        """Connects to the gateway and keeps the session alive.
+
+        This only returns after :meth:`~GatewayConnection.close`
+        has been called.
+
+        Raises
+        ------
+        :exc:`clamor.exceptions.GatewayError`
+            Raised when the gateway closed the connection with
+            a code that makes reconnecting pointless.
+        """
+
+        while not self._closing:
+            try:
+                await self._connect()
+            except ConnectionClosed as error:
+                code = error.reason.code
+                self._on_close(code)
+            except OSError as error:
+                logger.warning('Failed to connect to the gateway: %s', error)
+            finally:
+                self._con = None
+
+            if self._closing:
+                break
+
+            # Reset once a session is established, see _handle.
+            delay = self._backoff.backoff(self._failures)
+            self._failures += 1
+
+            logger.info('Reconnecting shard %s in %.2f seconds', self.shard, delay)
+            await anyio.sleep(delay)
+
+        # Tell consumers that no more events are coming. This is skipped
+        # when an error propagates so that the connection can be run again
+        # and resume where it left off.
+        await self._events.put(None)
+
+    def _on_close(self, code: int):
+        logger.info('Gateway connection of shard %s closed with %d', self.shard, code)
+
+        try:
+            code = CloseCode(code)
+        except ValueError:
+            # Abnormal closures and codes we don't know about.
+            return
+
+        if code.is_fatal and not self._closing:
+            raise GatewayError('Gateway connection closed irrecoverably', code)
+
+        if not code.is_resumable:
+            self.session_id = None
+            self.sequence = None
+
+    async def close(self, code: int = CloseCode.NORMAL):
+        """Closes the connection for good.
+
+        Parameters
+        ----------
+        code : int
+            The close code to send. Anything but ``1000``
+            keeps the session resumable.
+        """
+
+        self._closing = True
+
+        if self._con is not None:
+            await self._con.close(code)
+
+    async def _reconnect(self, reason: str):
+        # Closing with a code other than 1000 keeps the session alive.
+        logger.debug('Reconnecting shard %s: %s', self.shard, reason)
+        await self._con.close(CloseCode.UNKNOWN_ERROR, reason)
+
+    def _decode(self, message: Union[bytes, str]) -> dict:
+        if self.encoding == 'etf':
+            return etf.decode(message)
+
+        # Inflated messages are bytes, which json can't parse before 3.6.
+        if isinstance(message, (bytes, bytearray)):
+            message = message.decode('utf-8')
+
+        return json_loads(message)
+
+    def _encode(self, payload: dict) -> Union[bytes, str]:
+        if self.encoding == 'etf':
+            return etf.encode(payload)
+
+        # Text frames are used for JSON.
+        return json_dumps(payload).decode('utf-8')
+
+    async def _receive(self) -> dict:
+        message = await self._con.get_message()
+
+        if self._inflater is not None:
+            # Large payloads may be split across several frames.
+            message = self._inflater.feed(message)
+            while message is None:
+                message = self._inflater.feed(await self._con.get_message())
+
+        return self._decode(message)
+
+    async def send(self, op: Opcode, data: Any = None):
+        """Sends a payload to the gateway.
+
+        Parameters
+        ----------
+        op : :class:`~clamor.gateway.opcodes.Opcode`
+            The opcode of the payload.
+        data : Any, optional
+            The data of the payload.
+        """
+
+        message = self._encode({'op': int(op), 'd': data})
+
+        async with self._send_lock:
+            await self._con.send_message(message)
+
+    async def _connect(self):
+        if self.identify_limiter is not None and self.session_id is None:
+            # Wait before connecting so that heartbeats aren't held up.
+            await self.identify_limiter.wait(self.shard[0])
+
+        # Every connection starts with a fresh compression context.
+        self._inflater = ZlibStreamInflater() if self.compress else None
+
+        async with open_connection(self._make_url()) as self._con:
+            hello = await self._receive()
+            if hello['op'] != Opcode.HELLO:
+                raise GatewayError('Expected HELLO, received opcode {}'.format(hello['op']))
+
+            interval = hello['d']['heartbeat_interval'] / 1000.0
+
+            async with anyio.create_task_group() as tg:
+                await tg.spawn(self._heartbeat, interval)
+
+                try:
+                    if self.session_id is not None and self.sequence is not None:
+                        await self._resume()
+                    else:
+                        await self._identify()
+
+                    while True:
+                        await self._handle(await self._receive())
+                finally:
+                    await tg.cancel_scope.cancel()
+
+    async def _identify(self):
+        logger.debug('Identifying shard %s', self.shard)
+
+        data = {
+            'token': self._token,
+            'properties': {
+                '$os': sys.platform,
+                '$browser': clamor_title,
+                '$device': clamor_title,
+            },
+            'compress': False,
+            'large_threshold': self.large_threshold,
+            'shard': list(self.shard),
+        }
+        if self.presence is not None:
+            data['presence'] = self.presence
+
+        await self.send(Opcode.IDENTIFY, data)
+
+    async def _resume(self):
+        logger.debug('Resuming session %s of shard %s', self.session_id, self.shard)
+
+        await self.send(Opcode.RESUME, {
+            'token': self._token,
+            'session_id': self.session_id,
+            'seq': self.sequence,
+        })
+
+    async def _heartbeat(self, interval: float):
+        self._acknowledged = True
+
+        # Spread out the heartbeats of many connections.
+        await anyio.sleep(interval * random.random())
+
+        while True:
+            if not self._acknowledged:
+                await self._reconnect('Heartbeat was not acknowledged')
+                return
+
+            self._acknowledged = False
+            await self._send_heartbeat()
+            await anyio.sleep(interval)
+
+    async def _send_heartbeat(self):
+        self._last_heartbeat = time.monotonic()
+        await self.send(Opcode.HEARTBEAT, self.sequence)
+
+    async def _handle(self, payload: dict):
+        op = payload['op']
+        data = payload.get('d')
+
+        if op == Opcode.DISPATCH:
+            self.sequence = payload['s']
+            name = payload['t']
+
+            if name == 'READY':
+                self.session_id = data['session_id']
+                self._failures = 0
+                logger.info('Shard %s is ready', self.shard)
+            elif name == 'RESUMED':
+                self._failures = 0
+                logger.info('Shard %s resumed its session', self.shard)
+
+            await self._events.put((name, data))
+
+        elif op == Opcode.HEARTBEAT:
+            await self._send_heartbeat()
+
+        elif op == Opcode.HEARTBEAT_ACK:
+            self._acknowledged = True
+            if self._last_heartbeat is not None:
+                self.latency = time.monotonic() - self._last_heartbeat
+
+        elif op == Opcode.RECONNECT:
+            await self._reconnect('Gateway requested a reconnect')
+
+        elif op == Opcode.INVALID_SESSION:
+            if not data:
+                self.session_id = None
+                self.sequence = None
+
+            # The gateway wants us to wait a bit before trying again.
+            await anyio.sleep(random.uniform(1, 5))
+            await self._reconnect('Session was invalidated')
+
+        else:
+            logger.debug('Received unhandled opcode %d', op)
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import zlib
+from typing import Any, Callable, Dict, Tuple, Union
+
+__all__ = (
+    'decode',
+    'encode',
+)
+
+FORMAT_VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+_UINT16 = struct.Struct('>H')
+_UINT32 = struct.Struct('>I')
+_INT32 = struct.Struct('>i')
+_DOUBLE = struct.Struct('>d')
+
+_unpack_uint16 = _UINT16.unpack_from
+_unpack_uint32 = _UINT32.unpack_from
+_unpack_int32 = _INT32.unpack_from
+_unpack_double = _DOUBLE.unpack_from
+
+# Atoms are mostly the same few keys over and over again,
+# so decoded atoms are reused instead of decoded every time.
+# Atoms come from the peer, so only so many of them are kept.
+_MAX_ATOMS = 1024
+_atoms = {
+    b'nil': None,
+    b'true': True,
+    b'false': False,
+}
+
+_Result = Tuple[Any, int]
+
+
+def _decode_atom(view: memoryview, offset: int, size: int) -> _Result:
+    end = offset + size
+    raw = view[offset:end].tobytes()
+
+    try:
+        return _atoms[raw], end
+    except KeyError:
+        atom = raw.decode('utf-8')
+        if len(_atoms) < _MAX_ATOMS:
+            _atoms[raw] = atom
+        return atom, end
+
+
+def _decode_small_integer(view: memoryview, offset: int) -> _Result:
+    return view[offset], offset + 1
+
+
+def _decode_integer(view: memoryview, offset: int) -> _Result:
+    return _unpack_int32(view, offset)[0], offset + 4
+
+
+def _decode_new_float(view: memoryview, offset: int) -> _Result:
+    return _unpack_double(view, offset)[0], offset + 8
+
+
+def _decode_float(view: memoryview, offset: int) -> _Result:
+    # A 31 bytes long, null-padded string representation.
+    end = offset + 31
+    return float(view[offset:end].tobytes().rstrip(b'\x00')), end
+
+
+def _decode_atom_ext(view: memoryview, offset: int) -> _Result:
+    return _decode_atom(view, offset + 2, _unpack_uint16(view, offset)[0])
+
+
+def _decode_small_atom_ext(view: memoryview, offset: int) -> _Result:
+    return _decode_atom(view, offset + 1, view[offset])
+
+
+def _decode_sequence(view: memoryview, offset: int, length: int) -> _Result:
+    items = []
+    append = items.append
+
+    for _ in range(length):
+        tag = view[offset]
+        item, offset = _DECODERS[tag](view, offset + 1)
+        append(item)
+
+    return items, offset
+
+
+def _decode_small_tuple(view: memoryview, offset: int) -> _Result:
+    return _decode_sequence(view, offset + 1, view[offset])
+
+
+def _decode_large_tuple(view: memoryview, offset: int) -> _Result:
+    return _decode_sequence(view, offset + 4, _unpack_uint32(view, offset)[0])
+
+
+def _decode_nil(view: memoryview, offset: int) -> _Result:
+    return [], offset
+
+
+def _decode_string(view: memoryview, offset: int) -> _Result:
+    start = offset + 2
+    end = start + _unpack_uint16(view, offset)[0]
+    return str(view[start:end], 'latin-1'), end
+
+
+def _decode_list(view: memoryview, offset: int) -> _Result:
+    items, offset = _decode_sequence(view, offset + 4, _unpack_uint32(view, offset)[0])
+
+    # Proper lists end with an empty list as their tail.
+    if view[offset] == NIL_EXT:
+        return items, offset + 1
+
+    tail, offset = _DECODERS[view[offset]](view, offset + 1)
+    items.append(tail)
+    return items, offset
+
+
+def _decode_binary(view: memoryview, offset: int) -> _Result:
+    start = offset + 4
+    end = start + _unpack_uint32(view, offset)[0]
+    return str(view[start:end], 'utf-8'), end
+
+
+def _decode_big(view: memoryview, offset: int, size: int) -> _Result:
+    sign = view[offset]
+    start = offset + 1
+    end = start + size
+
+    value = int.from_bytes(view[start:end], 'little')
+    return -value if sign else value, end
+
+
+def _decode_small_big(view: memoryview, offset: int) -> _Result:
+    return _decode_big(view, offset + 1, view[offset])
+
+
+def _decode_large_big(view: memoryview, offset: int) -> _Result:
+    return _decode_big(view, offset + 4, _unpack_uint32(view, offset)[0])
+
+
+def _decode_map(view: memoryview, offset: int) -> _Result:
+    length = _unpack_uint32(view, offset)[0]
+    offset += 4
+
+    result = {}
+    decoders = _DECODERS
+    for _ in range(length):
+        tag = view[offset]
+        if tag == SMALL_ATOM_UTF8_EXT or tag == SMALL_ATOM_EXT:
+            # Keys are nearly always atoms, decode them right here.
+            start = offset + 2
+            offset = start + view[offset + 1]
+            raw = view[start:offset].tobytes()
+
+            try:
+                key = _atoms[raw]
+            except KeyError:
+                key = raw.decode('utf-8')
+                if len(_atoms) < _MAX_ATOMS:
+                    _atoms[raw] = key
+        else:
+            key, offset = decoders[tag](view, offset + 1)
+
+        tag = view[offset]
+        if tag == BINARY_EXT:
+            start = offset + 5
+            offset = start + _unpack_uint32(view, offset + 1)[0]
+            result[key] = str(view[start:offset], 'utf-8')
+        else:
+            result[key], offset = decoders[tag](view, offset + 1)
+
+    return result, offset
+
+
+_DECODERS = {
+    NEW_FLOAT_EXT: _decode_new_float,
+    SMALL_INTEGER_EXT: _decode_small_integer,
+    INTEGER_EXT: _decode_integer,
+    FLOAT_EXT: _decode_float,
+    ATOM_EXT: _decode_atom_ext,
+    SMALL_TUPLE_EXT: _decode_small_tuple,
+    LARGE_TUPLE_EXT: _decode_large_tuple,
+    NIL_EXT: _decode_nil,
+    STRING_EXT: _decode_string,
+    LIST_EXT: _decode_list,
+    BINARY_EXT: _decode_binary,
+    SMALL_BIG_EXT: _decode_small_big,
+    LARGE_BIG_EXT: _decode_large_big,
+    SMALL_ATOM_EXT: _decode_small_atom_ext,
+    MAP_EXT: _decode_map,
+    ATOM_UTF8_EXT: _decode_atom_ext,
+    SMALL_ATOM_UTF8_EXT: _decode_small_atom_ext,
+}  # type: Dict[int, Callable[[memoryview, int], _Result]]
+
+
+def decode(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """Decodes a term in the Erlang External Term Format.
+
+    Only the subset of terms the Discord gateway uses is supported.
+    Atoms and binaries are decoded to strings, except for ``nil``,
+    ``true`` and ``false``, which become ``None``, ``True`` and
+    ``False``. Tuples are decoded to lists.
+
+    Terms are decoded straight from a :class:`memoryview` of the data,
+    so nothing but the resulting objects is allocated.
+
+    Parameters
+    ----------
+    data : Union[bytes, bytearray, memoryview]
+        The encoded term, starting with the format version.
+
+    Returns
+    -------
+    Any
+        The decoded object.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        Raised when the data is malformed or contains unsupported terms.
+    """
+
+    view = memoryview(data)
+    if not view or view[0] != FORMAT_VERSION:
+        raise ValueError('Unsupported ETF format version')
+
+    offset = 1
+    if view[offset] == COMPRESSED:
+        size = _unpack_uint32(view, offset + 1)[0]
+        view = memoryview(zlib.decompress(view[offset + 5:], zlib.MAX_WBITS, size))
+        offset = 0
+
+    try:
+        value, offset = _DECODERS[view[offset]](view, offset + 1)
+    except KeyError as error:
+        raise ValueError('Unsupported ETF tag {}'.format(error.args[0])) from None
+    except (IndexError, struct.error):
+        raise ValueError('Truncated ETF data') from None
+
+    # Slicing past the end of the data doesn't fail on its own.
+    if offset > len(view):
+        raise ValueError('Truncated ETF data')
+
+    return value
+
+
+def _encode_atom(name: bytes, buffer: bytearray):
+    buffer.append(SMALL_ATOM_UTF8_EXT)
+    buffer.append(len(name))
+    buffer += name
+
+
+def _encode_term(obj: Any, buffer: bytearray):
+    if obj is None:
+        _encode_atom(b'nil', buffer)
+    elif obj is True:
+        _encode_atom(b'true', buffer)
+    elif obj is False:
+        _encode_atom(b'false', buffer)
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        buffer.append(BINARY_EXT)
+        buffer += _UINT32.pack(len(data))
+        buffer += data
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            buffer.append(SMALL_INTEGER_EXT)
+            buffer.append(obj)
+        elif -2 ** 31 <= obj < 2 ** 31:
+            buffer.append(INTEGER_EXT)
+            buffer += _INT32.pack(obj)
+        else:
+            data = abs(obj).to_bytes((abs(obj).bit_length() + 7) // 8, 'little')
+            if len(data) > 255:
+                raise ValueError('Integer is too large to encode')
+
+            buffer.append(SMALL_BIG_EXT)
+            buffer.append(len(data))
+            buffer.append(1 if obj < 0 else 0)
+            buffer += data
+    elif isinstance(obj, float):
+        buffer.append(NEW_FLOAT_EXT)
+        buffer += _DOUBLE.pack(obj)
+    elif isinstance(obj, dict):
+        buffer.append(MAP_EXT)
+        buffer += _UINT32.pack(len(obj))
+        for key, value in obj.items():
+            name = key.encode('utf-8') if isinstance(key, str) else None
+            if name is not None and len(name) < 256:
+                # Like the gateway does, keys are sent as atoms.
+                _encode_atom(name, buffer)
+            else:
+                _encode_term(key, buffer)
+
+            _encode_term(value, buffer)
+    elif isinstance(obj, (list, tuple)):
+        if obj:
+            buffer.append(LIST_EXT)
+            buffer += _UINT32.pack(len(obj))
+            for item in obj:
+                _encode_term(item, buffer)
+
+        buffer.append(NIL_EXT)
+    elif isinstance(obj, (bytes, bytearray)):
+        buffer.append(BINARY_EXT)
+        buffer += _UINT32.pack(len(obj))
+        buffer += obj
+    else:
+        raise TypeError('Object of type {} is not ETF serializable'.format(type(obj).__name__))
+
+
+def encode(obj: Any) -> bytes:
+    """Encodes an object in the Erlang External Term Format.
+
+    Strings are encoded as binaries and ``None`` as the ``nil`` atom.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to encode.
+
+    Returns
+    -------
+    bytes
+        The encoded term, starting with the format version.
+
+    Raises
+    ------
+    :exc:`TypeError`
+        Raised when the object contains types that can't be encoded.
+    """
+
+    buffer = bytearray((FORMAT_VERSION,))
+    _encode_term(obj, buffer)
+    return bytes(buffer)
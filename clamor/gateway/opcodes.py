@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from enum import IntEnum
+
+__all__ = (
+    'Opcode',
+    'CloseCode',
+)
+
+
+class Opcode(IntEnum):
+    """Enum that holds the gateway opcodes."""
+
+    #: An event was dispatched.
+    DISPATCH = 0
+    #: Fired periodically by the client to keep the connection alive.
+    HEARTBEAT = 1
+    #: Starts a new session during the initial handshake.
+    IDENTIFY = 2
+    #: Update the client's presence.
+    STATUS_UPDATE = 3
+    #: Used to join/leave or move between voice channels.
+    VOICE_STATE_UPDATE = 4
+    #: Resume a previous session that was disconnected.
+    RESUME = 6
+    #: The client should reconnect and resume immediately.
+    RECONNECT = 7
+    #: Request information about offline guild members in a large guild.
+    REQUEST_GUILD_MEMBERS = 8
+    #: The session has been invalidated.
+    INVALID_SESSION = 9
+    #: Sent immediately after connecting, contains the heartbeat interval.
+    HELLO = 10
+    #: Sent in response to receiving a heartbeat to acknowledge that it has been received.
+    HEARTBEAT_ACK = 11
+
+
+class CloseCode(IntEnum):
+    """Enum that holds the gateway close event codes."""
+
+    #: Regular closure. Invalidates the session.
+    NORMAL = 1000
+
+    #: Unknown error.
+    UNKNOWN_ERROR = 4000
+    #: An invalid opcode or payload for an opcode was sent.
+    UNKNOWN_OPCODE = 4001
+    #: An invalid payload was sent.
+    DECODE_ERROR = 4002
+    #: A payload was sent prior to identifying.
+    NOT_AUTHENTICATED = 4003
+    #: The account token sent with the identify payload is incorrect.
+    AUTHENTICATION_FAILED = 4004
+    #: More than one identify payload was sent.
+    ALREADY_AUTHENTICATED = 4005
+    #: The sequence sent when resuming the session was invalid.
+    INVALID_SEQ = 4007
+    #: Payloads are being sent too quickly.
+    RATE_LIMITED = 4008
+    #: The session timed out.
+    SESSION_TIMEOUT = 4009
+    #: An invalid shard was sent when identifying.
+    INVALID_SHARD = 4010
+    #: The session would have handled too many guilds.
+    SHARDING_REQUIRED = 4011
+
+    @property
+    def is_fatal(self) -> bool:
+        """Whether reconnecting after this close code is pointless."""
+
+        return self in (
+            CloseCode.AUTHENTICATION_FAILED,
+            CloseCode.INVALID_SHARD,
+            CloseCode.SHARDING_REQUIRED,
+        )
+
+    @property
+    def is_resumable(self) -> bool:
+        """Whether the session may be resumed after this close code."""
+
+        return self not in (
+            CloseCode.NORMAL,
+            CloseCode.INVALID_SEQ,
+            CloseCode.SESSION_TIMEOUT,
+        )
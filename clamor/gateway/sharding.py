@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import anyio
+
+from ..exceptions import GatewayError
+from ..rest.endpoints import GatewayWrapper
+from ..rest.retry import RetryPolicy
+from .connection import GatewayConnection
+
+__all__ = (
+    'IdentifyLimiter',
+    'ShardEvent',
+    'ShardManager',
+)
+
+logger = logging.getLogger(__name__)
+
+#: A type to denote dispatched events as tuples of shard ID, event name and data.
+ShardEvent = Tuple[int, str, Any]
+
+
+class IdentifyLimiter:
+    """Coordinates when gateway connections may identify.
+
+    Discord allows one identify per rate limit key every five seconds,
+    where the key of a shard is its ID modulo ``max_concurrency``. Shards
+    with different keys may identify at the same time.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        The amount of shards that may identify at once, defaults to ``1``.
+    interval : float
+        The time between two identifies of the same key in seconds,
+        defaults to ``5``.
+
+    Attributes
+    ----------
+    max_concurrency : int
+        The amount of shards that may identify at once.
+    interval : float
+        The time between two identifies of the same key in seconds.
+    """
+
+    __slots__ = ('max_concurrency', 'interval', '_locks', '_next_at')
+
+    def __init__(self, max_concurrency: int = 1, interval: float = 5.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.interval = interval
+
+        self._locks = {}
+        self._next_at = {}
+
+    def __repr__(self) -> str:
+        return '<IdentifyLimiter max_concurrency={0.max_concurrency}>'.format(self)
+
+    async def wait(self, shard_id: int):
+        """Waits until the given shard may identify.
+
+        Parameters
+        ----------
+        shard_id : int
+            The ID of the shard that wants to identify.
+        """
+
+        key = shard_id % self.max_concurrency
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = anyio.create_lock()
+
+        async with lock:
+            delay = self._next_at.get(key, 0.0) - time.monotonic()
+            if delay > 0:
+                logger.debug('Shard %d waits %.2f seconds to identify', shard_id, delay)
+                await anyio.sleep(delay)
+
+            self._next_at[key] = time.monotonic() + self.interval
+
+
+class _ShardEventStream:
+    __slots__ = ('_manager',)
+
+    def __init__(self, manager: 'ShardManager'):
+        self._manager = manager
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ShardEvent:
+        event = await self._manager.get_event()
+        if event is None:
+            raise StopAsyncIteration
+
+        return event
+
+
+class ShardManager:
+    r"""Runs multiple gateway shards within one process.
+
+    The shard count and identify concurrency are taken from
+    :meth:`~clamor.rest.endpoints.GatewayWrapper.get_gateway_bot` unless
+    given explicitly. Shards are started as soon as the identify rate
+    limit allows it, so with a ``max_concurrency`` greater than one,
+    multiple shards start in parallel.
+
+    Shards that crash are started again and resume their session.
+    The events of all shards are funneled into a single stream.
+
+    Parameters
+    ----------
+    token : str
+        The token to use for authorization.
+    \**kwargs : dict
+        See below. Any other keyword arguments are passed
+        to every :class:`~clamor.gateway.connection.GatewayConnection`.
+
+    Keyword Arguments
+    -----------------
+    shard_count : int, optional
+        The total amount of shards. Defaults to the recommended amount.
+    shard_ids : Iterable[int], optional
+        The IDs of the shards to run in this process. Defaults to all.
+    gateway : :class:`~clamor.rest.endpoints.GatewayWrapper`, optional
+        The wrapper to request the gateway information with.
+    identify_limiter : :class:`~clamor.gateway.sharding.IdentifyLimiter`, optional
+        Coordinates identifies with shards outside of this manager.
+        Defaults to a limiter based on ``max_concurrency``.
+    queue_size : int
+        The maximum amount of dispatches that may be queued up
+        before receiving blocks, defaults to ``1000``.
+
+    Attributes
+    ----------
+    shards : Dict[int, :class:`~clamor.gateway.connection.GatewayConnection`]
+        The connections that are run, mapped by shard ID.
+    shard_count : int, optional
+        The total amount of shards, ``None`` until :meth:`~ShardManager.run` was called.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        manager = ShardManager(token)
+
+        async with anyio.create_task_group() as tg:
+            await tg.spawn(manager.run)
+
+            async for shard_id, name, data in manager.events():
+                ...
+    """
+
+    #: The default amount of dispatches that may be queued up.
+    QUEUE_SIZE = 1000
+
+    def __init__(self, token: str, **kwargs):
+        self._token = token
+        self.shard_count = kwargs.pop('shard_count', None)
+        self._shard_ids = kwargs.pop('shard_ids', None)
+        self._gateway = kwargs.pop('gateway', None) or GatewayWrapper(token)
+        self._identify_limiter = kwargs.pop('identify_limiter', None)
+        queue_size = kwargs.pop('queue_size', self.QUEUE_SIZE)
+        self._options = kwargs
+
+        self.shards = {}  # type: Dict[int, GatewayConnection]
+        self._running = 0
+        self._closing = False
+        self._restart = RetryPolicy(base=1.0, cap=60.0)
+        self._events = anyio.create_queue(queue_size)
+
+    def __repr__(self) -> str:
+        return '<ShardManager shards={} shard_count={}>'.format(len(self.shards), self.shard_count)
+
+    def events(self) -> _ShardEventStream:
+        """Returns an async iterator over the events of all shards.
+
+        The iterator yields tuples of shard ID, event name and data
+        and stops once all shards have been closed.
+        """
+
+        return _ShardEventStream(self)
+
+    async def get_event(self) -> Optional[ShardEvent]:
+        """Waits for the next event of any shard.
+
+        Returns
+        -------
+        Tuple[int, str, Any], optional
+            A tuple of shard ID, event name and data, ``None``
+            if all shards have been closed.
+        """
+
+        return await self._events.get()
+
+    async def run(self):
+        """Requests the gateway information and runs all shards.
+
+        This only returns after :meth:`~ShardManager.close` has been called.
+
+        Raises
+        ------
+        :exc:`clamor.exceptions.GatewayError`
+            Raised when a shard can't be run anymore.
+        """
+
+        info = await self._gateway.get_gateway_bot()
+        if self.shard_count is None:
+            self.shard_count = info['shards']
+
+        shard_ids = list(self._shard_ids if self._shard_ids is not None
+                         else range(self.shard_count))
+
+        limit = info.get('session_start_limit', {})
+        remaining = limit.get('remaining', len(shard_ids))
+        if remaining < len(shard_ids):
+            # Starting now would only burn through the remaining sessions.
+            delay = limit.get('reset_after', 0) / 1000.0
+            logger.warning('Only %d session starts remaining, waiting %.2f seconds',
+                           remaining, delay)
+            await anyio.sleep(delay)
+
+        limiter = self._identify_limiter or IdentifyLimiter(limit.get('max_concurrency', 1))
+        logger.info('Starting %d of %d shards with an identify concurrency of %d',
+                    len(shard_ids), self.shard_count, limiter.max_concurrency)
+
+        for shard_id in shard_ids:
+            self.shards[shard_id] = GatewayConnection(
+                self._token, info['url'], shard=(shard_id, self.shard_count),
+                identify_limiter=limiter, **self._options)
+
+        self._running = len(self.shards)
+        if not self._running:
+            await self._events.put(None)
+            return
+
+        async with anyio.create_task_group() as tg:
+            for connection in self.shards.values():
+                await tg.spawn(self._run_shard, connection)
+                await tg.spawn(self._forward, connection)
+
+    async def close(self):
+        """Closes the connections of all shards."""
+
+        self._closing = True
+
+        for connection in self.shards.values():
+            await connection.close()
+
+    async def _run_shard(self, connection: GatewayConnection):
+        failures = 0
+
+        while True:
+            try:
+                await connection.run()
+            except GatewayError:
+                raise
+            except anyio.get_cancelled_exc_class():
+                raise
+            except Exception:
+                if self._closing:
+                    return
+
+                delay = self._restart.backoff(failures)
+                failures += 1
+
+                # The connection keeps its session, so it resumes on restart.
+                logger.exception('Shard %s crashed, restarting in %.2f seconds',
+                                 connection.shard, delay)
+                await anyio.sleep(delay)
+            else:
+                return
+
+    async def _forward(self, connection: GatewayConnection):
+        shard_id = connection.shard[0]
+
+        while True:
+            event = await connection.get_event()
+            if event is None:
+                break
+
+            name, data = event
+            await self._events.put((shard_id, name, data))
+
+        self._running -= 1
+        if not self._running:
+            await self._events.put(None)
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+from .audit_log import *
+from .base import *
+from .channel import *
+from .emoji import *
+from .guild import *
+from .invite import *
+from .user import *
+from .webhook import *
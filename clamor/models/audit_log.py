@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'AuditLog',
+    'AuditLogEntry',
+)
+
+
+class AuditLogEntry(Model):
+    """An entry of a guild's audit log.
+
+    .. seealso:: Audit Log Entry object
+        https://discordapp.com/developers/docs/resources/audit-log#audit-log-entry-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'target_id': raw,
+        'changes': raw,
+        'user_id': snowflake,
+        'action_type': raw,
+        'options': raw,
+        'reason': raw,
+    }
+
+
+class AuditLog(Model):
+    """The audit log of a guild.
+
+    .. seealso:: Audit Log object
+        https://discordapp.com/developers/docs/resources/audit-log#audit-log-object
+    """
+
+    webhooks = Nested('Webhook', many=True)
+    users = Nested('User', many=True)
+    audit_log_entries = Nested('AuditLogEntry', many=True)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from typing import Any, Callable, Dict, Optional, Union
+
+__all__ = (
+    'Model',
+    'Nested',
+    'interned',
+    'raw',
+    'snowflake',
+    'snowflakes',
+)
+
+# Models by name, so that nested models can reference
+# models which are defined later on.
+_models = {}  # type: Dict[str, type]
+
+
+def snowflake(value: Union[int, str]) -> int:
+    """Converts an ID to an integer."""
+
+    return int(value)
+
+
+def snowflakes(values: list) -> tuple:
+    """Converts a list of IDs to a tuple of integers."""
+
+    return tuple(int(value) for value in values)
+
+
+def interned(value: str) -> str:
+    """Interns a string, so that equal values share one object.
+
+    Meant for values that repeat a lot, like names, hashes and locales.
+    """
+
+    return sys.intern(value)
+
+
+def raw(value: Any) -> Any:
+    """Keeps a value as it is.
+
+    Meant for numbers, flags, strings that hardly ever
+    repeat and objects that don't have a model.
+    """
+
+    return value
+
+
+class Nested:
+    """A field that holds other models.
+
+    Lazy fields keep the raw payload around and only parse
+    it into models when the attribute is first accessed.
+
+    Parameters
+    ----------
+    model : str
+        The name of the model class.
+    many : bool
+        Whether the field holds a list of models, defaults to ``False``.
+    lazy : bool
+        Whether to parse the payload on first access, defaults to ``True``.
+
+    Attributes
+    ----------
+    name : str
+        The name of the attribute.
+    slot : str
+        The name of the slot that holds the value.
+    """
+
+    __slots__ = ('model', 'many', 'lazy', 'name', 'slot')
+
+    def __init__(self, model: str, many: bool = False, lazy: bool = True):
+        self.model = model
+        self.many = many
+        self.lazy = lazy
+        self.name = None
+        self.slot = None
+
+    def __repr__(self) -> str:
+        return '<Nested name={0.name} model={0.model} many={0.many}>'.format(self)
+
+    def __get__(self, instance: Optional['Model'], owner: type) -> Any:
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.slot)
+        if isinstance(value, (dict, list)):
+            value = self.parse(value)
+            setattr(instance, self.slot, value)
+
+        return value
+
+    def __set__(self, instance: 'Model', value: Any):
+        setattr(instance, self.slot, value)
+
+    def parse(self, value: Union[dict, list]) -> Any:
+        """Parses a payload into models."""
+
+        model = _models[self.model]
+        if self.many:
+            return tuple(model.from_dict(item) for item in value)
+
+        return model.from_dict(value)
+
+
+class ModelMeta(type):
+    """Generates the slots of models from their fields."""
+
+    def __new__(mcs, name: str, bases: tuple, namespace: dict):
+        fields = namespace.get('FIELDS', {})
+        nested = [(attr, value) for attr, value in namespace.items()
+                  if isinstance(value, Nested)]
+
+        slots = list(fields)
+        for attr, field in nested:
+            field.name = attr
+            field.slot = '_' + attr
+            slots.append(field.slot)
+
+        namespace['__slots__'] = tuple(slots)
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        # Collect the fields of all base classes once, so that parsing
+        # doesn't have to walk the class hierarchy for every payload.
+        converters = []
+        children = []
+        for klass in reversed(cls.__mro__):
+            converters.extend(getattr(klass, 'FIELDS', {}).items())
+            children.extend(value for value in vars(klass).values()
+                            if isinstance(value, Nested))
+
+        cls._converters = tuple(converters)
+        cls._nested = tuple(children)
+
+        _models[name] = cls
+        return cls
+
+
+class Model(metaclass=ModelMeta):
+    """Base class for Discord entities.
+
+    Unlike the raw payloads the API returns, models use slots
+    instead of dicts, hold IDs as integers and share equal strings
+    where values tend to repeat, which cuts their memory footprint
+    down considerably. Keys of payloads that a model doesn't know
+    are dropped.
+
+    Fields that aren't present in a payload are ``None``.
+
+    Subclasses declare their fields in :attr:`~Model.FIELDS`,
+    mapping names to functions that convert the raw values, and
+    nested models as class attributes of :class:`~Nested`.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        member = Member.from_dict(await guild.get_guild_member(user_id))
+        print(member.user.username, member.roles)
+    """
+
+    #: The names of fields mapped to functions to convert their values.
+    FIELDS = {}  # type: Dict[str, Callable[[Any], Any]]
+
+    def __repr__(self) -> str:
+        key = getattr(self, 'id', None)
+        if key is None:
+            return '<{}>'.format(type(self).__name__)
+
+        return '<{} id={}>'.format(type(self).__name__, key)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+
+        key = getattr(self, 'id', None)
+        if key is None:
+            return self is other
+
+        return key == other.id
+
+    def __hash__(self) -> int:
+        key = getattr(self, 'id', None)
+        if key is None:
+            return object.__hash__(self)
+
+        return hash((type(self), key))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Model':
+        """Creates a model from a payload.
+
+        Parameters
+        ----------
+        data : dict
+            The payload, as returned by the API.
+
+        Returns
+        -------
+        :class:`~Model`
+            The model.
+        """
+
+        self = cls.__new__(cls)
+
+        for name, convert in cls._converters:
+            value = data.get(name)
+            setattr(self, name, convert(value) if value is not None else None)
+
+        for field in cls._nested:
+            value = data.get(field.name)
+            if value is not None and not field.lazy:
+                value = field.parse(value)
+
+            setattr(self, field.slot, value)
+
+        return self
+
+    def to_dict(self) -> dict:
+        """Converts the model back to a payload.
+
+        IDs stay integers and fields that are ``None`` are left out.
+
+        Returns
+        -------
+        dict
+            The payload.
+        """
+
+        data = {}
+        for name, _ in self._converters:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = list(value) if isinstance(value, tuple) else value
+
+        for field in self._nested:
+            value = getattr(self, field.name)
+            if value is None:
+                continue
+
+            if field.many:
+                data[field.name] = [item.to_dict() for item in value]
+            else:
+                data[field.name] = value.to_dict()
+
+        return data
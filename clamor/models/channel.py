@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'Channel',
+    'Message',
+    'Overwrite',
+)
+
+
+class Overwrite(Model):
+    """A permission overwrite of a channel.
+
+    .. seealso:: Overwrite object
+        https://discordapp.com/developers/docs/resources/channel#overwrite-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'type': interned,
+        'allow': raw,
+        'deny': raw,
+    }
+
+
+class Channel(Model):
+    """A guild or DM channel.
+
+    .. seealso:: Channel object
+        https://discordapp.com/developers/docs/resources/channel#channel-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'type': raw,
+        'guild_id': snowflake,
+        'position': raw,
+        'name': interned,
+        'topic': raw,
+        'nsfw': raw,
+        'last_message_id': snowflake,
+        'bitrate': raw,
+        'user_limit': raw,
+        'rate_limit_per_user': raw,
+        'icon': raw,
+        'owner_id': snowflake,
+        'application_id': snowflake,
+        'parent_id': snowflake,
+        'last_pin_timestamp': raw,
+    }
+
+    permission_overwrites = Nested('Overwrite', many=True)
+    recipients = Nested('User', many=True)
+
+
+class Message(Model):
+    """A message in a channel.
+
+    Attachments, embeds and reactions are kept as they are.
+
+    .. seealso:: Message object
+        https://discordapp.com/developers/docs/resources/channel#message-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'channel_id': snowflake,
+        'guild_id': snowflake,
+        'content': raw,
+        'timestamp': raw,
+        'edited_timestamp': raw,
+        'tts': raw,
+        'mention_everyone': raw,
+        'mention_roles': snowflakes,
+        'attachments': raw,
+        'embeds': raw,
+        'reactions': raw,
+        'nonce': raw,
+        'pinned': raw,
+        'webhook_id': snowflake,
+        'type': raw,
+        'activity': raw,
+        'application': raw,
+    }
+
+    author = Nested('User')
+    member = Nested('Member')
+    mentions = Nested('User', many=True)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'Emoji',
+)
+
+
+class Emoji(Model):
+    """A custom emoji of a guild.
+
+    .. seealso:: Emoji object https://discordapp.com/developers/docs/resources/emoji#emoji-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'name': interned,
+        'roles': snowflakes,
+        'require_colons': raw,
+        'managed': raw,
+        'animated': raw,
+    }
+
+    user = Nested('User')
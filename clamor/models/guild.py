@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'Guild',
+    'Member',
+    'Role',
+)
+
+
+class Role(Model):
+    """A role of a guild.
+
+    .. seealso:: Role object https://discordapp.com/developers/docs/topics/permissions#role-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'name': interned,
+        'color': raw,
+        'hoist': raw,
+        'position': raw,
+        'permissions': raw,
+        'managed': raw,
+        'mentionable': raw,
+    }
+
+
+class Member(Model):
+    """A member of a guild.
+
+    Unlike other nested models, the user is parsed right away,
+    since a member is hardly of any use without it.
+
+    .. seealso:: Guild Member object
+        https://discordapp.com/developers/docs/resources/guild#guild-member-object
+    """
+
+    FIELDS = {
+        'guild_id': snowflake,
+        'nick': interned,
+        'roles': snowflakes,
+        'joined_at': raw,
+        'premium_since': raw,
+        'deaf': raw,
+        'mute': raw,
+    }
+
+    user = Nested('User', lazy=False)
+
+    def __repr__(self) -> str:
+        return '<Member user={}>'.format(self.user.id if self.user else None)
+
+
+class Guild(Model):
+    """A Discord guild.
+
+    .. seealso:: Guild object https://discordapp.com/developers/docs/resources/guild#guild-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'name': interned,
+        'icon': raw,
+        'splash': raw,
+        'owner': raw,
+        'owner_id': snowflake,
+        'permissions': raw,
+        'region': interned,
+        'afk_channel_id': snowflake,
+        'afk_timeout': raw,
+        'embed_enabled': raw,
+        'embed_channel_id': snowflake,
+        'verification_level': raw,
+        'default_message_notifications': raw,
+        'explicit_content_filter': raw,
+        'features': raw,
+        'mfa_level': raw,
+        'application_id': snowflake,
+        'widget_enabled': raw,
+        'widget_channel_id': snowflake,
+        'system_channel_id': snowflake,
+        'joined_at': raw,
+        'large': raw,
+        'unavailable': raw,
+        'member_count': raw,
+        'voice_states': raw,
+        'presences': raw,
+        'max_presences': raw,
+        'max_members': raw,
+        'vanity_url_code': raw,
+        'description': raw,
+        'banner': raw,
+        'premium_tier': raw,
+        'premium_subscription_count': raw,
+        'preferred_locale': interned,
+    }
+
+    roles = Nested('Role', many=True)
+    emojis = Nested('Emoji', many=True)
+    members = Nested('Member', many=True)
+    channels = Nested('Channel', many=True)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'Invite',
+)
+
+
+class Invite(Model):
+    """An invite to a guild or group DM.
+
+    Metadata is only present when the invite was retrieved
+    through the invites of a guild or channel.
+
+    .. seealso:: Invite object https://discordapp.com/developers/docs/resources/invite#invite-object
+    """
+
+    FIELDS = {
+        'code': raw,
+        'target_user_type': raw,
+        'approximate_presence_count': raw,
+        'approximate_member_count': raw,
+        'uses': raw,
+        'max_uses': raw,
+        'max_age': raw,
+        'temporary': raw,
+        'created_at': raw,
+    }
+
+    guild = Nested('Guild')
+    channel = Nested('Channel')
+    target_user = Nested('User')
+    inviter = Nested('User')
+
+    def __repr__(self) -> str:
+        return '<Invite code={}>'.format(self.code)
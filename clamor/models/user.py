@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'User',
+)
+
+
+class User(Model):
+    """A Discord user.
+
+    .. seealso:: User object https://discordapp.com/developers/docs/resources/user#user-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'username': interned,
+        'discriminator': interned,
+        'avatar': raw,
+        'bot': raw,
+        'mfa_enabled': raw,
+        'locale': interned,
+        'verified': raw,
+        'email': raw,
+        'flags': raw,
+        'premium_type': raw,
+    }
+
+    def __str__(self) -> str:
+        return '{0.username}#{0.discriminator}'.format(self)
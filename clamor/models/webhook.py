@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+from .base import *
+
+__all__ = (
+    'Webhook',
+)
+
+
+class Webhook(Model):
+    """A webhook of a channel.
+
+    .. seealso:: Webhook object
+        https://discordapp.com/developers/docs/resources/webhook#webhook-object
+    """
+
+    FIELDS = {
+        'id': snowflake,
+        'guild_id': snowflake,
+        'channel_id': snowflake,
+        'name': interned,
+        'avatar': raw,
+        'token': raw,
+    }
+
+    user = Nested('User')
@@ -2,5 +2,17 @@
 
 from . import endpoints
 from .http import *
+from .bulk import *
+from .coalesce import *
+from .codec import *
+from .metrics import *
+from .multipart import *
+from .pagination import *
+from .pool import *
 from .rate_limit import *
+from .recorder import *
+from .request_log import *
+from .response_cache import *
+from .retry import *
 from .routes import *
+from .tracing import *
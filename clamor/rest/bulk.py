@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from string import Formatter
+from typing import Any, Awaitable, Callable, Iterable, List, Sized
+
+import anyio
+
+from .http import HTTP
+from .routes import APIRoute
+
+__all__ = (
+    'BulkExecutor',
+    'BulkResult',
+)
+
+logger = logging.getLogger(__name__)
+
+_Operation = Callable[[], Awaitable[Any]]
+
+# Marks the end of the results.
+_DONE = object()
+
+
+class BulkResult:
+    """The outcome of a single operation of a :class:`~clamor.rest.bulk.BulkExecutor`.
+
+    Attributes
+    ----------
+    index : int
+        The position of the operation in the given operations.
+    operation : Callable[[], Awaitable[Any]]
+        The operation itself.
+    result : Any
+        What the operation returned, ``None`` if it failed.
+    error : Exception, optional
+        The exception the operation raised, if any.
+    """
+
+    __slots__ = ('index', 'operation', 'result', 'error')
+
+    def __init__(self, index: int, operation: _Operation, result: Any = None,
+                 error: Exception = None):
+        self.index = index
+        self.operation = operation
+        self.result = result
+        self.error = error
+
+    def __repr__(self) -> str:
+        return '<BulkResult index={0.index} ok={0.ok}>'.format(self)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded."""
+
+        return self.error is None
+
+
+class BulkExecutor:
+    """Runs many operations against one rate limit bucket concurrently.
+
+    Starting thousands of requests at once makes them all queue up in
+    the rate limiter, while running them one by one leaves most of the
+    bucket's capacity unused. This runs as many operations at the same
+    time as the bucket allows requests per window, so the bucket is
+    always saturated without being exceeded.
+
+    Until the rate limits of the bucket are known, only one operation
+    is started. Operations are taken from the iterable lazily, so it
+    may be a generator of any size.
+
+    Results are streamed in the order operations complete. Exceptions
+    raised by operations are reported in their results instead of
+    stopping the other operations.
+
+    Parameters
+    ----------
+    http : :class:`~clamor.rest.http.HTTP`
+        The client whose rate limiter the operations go through.
+    route : Tuple[:class:`~clamor.rest.routes.Method`, str]
+        The route the operations make their requests to.
+    operations : Iterable[Callable[[], Awaitable[Any]]]
+        Coroutine functions that perform one request each,
+        e.g. :func:`functools.partial` objects of endpoint methods.
+    fmt : dict, optional
+        The major parameters of the route, i.e. the guild,
+        channel or webhook the operations affect.
+    concurrency : int, optional
+        A fixed amount of operations to run at the same time
+        instead of deriving it from the bucket.
+    max_concurrency : int
+        The maximum amount of operations to run at the same time,
+        defaults to :attr:`BulkExecutor.MAX_CONCURRENCY`.
+    progress : Callable[[BulkExecutor], Any], optional
+        A function that is called with the executor after each
+        completed operation, e.g. to report :attr:`BulkExecutor.completed`.
+
+    Attributes
+    ----------
+    total : int, optional
+        The amount of operations, ``None`` if the iterable has no length.
+    succeeded : int
+        The amount of operations that succeeded.
+    failed : int
+        The amount of operations that failed.
+    running : int
+        The amount of operations that are currently running.
+    cancelled : bool
+        Whether :meth:`~BulkExecutor.cancel` has been called.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        bans = (partial(guild.create_guild_ban, user_id, reason='Raid') for user_id in raiders)
+        executor = BulkExecutor(guild.http, Routes.CREATE_GUILD_BAN, bans,
+                                dict(guild=guild.guild_id))
+
+        async with executor:
+            async for result in executor:
+                if not result.ok:
+                    print('Operation', result.index, 'failed:', result.error)
+    """
+
+    #: The default maximum amount of operations to run at the same time.
+    MAX_CONCURRENCY = 50
+
+    def __init__(self,
+                 http: HTTP,
+                 route: APIRoute,
+                 operations: Iterable[_Operation],
+                 fmt: dict = None,
+                 concurrency: int = None,
+                 max_concurrency: int = MAX_CONCURRENCY,
+                 progress: Callable[['BulkExecutor'], Any] = None):
+        if concurrency is not None and concurrency < 1:
+            raise ValueError('Concurrency must be a positive integer')
+
+        if max_concurrency < 1:
+            raise ValueError('Maximum concurrency must be a positive integer')
+
+        self._http = http
+        self._route = route
+        self._operations = operations
+        self._concurrency = concurrency
+        self._max_concurrency = max_concurrency
+        self._progress = progress
+
+        # Minor parameters are irrelevant for the bucket, but they
+        # have to be present to format the route.
+        fmt = fmt or {}
+        self._fmt = {
+            name: fmt.get(name, '')
+            for _, name, _, _ in Formatter().parse(route[1]) if name
+        }
+
+        self.total = len(operations) if isinstance(operations, Sized) else None
+        self.succeeded = 0
+        self.failed = 0
+        self.running = 0
+        self.cancelled = False
+
+        self._slot_freed = None
+        self._task_group = None
+        self._scope = None
+        self._results = None
+        self._done = False
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return '<BulkExecutor completed={} running={} total={}>'.format(
+            self.completed, self.running, self.total)
+
+    @property
+    def completed(self) -> int:
+        """The amount of operations that completed, successfully or not."""
+
+        return self.succeeded + self.failed
+
+    @property
+    def concurrency(self) -> int:
+        """The amount of operations that are currently allowed to run at the same time."""
+
+        if self._concurrency is not None:
+            return self._concurrency
+
+        limiter = self._http.rate_limiter
+        bucket = limiter.buckets.get(limiter.bucket_for(self._route, self._fmt))
+        if bucket is None or not bucket.discovered:
+            return 1
+
+        return min(bucket.limit or self._max_concurrency, self._max_concurrency)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> BulkResult:
+        if self._results is None:
+            raise RuntimeError('BulkExecutor must be used as an async contextmanager')
+
+        if self._done:
+            raise StopAsyncIteration
+
+        result = await self._results.get()
+        if result is _DONE:
+            self._done = True
+            raise StopAsyncIteration
+
+        return result
+
+    async def __aenter__(self):
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+
+        self._results = anyio.create_queue(self._max_concurrency)
+        await self._task_group.spawn(self._dispatch)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Operations that haven't completed yet are abandoned
+        # if the block is left before all results were consumed.
+        self._closed = True
+        await self.cancel()
+        return await self._task_group.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def gather(self) -> List[BulkResult]:
+        """Runs all operations and returns their results in the order they completed."""
+
+        results = []
+        async with self:
+            async for result in self:
+                results.append(result)
+
+        return results
+
+    async def cancel(self):
+        """Stops starting new operations and cancels the running ones.
+
+        Iteration ends once the running operations are cancelled.
+        """
+
+        self.cancelled = True
+        if self._scope is not None:
+            await self._scope.cancel()
+
+    async def _dispatch(self):
+        async with anyio.open_cancel_scope() as self._scope:
+            if self.cancelled:
+                return
+
+            async with anyio.create_task_group() as tg:
+                for index, operation in enumerate(self._operations):
+                    while self.running >= self.concurrency:
+                        self._slot_freed = anyio.create_event()
+                        await self._slot_freed.wait()
+
+                    self.running += 1
+                    await tg.spawn(self._execute, index, operation)
+
+        # Nobody is left to consume the results once the block is left.
+        if not self._closed:
+            await self._results.put(_DONE)
+
+    async def _execute(self, index: int, operation: _Operation):
+        try:
+            try:
+                result = BulkResult(index, operation, await operation())
+            except anyio.get_cancelled_exc_class():
+                raise
+            except Exception as error:
+                logger.debug('Bulk operation %d failed: %r', index, error)
+                result = BulkResult(index, operation, error=error)
+
+            if result.ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+            if self._progress is not None:
+                self._progress(self)
+
+            # The slot is kept until the result has been handed over,
+            # so a slow consumer slows down the operations as well.
+            await self._results.put(result)
+        finally:
+            self.running -= 1
+            if self._slot_freed is not None:
+                event, self._slot_freed = self._slot_freed, None
+                await event.set()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import anyio
+
+__all__ = (
+    'RequestCoalescer',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ('done', 'finished', 'result', 'error')
+
+    def __init__(self):
+        self.done = anyio.create_event()
+        self.finished = False
+        self.result = None
+        self.error = None  # type: Optional[Exception]
+
+
+class RequestCoalescer:
+    """Deduplicates identical requests that are in flight at the same time.
+
+    The first caller of a key performs the request, everyone else who asks
+    for the same key before it completed waits for it and gets the same
+    result or exception. Once a request completed, the next caller of its
+    key performs a new one, so results are never served stale.
+
+    If the caller that performs a request is cancelled, one of the
+    waiting callers takes over and performs the request itself.
+
+    .. warning::
+
+        Coalesced callers share the parsed response, so it must not be modified.
+
+    Attributes
+    ----------
+    coalesced : int
+        The amount of callers that were served by another caller's request.
+    """
+
+    __slots__ = ('coalesced', '_flights')
+
+    def __init__(self):
+        self.coalesced = 0
+        self._flights = {}  # type: Dict[Hashable, _Flight]
+
+    def __repr__(self) -> str:
+        return '<RequestCoalescer in_flight={} coalesced={}>'.format(
+            len(self._flights), self.coalesced)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: Hashable, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Performs a request unless an identical one is already in flight.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying identical requests.
+        request : Callable[[], Awaitable[Any]]
+            A coroutine function that performs the request.
+
+        Returns
+        -------
+        Any
+            The result of the request.
+        """
+
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+
+            await flight.done.wait()
+            if flight.finished:
+                self.coalesced += 1
+                logger.debug('Coalesced request %s', key)
+
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+            # The request was abandoned, try to perform it instead.
+
+        flight = self._flights[key] = _Flight()
+        try:
+            flight.result = await request()
+        except anyio.get_cancelled_exc_class():
+            # Followers take over instead of sharing the cancellation.
+            raise
+        except Exception as error:
+            flight.error = error
+            flight.finished = True
+            raise
+        else:
+            flight.finished = True
+            return flight.result
+        finally:
+            del self._flights[key]
+            await flight.done.set()
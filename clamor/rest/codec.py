@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+from typing import Any, Callable, Union
+
+__all__ = (
+    'JSONCodec',
+    'get_json_codec',
+    'json_dumps',
+    'json_loads',
+    'set_json_codec',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec:
+    """Encodes and decodes JSON with a specific library.
+
+    Parameters
+    ----------
+    name : str
+        The name of the library.
+    dumps : Callable[[Any], bytes]
+        Encodes an object to UTF-8 encoded JSON.
+    loads : Callable[[Union[bytes, str]], Any]
+        Decodes JSON to an object.
+
+    Attributes
+    ----------
+    name : str
+        The name of the library.
+    dumps : Callable[[Any], bytes]
+        Encodes an object to UTF-8 encoded JSON.
+    loads : Callable[[Union[bytes, str]], Any]
+        Decodes JSON to an object.
+    """
+
+    __slots__ = ('name', 'dumps', 'loads')
+
+    def __init__(self,
+                 name: str,
+                 dumps: Callable[[Any], bytes],
+                 loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return '<JSONCodec name={0.name}>'.format(self)
+
+
+def _orjson() -> JSONCodec:
+    import orjson
+
+    return JSONCodec('orjson', orjson.dumps, orjson.loads)
+
+
+def _ujson() -> JSONCodec:
+    import ujson
+
+    def dumps(obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    return JSONCodec('ujson', dumps, ujson.loads)
+
+
+def _rapidjson() -> JSONCodec:
+    import rapidjson
+
+    def dumps(obj: Any) -> bytes:
+        return rapidjson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    return JSONCodec('rapidjson', dumps, rapidjson.loads)
+
+
+def _stdlib() -> JSONCodec:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def dumps(obj: Any) -> bytes:
+        return encoder.encode(obj).encode('utf-8')
+
+    def loads(data: Union[bytes, str]) -> Any:
+        # json only accepts bytes from Python 3.6 on.
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+
+        return json.loads(data)
+
+    return JSONCodec('json', dumps, loads)
+
+
+#: The supported libraries, in order of preference.
+_CODECS = (
+    ('orjson', _orjson),
+    ('ujson', _ujson),
+    ('rapidjson', _rapidjson),
+    ('json', _stdlib),
+)
+
+_codec = None
+
+
+def set_json_codec(codec: Union[str, JSONCodec] = None) -> JSONCodec:
+    """Sets the codec used for all JSON in requests and responses.
+
+    This affects the whole process.
+
+    Parameters
+    ----------
+    codec : Union[str, :class:`~clamor.rest.codec.JSONCodec`], optional
+        Either a custom codec or the name of one of the supported libraries,
+        ``orjson``, ``ujson``, ``rapidjson`` or ``json``. By default, the
+        fastest library that is installed is picked.
+
+    Returns
+    -------
+    :class:`~clamor.rest.codec.JSONCodec`
+        The codec that is used from now on.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        Raised when the library isn't supported.
+    :exc:`ImportError`
+        Raised when the library isn't installed.
+    """
+
+    global _codec
+
+    if isinstance(codec, JSONCodec):
+        _codec = codec
+    elif codec is not None:
+        factories = dict(_CODECS)
+        if codec not in factories:
+            raise ValueError('Unsupported JSON library {}'.format(codec))
+
+        _codec = factories[codec]()
+    else:
+        for name, factory in _CODECS:
+            try:
+                _codec = factory()
+            except ImportError:
+                continue
+            break
+
+    logger.debug('Using %s for JSON', _codec.name)
+    return _codec
+
+
+def get_json_codec() -> JSONCodec:
+    """Gets the codec used for all JSON in requests and responses."""
+
+    return _codec
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encodes an object to UTF-8 encoded JSON with the current codec."""
+
+    return _codec.dumps(obj)
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decodes JSON with the current codec."""
+
+    return _codec.loads(data)
+
+
+set_json_codec()
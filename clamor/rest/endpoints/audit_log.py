@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from enum import IntEnum
-from typing import Union
+from typing import Callable, Union
 
+from ..pagination import Paginator
 from ..routes import Routes
 from .base import *
 
@@ -85,19 +86,19 @@ class AuditLogWrapper(EndpointsWrapper):
     .. seealso:: Audit Log endpoints https://discordapp.com/developers/docs/resources/audit-log
     """
 
-    def __init__(self, token: str, guild_id: Snowflake):
-        super().__init__(token)
+    def __init__(self, token: str, guild_id: Snowflake, **kwargs):
+        super().__init__(token, **kwargs)
 
         self.guild_id = guild_id
 
     async def get_guild_audit_log(self,
-                                  user_id: Snowflake,
+                                  user_id: Snowflake = None,
                                   action_type: Union[AuditLogAction, int] = None,
                                   before: Snowflake = None,
                                   limit: int = 50) -> dict:
         params = optional(**{
             'user_id': user_id,
-            'action_type': action_type if isinstance(action_type, int) else action_type.value,
+            'action_type': int(action_type) if action_type is not None else None,
             'before': before,
             'limit': limit,
         })
@@ -105,3 +106,15 @@ class AuditLogWrapper(EndpointsWrapper):
         return await self.http.make_request(Routes.GET_GUILD_AUDIT_LOG,
                                             dict(guild=self.guild_id),
                                             params=params)
+
+    def iter_guild_audit_log(self,
+                             user_id: Snowflake = None,
+                             action_type: Union[AuditLogAction, int] = None,
+                             before: Snowflake = None,
+                             limit: int = None,
+                             predicate: Callable[[dict], bool] = None) -> Paginator:
+        async def fetch(cursor: Snowflake, size: int) -> list:
+            audit_log = await self.get_guild_audit_log(user_id, action_type, cursor, size)
+            return audit_log['audit_log_entries']
+
+        return Paginator(fetch, cursor=before, limit=limit, predicate=predicate)
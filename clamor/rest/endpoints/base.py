@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from contextlib import contextmanager
-from typing import NewType, Union
 
-from ..http import HTTP
+from ...cache import Cache
+from ...snowflake import Snowflake
+from ..pool import default_pool
 
 __all__ = (
     'Snowflake',
@@ -11,9 +12,6 @@ __all__ = (
     'EndpointsWrapper',
 )
 
-#: A type for denoting raw snowflake parameters.
-Snowflake = NewType('Snowflake', Union[int, str])
-
 
 def optional(**kwargs) -> dict:
     """Given a dictionary, this filters out all values that are ``None``.
@@ -27,13 +25,53 @@ def optional(**kwargs) -> dict:
     }
 
 
+# Stands in when no cache is used so wrappers don't need to check.
+_no_cache = Cache(enabled=False)
+
+
 class EndpointsWrapper:
-    """Base class for higher-level wrappers for API endpoints."""
+    r"""Base class for higher-level wrappers for API endpoints.
+
+    Wrappers don't own their :class:`~clamor.rest.http.HTTP` client.
+    Unless one is passed explicitly, they attach to the client an
+    :class:`~clamor.rest.pool.HTTPPool` holds for the token, so creating
+    wrappers is cheap and all of them share connections and rate limits.
+
+    Parameters
+    ----------
+    token : str
+        The token to use for API authorization.
+    \**kwargs : dict
+        See below.
+
+    Keyword Arguments
+    -----------------
+    http : :class:`~clamor.rest.http.HTTP`, optional
+        The client to use for requests.
+    pool : :class:`~clamor.rest.pool.HTTPPool`, optional
+        The pool to get the client from if ``http`` is not given.
+        Defaults to :data:`~clamor.rest.pool.default_pool`.
+    cache : :class:`~clamor.cache.cache.Cache`, optional
+        The cache to serve reads from and to update with responses.
+        Nothing is cached by default.
+
+    Attributes
+    ----------
+    http : :class:`~clamor.rest.http.HTTP`
+        The client to use for requests.
+    cache : :class:`~clamor.cache.cache.Cache`
+        The cache that is used.
+    """
+
+    __slots__ = ('http', 'cache')
 
-    __slots__ = ('http',)
+    def __init__(self, token: str, **kwargs):
+        http = kwargs.get('http')
+        if http is None:
+            http = kwargs.get('pool', default_pool).get(token)
 
-    def __init__(self, token: str):
-        self.http = HTTP(token)
+        self.http = http
+        self.cache = kwargs.get('cache') or _no_cache
 
     @property
     def token(self) -> str:
@@ -42,15 +80,16 @@ class EndpointsWrapper:
         return self.http.token
 
     @contextmanager
-    def raw_responses(self):
-        """A contextmanager that yields all raw responses this instance holds.
+    def raw_responses(self, **kwargs):
+        r"""A contextmanager that records the raw responses received inside of it.
+
+        This is a shortcut to :meth:`~clamor.rest.recorder.ResponseRecorder.record`
+        and accepts the same keyword arguments to bound the recording.
 
         .. warning::
 
             Do not use this if you don't know what you're doing.
         """
 
-        try:
-            yield self.http.responses
-        finally:
-            self.http.responses.clear()
+        with self.http.recorder.record(**kwargs) as responses:
+            yield responses
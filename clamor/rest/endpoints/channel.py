@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
-import json
 import re
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
 
+from ..multipart import MultipartBody
+from ..pagination import Paginator
 from ..routes import Routes
 from .base import *
 
@@ -18,8 +20,11 @@ class ChannelWrapper(EndpointsWrapper):
     .. seealso:: Channel endpoints https://discordapp.com/developers/docs/resources/channel
     """
 
-    def __init__(self, token: str, channel_id: Snowflake):
-        super().__init__(token)
+    #: The maximum age of messages that can be bulk deleted.
+    BULK_DELETE_MAX_AGE = timedelta(days=14)
+
+    def __init__(self, token: str, channel_id: Snowflake, **kwargs):
+        super().__init__(token, **kwargs)
 
         self.channel_id = channel_id
 
@@ -32,7 +37,13 @@ class ChannelWrapper(EndpointsWrapper):
         return emoji
 
     async def get_channel(self) -> dict:
-        return await self.http.make_request(Routes.GET_CHANNEL, dict(channel=self.channel_id))
+        channel = self.cache.get_channel(self.channel_id)
+        if channel is None:
+            channel = await self.http.make_request(Routes.GET_CHANNEL,
+                                                   dict(channel=self.channel_id))
+            self.cache.add_channel(channel)
+
+        return channel
 
     async def modify_channel(self,
                              name: str = None,
@@ -57,15 +68,21 @@ class ChannelWrapper(EndpointsWrapper):
             'parent_id': parent_id
         })
 
-        return await self.http.make_request(Routes.MODIFY_CHANNEL,
-                                            dict(channel=self.channel_id),
-                                            json=params,
-                                            reason=reason)
+        channel = await self.http.make_request(Routes.MODIFY_CHANNEL,
+                                               dict(channel=self.channel_id),
+                                               json=params,
+                                               reason=reason)
+        self.cache.add_channel(channel)
+
+        return channel
 
     async def delete_channel(self, reason: str = None) -> dict:
-        return await self.http.make_request(Routes.DELETE_CHANNEL,
-                                            dict(channel=self.channel_id),
-                                            reason=reason)
+        channel = await self.http.make_request(Routes.DELETE_CHANNEL,
+                                               dict(channel=self.channel_id),
+                                               reason=reason)
+        self.cache.remove_channel(self.channel_id)
+
+        return channel
 
     async def get_channel_messages(self,
                                    around: Snowflake = None,
@@ -83,6 +100,25 @@ class ChannelWrapper(EndpointsWrapper):
                                             dict(channel=self.channel_id),
                                             params=params)
 
+    def iter_channel_messages(self,
+                              before: Snowflake = None,
+                              after: Snowflake = None,
+                              limit: int = None,
+                              predicate: Callable[[dict], bool] = None) -> Paginator:
+        if before is not None and after is not None:
+            raise ValueError('Only one of before and after can be given')
+
+        async def fetch(cursor: Snowflake, size: int) -> list:
+            if after is not None:
+                return await self.get_channel_messages(after=cursor, limit=size)
+            return await self.get_channel_messages(before=cursor, limit=size)
+
+        return Paginator(fetch,
+                         after=after is not None,
+                         cursor=after or before,
+                         limit=limit,
+                         predicate=predicate)
+
     async def get_channel_message(self, message_id: Snowflake) -> dict:
         return await self.http.make_request(Routes.GET_CHANNEL_MESSAGE,
                                             dict(channel=self.channel_id, message=message_id))
@@ -101,19 +137,9 @@ class ChannelWrapper(EndpointsWrapper):
         })
 
         if files:
-            if len(files) == 1:
-                attachments = {
-                    'file': tuple(files[0]),
-                }
-            else:
-                attachments = {
-                    'file{}'.format(index): tuple(file) for index, file in enumerate(files)
-                }
-
             return await self.http.make_request(Routes.CREATE_MESSAGE,
                                                 dict(channel=self.channel_id),
-                                                files=attachments,
-                                                data={'payload_json': json.dumps(payload)})
+                                                data=MultipartBody.from_files(files, payload))
 
         return await self.http.make_request(Routes.CREATE_MESSAGE,
                                             dict(channel=self.channel_id),
@@ -159,6 +185,17 @@ class ChannelWrapper(EndpointsWrapper):
                                                  emoji=self._parse_emoji(emoji)),
                                             params=params)
 
+    def iter_reactions(self,
+                       message_id: Snowflake,
+                       emoji: str,
+                       after: Snowflake = None,
+                       limit: int = None,
+                       predicate: Callable[[dict], bool] = None) -> Paginator:
+        async def fetch(cursor: Snowflake, size: int) -> list:
+            return await self.get_reactions(message_id, emoji, after=cursor, limit=size)
+
+        return Paginator(fetch, after=True, cursor=after, limit=limit, predicate=predicate)
+
     async def delete_all_reactions(self, message_id: Snowflake):
         return await self.http.make_request(Routes.DELETE_ALL_REACTIONS,
                                             dict(channel=self.channel_id, message=message_id))
@@ -182,9 +219,14 @@ class ChannelWrapper(EndpointsWrapper):
                                             reason=reason)
 
     async def bulk_delete_messages(self, messages: List[Snowflake], reason: str = None):
-        if 2 <= len(messages) <= 100:
+        if not 2 <= len(messages) <= 100:
             raise ValueError('Bulk delete requires a message count between 2 and 100')
 
+        # Discord refuses to bulk delete messages that are older than two weeks.
+        oldest = Snowflake.from_datetime(datetime.now(timezone.utc) - self.BULK_DELETE_MAX_AGE)
+        if any(int(message) < oldest for message in messages):
+            raise ValueError('Bulk delete only works on messages younger than 14 days')
+
         return await self.http.make_request(Routes.BULK_DELETE_MESSAGES,
                                             dict(channel=self.channel_id),
                                             json={'messages': messages},
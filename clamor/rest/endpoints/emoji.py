@@ -14,18 +14,28 @@ class EmojiWrapper(EndpointsWrapper):
     .. seealso:: Emoji endpoints https://discordapp.com/developers/docs/resources/emoji
     """
 
-    def __init__(self, token: str, guild_id: Snowflake):
-        super().__init__(token)
+    def __init__(self, token: str, guild_id: Snowflake, **kwargs):
+        super().__init__(token, **kwargs)
 
         self.guild_id = guild_id
 
     async def list_guild_emojis(self) -> list:
-        return await self.http.make_request(Routes.LIST_GUILD_EMOJIS,
-                                            dict(guild=self.guild_id))
+        emojis = self.cache.get_emojis(self.guild_id)
+        if emojis is None:
+            emojis = await self.http.make_request(Routes.LIST_GUILD_EMOJIS,
+                                                  dict(guild=self.guild_id))
+            self.cache.set_emojis(self.guild_id, emojis)
+
+        return emojis
 
     async def get_guild_emoji(self, emoji_id: Snowflake) -> dict:
-        return await self.http.make_request(Routes.GET_GUILD_EMOJI,
-                                            dict(guild=self.guild_id, emoji=emoji_id))
+        emoji = self.cache.get_emoji(emoji_id)
+        if emoji is None:
+            emoji = await self.http.make_request(Routes.GET_GUILD_EMOJI,
+                                                 dict(guild=self.guild_id, emoji=emoji_id))
+            self.cache.add_emoji(self.guild_id, emoji)
+
+        return emoji
 
     async def create_guild_emoji(self,
                                  name: str,
@@ -38,10 +48,13 @@ class EmojiWrapper(EndpointsWrapper):
             'roles': roles
         }
 
-        return await self.http.make_request(Routes.CREATE_GUILD_EMOJI,
-                                            dict(guild=self.guild_id),
-                                            json=params,
-                                            reason=reason)
+        emoji = await self.http.make_request(Routes.CREATE_GUILD_EMOJI,
+                                             dict(guild=self.guild_id),
+                                             json=params,
+                                             reason=reason)
+        self.cache.add_emoji(self.guild_id, emoji)
+
+        return emoji
 
     async def modify_guild_emoji(self,
                                  emoji_id: Snowflake,
@@ -53,12 +66,18 @@ class EmojiWrapper(EndpointsWrapper):
             'roles': roles
         })
 
-        return await self.http.make_request(Routes.MODIFY_GUILD_EMOJI,
-                                            dict(guild=self.guild_id, emoji=emoji_id),
-                                            json=params,
-                                            reason=reason)
+        emoji = await self.http.make_request(Routes.MODIFY_GUILD_EMOJI,
+                                             dict(guild=self.guild_id, emoji=emoji_id),
+                                             json=params,
+                                             reason=reason)
+        self.cache.add_emoji(self.guild_id, emoji)
+
+        return emoji
 
     async def delete_guild_emoji(self, emoji_id: Snowflake, reason: str = None):
-        return await self.http.make_request(Routes.DELETE_GUILD_EMOJI,
-                                            dict(guild=self.guild_id, emoji=emoji_id),
-                                            reason=reason)
+        response = await self.http.make_request(Routes.DELETE_GUILD_EMOJI,
+                                                dict(guild=self.guild_id, emoji=emoji_id),
+                                                reason=reason)
+        self.cache.remove_emoji(emoji_id)
+
+        return response
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+from typing import Callable
+
+from ..pagination import Paginator
 from ..routes import Routes
 from .base import *
 
@@ -14,8 +17,8 @@ class GuildWrapper(EndpointsWrapper):
     .. seealso:: Guild endpoints https://discordapp.com/developers/docs/resources/guild
     """
 
-    def __init__(self, token: str, guild_id: Snowflake):
-        super().__init__(token)
+    def __init__(self, token: str, guild_id: Snowflake, **kwargs):
+        super().__init__(token, **kwargs)
 
         self.guild_id = guild_id
 
@@ -39,12 +42,20 @@ class GuildWrapper(EndpointsWrapper):
             "channels": channels
         }
 
-        return await self.http.make_request(Routes.CREATE_GUILD,
-                                            json=params)
+        guild = await self.http.make_request(Routes.CREATE_GUILD,
+                                             json=params)
+        self.cache.add_guild(guild)
+
+        return guild
 
     async def get_guild(self) -> dict:
-        return await self.http.make_request(Routes.GET_GUILD,
-                                            dict(guild=self.guild_id))
+        guild = self.cache.get_guild(self.guild_id)
+        if guild is None:
+            guild = await self.http.make_request(Routes.GET_GUILD,
+                                                 dict(guild=self.guild_id))
+            self.cache.add_guild(guild)
+
+        return guild
 
     async def modify_guild(self,
                            name: str = None,
@@ -73,18 +84,29 @@ class GuildWrapper(EndpointsWrapper):
             "system_channel_id": system_channel_id
         })
 
-        return await self.http.make_request(Routes.MODIFY_GUILD,
-                                            dict(guild=self.guild_id),
-                                            json=params,
-                                            reason=reason)
+        guild = await self.http.make_request(Routes.MODIFY_GUILD,
+                                             dict(guild=self.guild_id),
+                                             json=params,
+                                             reason=reason)
+        self.cache.add_guild(guild)
+
+        return guild
 
     async def delete_guild(self):
-        return await self.http.make_request(Routes.DELETE_GUILD,
-                                            dict(guild=self.guild_id))
+        response = await self.http.make_request(Routes.DELETE_GUILD,
+                                                dict(guild=self.guild_id))
+        self.cache.remove_guild(self.guild_id)
+
+        return response
 
     async def get_guild_channels(self) -> list:
-        return await self.http.make_request(Routes.GET_GUILD_CHANNELS,
-                                            dict(guild=self.guild_id))
+        channels = self.cache.get_channels(self.guild_id)
+        if channels is None:
+            channels = await self.http.make_request(Routes.GET_GUILD_CHANNELS,
+                                                    dict(guild=self.guild_id))
+            self.cache.set_channels(self.guild_id, channels)
+
+        return channels
 
     async def create_guild_channel(self,
                                    name: str,
@@ -109,19 +131,31 @@ class GuildWrapper(EndpointsWrapper):
             "parent_id": parent_id
         })
 
-        return await self.http.make_request(Routes.CREATE_GUILD_CHANNEL,
-                                            dict(guild=self.guild_id),
-                                            json=params,
-                                            reason=reason)
+        channel = await self.http.make_request(Routes.CREATE_GUILD_CHANNEL,
+                                               dict(guild=self.guild_id),
+                                               json=params,
+                                               reason=reason)
+        self.cache.add_channel(channel, self.guild_id)
+
+        return channel
 
     async def modify_guild_channel_positions(self, channels: list):
-        return await self.http.make_request(Routes.MODIFY_GUILD_CHANNEL_POSITIONS,
-                                            dict(guild=self.guild_id),
-                                            json=channels)
+        response = await self.http.make_request(Routes.MODIFY_GUILD_CHANNEL_POSITIONS,
+                                                dict(guild=self.guild_id),
+                                                json=channels)
+        # The cached positions are outdated now.
+        self.cache.channels.delete_children(int(self.guild_id))
+
+        return response
 
     async def get_guild_member(self, user_id: Snowflake) -> dict:
-        return await self.http.make_request(Routes.GET_GUILD_MEMBER,
-                                            dict(guild=self.guild_id, member=user_id))
+        member = self.cache.get_member(self.guild_id, user_id)
+        if member is None:
+            member = await self.http.make_request(Routes.GET_GUILD_MEMBER,
+                                                  dict(guild=self.guild_id, member=user_id))
+            self.cache.add_member(self.guild_id, member)
+
+        return member
 
     async def list_guild_members(self,
                                  limit: int = None,
@@ -131,9 +165,28 @@ class GuildWrapper(EndpointsWrapper):
             "after": after
         })
 
-        return await self.http.make_request(Routes.LIST_GUILD_MEMBERS,
-                                            dict(guild=self.guild_id),
-                                            json=params)
+        members = await self.http.make_request(Routes.LIST_GUILD_MEMBERS,
+                                               dict(guild=self.guild_id),
+                                               params=params)
+        for member in members:
+            self.cache.add_member(self.guild_id, member)
+
+        return members
+
+    def iter_guild_members(self,
+                           after: Snowflake = None,
+                           limit: int = None,
+                           predicate: Callable[[dict], bool] = None) -> Paginator:
+        async def fetch(cursor: Snowflake, size: int) -> list:
+            return await self.list_guild_members(limit=size, after=cursor)
+
+        return Paginator(fetch,
+                         key=lambda member: member['user']['id'],
+                         after=True,
+                         cursor=after,
+                         limit=limit,
+                         predicate=predicate,
+                         page_size=1000)
 
     async def add_guild_member(self,
                                user_id: Snowflake,
@@ -170,10 +223,13 @@ class GuildWrapper(EndpointsWrapper):
             "channel_id": channel_id
         })
 
-        return await self.http.make_request(Routes.MODIFY_GUILD_MEMBER,
-                                            dict(guild=self.guild_id, member=user_id),
-                                            json=params,
-                                            reason=reason)
+        response = await self.http.make_request(Routes.MODIFY_GUILD_MEMBER,
+                                                dict(guild=self.guild_id, member=user_id),
+                                                json=params,
+                                                reason=reason)
+        self.cache.remove_member(self.guild_id, user_id)
+
+        return response
 
     async def modify_current_user_nick(self, nick: str, reason: str = None) -> str:
         params = {
@@ -189,22 +245,35 @@ class GuildWrapper(EndpointsWrapper):
                                     user_id: Snowflake,
                                     role_id: Snowflake,
                                     reason: str = None):
-        return await self.http.make_request(Routes.ADD_GUILD_MEMBER_ROLE,
-                                            dict(guild=self.guild_id, member=user_id, role=role_id),
-                                            reason=reason)
+        response = await self.http.make_request(Routes.ADD_GUILD_MEMBER_ROLE,
+                                                dict(guild=self.guild_id,
+                                                     member=user_id,
+                                                     role=role_id),
+                                                reason=reason)
+        self.cache.remove_member(self.guild_id, user_id)
+
+        return response
 
     async def remove_guild_member_role(self,
                                        user_id: Snowflake,
                                        role_id: Snowflake,
                                        reason: str = None):
-        return await self.http.make_request(Routes.REMOVE_GUILD_MEMBER_ROLE,
-                                            dict(guild=self.guild_id, member=user_id, role=role_id),
-                                            reason=reason)
+        response = await self.http.make_request(Routes.REMOVE_GUILD_MEMBER_ROLE,
+                                                dict(guild=self.guild_id,
+                                                     member=user_id,
+                                                     role=role_id),
+                                                reason=reason)
+        self.cache.remove_member(self.guild_id, user_id)
+
+        return response
 
     async def remove_guild_member(self, user_id: Snowflake, reason: str = None):
-        return await self.http.make_request(Routes.REMOVE_GUILD_MEMBER,
-                                            dict(guild=self.guild_id, member=user_id),
-                                            reason=reason)
+        response = await self.http.make_request(Routes.REMOVE_GUILD_MEMBER,
+                                                dict(guild=self.guild_id, member=user_id),
+                                                reason=reason)
+        self.cache.remove_member(self.guild_id, user_id)
+
+        return response
 
     async def get_guild_bans(self) -> list:
         return await self.http.make_request(Routes.GET_GUILD_BANS,
@@ -233,8 +302,13 @@ class GuildWrapper(EndpointsWrapper):
                                             reason=reason)
 
     async def get_guild_roles(self):
-        return await self.http.make_request(Routes.GET_GUILD_ROLES,
-                                            dict(guild=self.guild_id))
+        roles = self.cache.get_roles(self.guild_id)
+        if roles is None:
+            roles = await self.http.make_request(Routes.GET_GUILD_ROLES,
+                                                 dict(guild=self.guild_id))
+            self.cache.set_roles(self.guild_id, roles)
+
+        return roles
 
     async def create_guild_role(self,
                                 name: str = None,
@@ -251,16 +325,22 @@ class GuildWrapper(EndpointsWrapper):
             "mentionable": mentionable
         })
 
-        return await self.http.make_request(Routes.CREATE_GUILD_ROLE,
+        role = await self.http.make_request(Routes.CREATE_GUILD_ROLE,
                                             dict(guild=self.guild_id),
                                             json=params,
                                             reason=reason)
+        self.cache.add_role(self.guild_id, role)
+
+        return role
 
     async def modify_guild_role_positions(self, roles: list, reason: str = None) -> list:
-        return await self.http.make_request(Routes.MODIFY_GUILD_ROLE_POSITIONS,
-                                            dict(guild=self.guild_id),
-                                            json=roles,
-                                            reason=reason)
+        roles = await self.http.make_request(Routes.MODIFY_GUILD_ROLE_POSITIONS,
+                                             dict(guild=self.guild_id),
+                                             json=roles,
+                                             reason=reason)
+        self.cache.set_roles(self.guild_id, roles)
+
+        return roles
 
     async def modify_guild_role(self,
                                 role_id: Snowflake,
@@ -278,15 +358,21 @@ class GuildWrapper(EndpointsWrapper):
             "mentionable": mentionable
         })
 
-        return await self.http.make_request(Routes.MODIFY_GUILD_ROLE,
+        role = await self.http.make_request(Routes.MODIFY_GUILD_ROLE,
                                             dict(guild=self.guild_id, role=role_id),
                                             json=params,
                                             reason=reason)
+        self.cache.add_role(self.guild_id, role)
+
+        return role
 
     async def delete_guild_role(self, role_id: Snowflake, reason: str = None):
-        return await self.http.make_request(Routes.DELETE_GUILD_ROLE,
-                                            dict(guild=self.guild_id, role=role_id),
-                                            reason=reason)
+        response = await self.http.make_request(Routes.DELETE_GUILD_ROLE,
+                                                dict(guild=self.guild_id, role=role_id),
+                                                reason=reason)
+        self.cache.remove_role(role_id)
+
+        return response
 
     async def get_guild_prune_count(self) -> dict:
         return await self.http.make_request(Routes.GET_GUILD_PRUNE_COUNT,
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 
+from ..pagination import Paginator
 from ..routes import Routes
 from .base import *
 
@@ -33,11 +34,19 @@ class UserWrapper(EndpointsWrapper):
         return username.strip()
 
     async def get_current_user(self) -> dict:
-        return await self.http.make_request(Routes.GET_CURRENT_USER)
+        user = await self.http.make_request(Routes.GET_CURRENT_USER)
+        self.cache.add_user(user)
+
+        return user
 
     async def get_user(self, user_id: Snowflake) -> dict:
-        return await self.http.make_request(Routes.GET_USER,
-                                            dict(user=user_id))
+        user = self.cache.get_user(user_id)
+        if user is None:
+            user = await self.http.make_request(Routes.GET_USER,
+                                                dict(user=user_id))
+            self.cache.add_user(user)
+
+        return user
 
     async def modify_current_user(self, username: str = None, avatar: str = None) -> dict:
         params = optional(**{
@@ -45,8 +54,11 @@ class UserWrapper(EndpointsWrapper):
             'avatar': avatar
         })
 
-        return await self.http.make_request(Routes.MODIFY_CURRENT_USER,
+        user = await self.http.make_request(Routes.MODIFY_CURRENT_USER,
                                             json=params)
+        self.cache.add_user(user)
+
+        return user
 
     async def get_current_user_guilds(self,
                                       before: Snowflake = None,
@@ -61,6 +73,26 @@ class UserWrapper(EndpointsWrapper):
         return await self.http.make_request(Routes.GET_CURRENT_USER_GUILDS,
                                             params=params)
 
+    def iter_current_user_guilds(self,
+                                 before: Snowflake = None,
+                                 after: Snowflake = None,
+                                 limit: int = None,
+                                 predicate: Callable[[dict], bool] = None) -> Paginator:
+        if before is not None and after is not None:
+            raise ValueError('Only one of before and after can be given')
+
+        async def fetch(cursor: Snowflake, size: int) -> list:
+            if before is not None:
+                return await self.get_current_user_guilds(before=cursor, limit=size)
+            return await self.get_current_user_guilds(after=cursor, limit=size)
+
+        # Guilds are listed in ascending order unless a before cursor is given.
+        return Paginator(fetch,
+                         after=before is None,
+                         cursor=before or after,
+                         limit=limit,
+                         predicate=predicate)
+
     async def leave_guild(self, guild_id: Snowflake):
         return await self.http.make_request(Routes.LEAVE_GUILD,
                                             dict(guild=guild_id))
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 
-import json
 from typing import Optional
 
+from ..multipart import MultipartBody
 from ..routes import Routes
 from .base import *
 
@@ -127,19 +127,9 @@ class WebhookWrapper(EndpointsWrapper):
         })
 
         if files:
-            if len(files) == 1:
-                attachments = {
-                    'file': tuple(files[0]),
-                }
-            else:
-                attachments = {
-                    'file{}'.format(index): tuple(file) for index, file in enumerate(files)
-                }
-
             return await self.http.make_request(Routes.EXECUTE_WEBHOOK,
                                                 dict(webhook=webhook_id, token=webhook_token),
-                                                files=attachments,
-                                                data={'payload_json': json.dumps(payload)},
+                                                data=MultipartBody.from_files(files, payload),
                                                 params=params)
 
         return await self.http.make_request(Routes.EXECUTE_WEBHOOK,
@@ -2,9 +2,9 @@
 
 import logging
 import sys
-from random import randint
+import time
 from typing import Optional, Union
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 
 import anyio
 import asks
@@ -12,8 +12,17 @@ from asks.response_objects import Response
 
 from ..exceptions import RequestFailed, Unauthorized, Forbidden, NotFound
 from ..meta import __url__ as clamor_url, __version__ as clamor_version
+from .coalesce import RequestCoalescer
+from .codec import json_dumps, json_loads
+from .metrics import Metrics
+from .multipart import MultipartBody, stream_request
 from .rate_limit import Bucket, RateLimiter
-from .routes import APIRoute
+from .recorder import ResponseRecorder
+from .request_log import RequestLogger
+from .response_cache import CachedResponse, ResponseCache
+from .retry import RetryPolicy
+from .routes import APIRoute, Method
+from .tracing import RequestTrace
 
 __all__ = (
     'HTTP',
@@ -23,13 +32,33 @@ logger = logging.getLogger(__name__)
 
 
 class _ReattemptRequest(Exception):
-    def __init__(self, status_code: int, data: Optional[Union[dict, list, str]], *args):
-        self.status_code = status_code
+    def __init__(self, response: Response, data: Optional[Union[dict, list, str]], *args):
+        self.response = response
+        self.status_code = response.status_code
         self.data = data
 
         super().__init__(*args)
 
 
+def _body_size(kwargs: dict) -> int:
+    data = kwargs.get('data')
+    if isinstance(data, MultipartBody):
+        return data.content_length or 0
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode('utf-8'))
+
+    return 0
+
+
+def _freeze_params(params: Optional[dict]) -> tuple:
+    if not params:
+        return ()
+
+    return tuple(sorted((key, str(value)) for key, value in params.items()))
+
+
 class HTTP:
     r"""An interface to perform requests to the Discord API.
 
@@ -44,36 +73,103 @@ class HTTP:
     -----------------
     session : :class:`asks.Session<asks:asks.Session>`, optional
         The session to use. If none provided, a new one is created.
+    connections : int, optional
+        The maximum amount of concurrent connections for a newly
+        created session. Ignored if ``session`` is given, defaults to ``1``.
+    rate_limiter : :class:`~clamor.rest.rate_limit.RateLimiter`, optional
+        The rate limiter to use. If none provided, a new one is created.
+    metrics : :class:`~clamor.rest.metrics.Metrics`, optional
+        The instrumentation to report requests to, e.g. a
+        :class:`~clamor.rest.metrics.RequestMetrics`. It replaces the
+        one of the rate limiter. By default, nothing is measured.
+    retry_policy : :class:`~clamor.rest.retry.RetryPolicy`, optional
+        The default retry policy for failed requests.
     app : str
         The application type for the ``Authorization`` header.
         Either ``Bot`` or ``Bearer``, defaults to ``Bot``.
+    base_url : str, optional
+        The URL of the API, defaults to :attr:`HTTP.BASE_URL`.
+        Useful to send requests to a mock API instead.
+    request_logger : :class:`~clamor.rest.request_log.RequestLogger`, optional
+        The logger for the outcome of requests. If none provided,
+        a new one is created.
+    log_body_limit : int, optional
+        The maximum amount of bytes of response bodies to log when
+        creating a new request logger, defaults to ``200``.
+    coalesce : bool
+        Whether identical ``GET`` requests that are in flight at the
+        same time should share one request, defaults to ``True``.
+    cache_responses : bool
+        Whether to cache responses of ``GET`` routes that rarely
+        change, defaults to ``True``.
+    response_cache : :class:`~clamor.rest.response_cache.ResponseCache`, optional
+        The cache for responses. If none provided and ``cache_responses``
+        is enabled, a new one is created that keeps responses in memory.
+    trace_configs : List[:class:`~clamor.rest.tracing.TraceConfig`], optional
+        The callbacks to notify about the phases of requests.
+    upload_timeout : float, optional
+        The maximum amount of seconds a streamed upload may take,
+        defaults to :attr:`HTTP.UPLOAD_TIMEOUT`. ``None`` disables it.
 
     Attributes
     ----------
     rate_limiter : :class:`~clamor.rest.rate_limit.RateLimiter`
         The rate limiter to use for requests.
+    recorder : :class:`~clamor.rest.recorder.ResponseRecorder`
+        The recorder for API responses. Disabled by default.
+    request_logger : :class:`~clamor.rest.request_log.RequestLogger`
+        The logger for the outcome of requests.
+    coalescer : :class:`~clamor.rest.coalesce.RequestCoalescer`, optional
+        The coalescer for identical ``GET`` requests, ``None`` if disabled.
+    response_cache : :class:`~clamor.rest.response_cache.ResponseCache`, optional
+        The cache for responses of ``GET`` routes, ``None`` if disabled.
+    retry_policy : :class:`~clamor.rest.retry.RetryPolicy`
+        The retry policy for routes without a dedicated one.
+    retry_policies : dict
+        A mapping of routes to the retry policies that should be
+        used for them instead of :attr:`HTTP.retry_policy`.
+    trace_configs : List[:class:`~clamor.rest.tracing.TraceConfig`]
+        The callbacks to notify about the phases of requests.
+    upload_timeout : float, optional
+        The maximum amount of seconds a streamed upload may take.
     headers : dict
         The default headers included in every request.
+    base_url : str
+        The URL of the API.
     """
 
     #: The API version to use.
     API_VERSION = 7
     #: The Discord API URL.
     BASE_URL = 'https://discordapp.com/api/v{}'.format(API_VERSION)
-    #: The total amount of allowed retries for failed requests.
+    #: The total amount of allowed retries for failed requests
+    #: when no other retry policy is given.
     MAX_RETRIES = 5
-
-    #: The log message format for successful requests.
-    LOG_SUCCESSS = 'Success, {bucket} has received {text}!'
-    #: The log message format for failed requests.
-    LOG_FAILURE = 'Request to {bucket} failed with {code}: {error}'
+    #: The maximum amount of seconds a streamed upload may take
+    #: when no other timeout is given.
+    UPLOAD_TIMEOUT = 120.0
 
     def __init__(self, token: str, **kwargs):
         self._token = token
-        self._session = kwargs.get('session', asks.Session())
-        self.rate_limiter = RateLimiter()
+        self.base_url = kwargs.get('base_url', self.BASE_URL)
+        self._session = kwargs.get('session') or asks.Session(
+            connections=kwargs.get('connections', 1))
+        self.rate_limiter = kwargs.get('rate_limiter') or RateLimiter()
+        if kwargs.get('metrics') is not None:
+            self.rate_limiter.metrics = kwargs['metrics']
+        self.recorder = ResponseRecorder()
+        self.request_logger = kwargs.get('request_logger') or RequestLogger(
+            logger, kwargs.get('log_body_limit', RequestLogger.BODY_LIMIT))
+        self.coalescer = RequestCoalescer() if kwargs.get('coalesce', True) else None
+        self.response_cache = kwargs.get('response_cache')
+        if self.response_cache is None and kwargs.get('cache_responses', True):
+            self.response_cache = ResponseCache()
+        self.retry_policy = kwargs.get('retry_policy') or RetryPolicy(self.MAX_RETRIES)
+        self.retry_policies = {}
+        self.trace_configs = list(kwargs.get('trace_configs') or ())
+        self.upload_timeout = kwargs.get('upload_timeout', self.UPLOAD_TIMEOUT)
+        self._upload_slots = None
 
-        self._responses = []
         self.headers = {
             'User-Agent': self.user_agent,
             'Authorization': kwargs.get('app', 'Bot') + ' ' + self._token,
@@ -92,18 +188,36 @@ class HTTP:
         fmt = 'DiscordBot ({0}, v{1}) / Python {2[0]}.{2[1]}.{2[2]}'
         return fmt.format(clamor_url, clamor_version, sys.version_info)
 
+    @property
+    def metrics(self) -> Metrics:
+        """The instrumentation requests are reported to, shared with the rate limiter."""
+
+        return self.rate_limiter.metrics
+
     @property
     def responses(self):
-        """All API responses this instance has received."""
+        """The responses of the most recent active recording.
+
+        Empty if :attr:`HTTP.recorder` isn't recording.
+        """
 
-        return self._responses
+        # Recordings are falsy while they are still empty.
+        current = self.recorder.current
+        return current if current is not None else ()
 
     @staticmethod
     def _parse_response(response: Response) -> Optional[Union[dict, list, str]]:
-        if response.headers['Content-Type'] == 'application/json':
-            return response.json(encoding='utf-8')
+        # Responses without a body, e.g. 204, don't have a Content-Type.
+        if response.headers.get('Content-Type') == 'application/json':
+            return json_loads(response.body)
         return response.text.encode('utf-8')
 
+    @staticmethod
+    def _parse_cached(entry: CachedResponse) -> Optional[Union[dict, list, str]]:
+        if entry.content_type == 'application/json':
+            return json_loads(entry.body)
+        return entry.body
+
     async def make_request(self,
                            route: APIRoute,
                            fmt: dict = None,
@@ -150,57 +264,182 @@ class HTTP:
         :exc:`clamor.exceptions.RequestFailed`
             Generic exception raised when either retries are exceeded
             or a non-success status code not listed above occurred.
+        :exc:`TimeoutError`
+            Raised when a streamed upload exceeds :attr:`HTTP.upload_timeout`.
         """
 
         fmt = fmt or {}
         retries = kwargs.pop('retries', 0)
-        # The API shares rate limits with minor routes of guild, channel
-        # and webhook endpoints. To make our lives easier through preparing
-        # the buckets so that they share the same rate limit buckets by
-        # default. Therefore no need to deal with X-RateLimit-Bucket.
-        bucket_fmt = {
-            key: value
-            if key in ('guild', 'channel', 'webhook') else ''
-            for key, value in fmt.items()
-        }
+        reason = kwargs.pop('reason', None)
 
-        # Prepare the headers.
-        if 'headers' in kwargs:
-            kwargs['headers'].update(self.headers)
-        else:
-            kwargs['headers'] = self.headers
+        # Prepare the headers. These are copied so that per-request
+        # headers never leak into the defaults.
+        custom_headers = kwargs.get('headers')
+        headers = dict(custom_headers or {})
+        headers.update(self.headers)
 
         # The additional header for audit logs.
-        if 'reason' in kwargs and kwargs['reason'] is not None:
-            kwargs['headers']['X-Audit-Log-Reason'] = quote(kwargs['reason'], '/ ')
+        if reason is not None:
+            headers['X-Audit-Log-Reason'] = quote(reason, '/ ')
 
-        method = route[0].value
-        url = self.BASE_URL + route[1].format(**fmt)
-        bucket = (method, route[1].format(**bucket_fmt))
-        logger.debug('Performing request to bucket %s', bucket)
+        # Request bodies are encoded with the configured JSON codec
+        # instead of the one asks would use.
+        payload = kwargs.pop('json', None)
+        if payload is not None:
+            kwargs['data'] = json_dumps(payload)
+            headers['Content-Type'] = 'application/json'
+        elif isinstance(kwargs.get('data'), MultipartBody):
+            headers['Content-Type'] = kwargs['data'].content_type
 
-        async with self.rate_limiter(bucket):
-            response = await self._session.request(method, url, **kwargs)
+        kwargs['headers'] = headers
 
-            await self.rate_limiter.update_bucket(bucket, response)
-            self._responses.append(response)
+        method = route[0].value
+        url = self.base_url + route[1].format(**fmt)
+        policy = self.retry_policies.get(route, self.retry_policy)
+
+        # Custom headers might change the response, so requests
+        # with those are neither shared nor cached.
+        key = None
+        if route[0] is Method.GET and not custom_headers:
+            key = url + '?' + urlencode(_freeze_params(kwargs.get('params')))
+
+        async def request():
+            return await self._request(route, fmt, method, url, policy, retries, key, **kwargs)
+
+        if route[0] is not Method.GET and self.response_cache is not None:
+            try:
+                return await request()
+            finally:
+                self.response_cache.invalidate(url)
+
+        # Concurrent callers of the same resource share one request.
+        if key is not None and self.coalescer is not None:
+            return await self.coalescer.run(key, request)
+
+        return await request()
+
+    async def _request(self,
+                       route: APIRoute,
+                       fmt: dict,
+                       method: str,
+                       url: str,
+                       policy: RetryPolicy,
+                       retries: int,
+                       cache_key: Optional[str],
+                       **kwargs) -> Optional[Union[dict, list, str]]:
+        cache = self.response_cache if cache_key is not None else None
+
+        entry = None
+        if cache is not None:
+            entry = cache.lookup(cache_key)
+            if entry is not None:
+                if entry.fresh:
+                    return self._parse_cached(entry)
+
+                # Stale responses are only fetched again if they have changed.
+                kwargs['headers'] = dict(kwargs['headers'], **{'If-None-Match': entry.etag})
+
+        while True:
+            # The bucket may change once its hash has been learned.
+            bucket = self.rate_limiter.bucket_for(route, fmt)
+            logger.debug('Performing request to bucket %s', bucket)
+
+            trace = None
+            if self.trace_configs:
+                trace = RequestTrace(route, method, url, bucket, retries)
+                for config in self.trace_configs:
+                    await config.send_request_start(self, trace)
+
+            try:
+                return await self._send(route, fmt, bucket, method, url, cache_key, entry,
+                                        trace, **kwargs)
+            except _ReattemptRequest as error:
+                response = error.response
+                self.request_logger.failure(bucket, response)
+
+                if not policy.should_retry(retries):
+                    raise RequestFailed(response, error.data)
+
+                delay = policy.delay(retries, response, error.data)
+                retries += 1
+                self.rate_limiter.metrics.record_retry(bucket, response.status_code)
+
+                logger.debug('Retrying request to bucket %s in %.3f seconds', bucket, delay)
+                await anyio.sleep(delay)
+
+    async def _send(self,
+                    route: APIRoute,
+                    fmt: dict,
+                    bucket: Bucket,
+                    method: str,
+                    url: str,
+                    cache_key: Optional[str],
+                    entry: Optional[CachedResponse],
+                    trace: Optional[RequestTrace],
+                    **kwargs) -> Optional[Union[dict, list, str]]:
+        metrics = self.rate_limiter.metrics
+        response = None
 
         try:
-            result = await self.parse_response(bucket, response)
-        except _ReattemptRequest as error:
-            logger.debug(self.LOG_FAILURE.format(
-                bucket=bucket, code=error.status_code, error=response.content))
+            async with self.rate_limiter(bucket):
+                if trace is not None:
+                    trace.rate_limit_acquired = time.monotonic()
 
-            retries += 1
-            if retries > self.MAX_RETRIES:
-                raise RequestFailed(response, error.data)
+                sent_at = time.monotonic() if metrics.enabled else None
+                response = await self._perform(method, url, **kwargs)
 
-            retry_after = randint(1000, 50000) / 1000.0
-            await anyio.sleep(retry_after)
+                if trace is not None:
+                    trace.response_received = time.monotonic()
+                    trace.status = response.status_code
 
-            return await self.make_request(route, fmt, **kwargs)
-        else:
-            return result
+                if sent_at is not None:
+                    metrics.record_request(bucket, method, response.status_code,
+                                           time.monotonic() - sent_at, _body_size(kwargs),
+                                           len(response.body or b''))
+
+                await self.rate_limiter.update_bucket(bucket, response, route, fmt)
+                self.recorder.add(response)
+
+            if entry is not None and response.status_code == 304:
+                self.request_logger.success(bucket, response)
+                self.response_cache.revalidated(route, cache_key, entry, response)
+                return self._parse_cached(entry)
+
+            data = await self.parse_response(bucket, response)
+            if cache_key is not None and self.response_cache is not None:
+                self.response_cache.store(route, cache_key, url, response)
+
+            return data
+
+        except BaseException as error:
+            if trace is not None:
+                trace.error = error
+            raise
+
+        finally:
+            if trace is not None:
+                if response is not None:
+                    trace.parse_completed = time.monotonic()
+
+                for config in self.trace_configs:
+                    await config.send_request_end(self, trace)
+
+    async def _perform(self, method: str, url: str, **kwargs) -> Response:
+        # asks encodes request bodies as a whole, so streamed
+        # bodies are sent on a connection of their own instead.
+        data = kwargs.get('data')
+        if isinstance(data, MultipartBody) and isinstance(self._session, asks.Session):
+            # Those connections are bounded by the limit of the session as well.
+            # Semaphores can only be created once the event loop runs.
+            if self._upload_slots is None:
+                self._upload_slots = anyio.create_semaphore(
+                    getattr(self._session, '_connections', 1))
+
+            async with self._upload_slots:
+                return await stream_request(method, url, data, kwargs.get('headers'),
+                                            kwargs.get('params'), self.upload_timeout)
+
+        return await self._session.request(method, url, **kwargs)
 
     async def parse_response(self,
                              bucket: Bucket,
@@ -234,13 +473,20 @@ class HTTP:
             or a non-success status code not listed above occurred.
         """
 
-        data = self._parse_response(response)
+        metrics = self.rate_limiter.metrics
+        if metrics.enabled:
+            started = time.monotonic()
+            data = self._parse_response(response)
+            metrics.record_parse(bucket, time.monotonic() - started)
+        else:
+            data = self._parse_response(response)
+
         status = response.status_code
 
         if 200 <= status < 300:
             # These status codes indicate successful requests.
             # Therefore we can return the JSON response body.
-            logger.debug(self.LOG_SUCCESSS.format(bucket=bucket, text=data))
+            self.request_logger.success(bucket, response)
             return data
 
         elif status != 429 and 400 <= status < 500:
@@ -261,7 +507,7 @@ class HTTP:
 
         else:
             # Something weird happened here...Let's reattempt the request.
-            raise _ReattemptRequest(status, data)
+            raise _ReattemptRequest(response, data)
 
     async def close(self):
         """Closes the underlying :class:`Session<asks:asks.Session>`."""
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+
+import math
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+__all__ = (
+    'BucketMetrics',
+    'Histogram',
+    'Metrics',
+    'OpenMetricsExporter',
+    'RequestMetrics',
+)
+
+_Bucket = Union[Tuple[str, str], str]
+
+
+def _bucket_label(bucket: Optional[_Bucket]) -> str:
+    """Formats a rate limit bucket as a label, ``global`` for ``None``."""
+
+    if bucket is None:
+        return 'global'
+
+    return ' '.join((bucket,) if isinstance(bucket, str) else bucket)
+
+
+class Metrics:
+    """The interface for instrumentation of requests to the Discord API.
+
+    :class:`~clamor.rest.http.HTTP` and :class:`~clamor.rest.rate_limit.RateLimiter`
+    report what happens to requests through the methods of this class.
+    All of them do nothing, so this is the default that costs nothing.
+    Subclasses override the methods they are interested in and set
+    :attr:`Metrics.enabled` so that timings are actually taken.
+
+    Durations are measured in seconds on the :func:`time.monotonic` clock.
+    Rate limit buckets are passed as they are used by the rate limiter,
+    see :meth:`RateLimiter.bucket_for<clamor.rest.rate_limit.RateLimiter.bucket_for>`.
+    """
+
+    __slots__ = ()
+
+    #: Whether any method does something. If not, nothing is measured.
+    enabled = False
+
+    def record_queue_wait(self, bucket: _Bucket, duration: float):
+        """Records the time a request waited until it was allowed to be sent.
+
+        This includes the time spent cooling down buckets and the global limit.
+        """
+
+    def record_cooldown(self, bucket: Optional[_Bucket], duration: float):
+        """Records the time a request cooled down a bucket, ``None`` for the global limit."""
+
+    def record_request(self,
+                       bucket: _Bucket,
+                       method: str,
+                       status: int,
+                       duration: float,
+                       sent: int,
+                       received: int):
+        """Records a response, the time it took and the amount of bytes transferred."""
+
+    def record_parse(self, bucket: _Bucket, duration: float):
+        """Records the time it took to parse a response."""
+
+    def record_retry(self, bucket: _Bucket, status: int):
+        """Records that a request is retried after a response with a given status code."""
+
+
+class Histogram:
+    """Counts observed values in buckets of upper bounds.
+
+    Parameters
+    ----------
+    bounds : Sequence[float]
+        The inclusive upper bounds of the buckets, in ascending order.
+
+    Attributes
+    ----------
+    bounds : Tuple[float, ...]
+        The inclusive upper bounds of the buckets.
+    counts : List[int]
+        The amount of values per bucket, with an extra one
+        for values greater than all bounds.
+    sum : float
+        The sum of all values.
+    count : int
+        The amount of values.
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return '<Histogram count={0.count} sum={0.sum:.3f}>'.format(self)
+
+    def observe(self, value: float):
+        """Adds a value to the histogram."""
+
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """Iterates over the upper bounds and the amount of values up to them.
+
+        The last bound is :data:`math.inf`.
+        """
+
+        total = 0
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            yield bound, total
+
+
+class BucketMetrics:
+    """The metrics collected for requests to one rate limit bucket.
+
+    Parameters
+    ----------
+    bounds : Sequence[float]
+        The upper bounds of the duration histograms.
+
+    Attributes
+    ----------
+    responses : Counter[Tuple[str, int]]
+        The amount of responses per HTTP method and status code.
+    retries : Counter[int]
+        The amount of retries per status code of the failed response.
+    bytes_sent : int
+        The amount of request body bytes sent.
+    bytes_received : int
+        The amount of response body bytes received.
+    queue_wait : :class:`~clamor.rest.metrics.Histogram`
+        The time requests waited until they were allowed to be sent.
+    cooldown : :class:`~clamor.rest.metrics.Histogram`
+        The time requests cooled down the bucket.
+    latency : :class:`~clamor.rest.metrics.Histogram`
+        The time between sending requests and receiving their responses.
+    parse : :class:`~clamor.rest.metrics.Histogram`
+        The time it took to parse responses.
+    """
+
+    __slots__ = ('responses', 'retries', 'bytes_sent', 'bytes_received',
+                 'queue_wait', 'cooldown', 'latency', 'parse')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.responses = Counter()  # type: Counter[Tuple[str, int]]
+        self.retries = Counter()  # type: Counter[int]
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.queue_wait = Histogram(bounds)
+        self.cooldown = Histogram(bounds)
+        self.latency = Histogram(bounds)
+        self.parse = Histogram(bounds)
+
+    def __repr__(self) -> str:
+        return '<BucketMetrics requests={}>'.format(self.requests)
+
+    @property
+    def requests(self) -> int:
+        """The amount of responses that have been received."""
+
+        return sum(self.responses.values())
+
+
+class RequestMetrics(Metrics):
+    """Collects metrics of requests in memory, per rate limit bucket.
+
+    Cooldowns of the global rate limit are collected separately
+    in :attr:`RequestMetrics.global_cooldown`. Use
+    :class:`~clamor.rest.metrics.OpenMetricsExporter` to expose
+    the metrics to Prometheus or other monitoring systems.
+
+    .. note::
+
+        Buckets with known hashes are tracked per major parameter,
+        so there is one set of metrics per guild, channel or webhook.
+
+    Parameters
+    ----------
+    bounds : Sequence[float], optional
+        The upper bounds of the duration histograms in seconds,
+        defaults to :attr:`RequestMetrics.BOUNDS`.
+
+    Attributes
+    ----------
+    bounds : Tuple[float, ...]
+        The upper bounds of the duration histograms.
+    buckets : Dict[str, :class:`~clamor.rest.metrics.BucketMetrics`]
+        The metrics of each bucket, by their label.
+    global_cooldown : :class:`~clamor.rest.metrics.Histogram`
+        The time requests waited for the global rate limit.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        metrics = RequestMetrics()
+        http = HTTP(token, metrics=metrics)
+
+        ...
+
+        for bucket, bucket_metrics in metrics.buckets.items():
+            print(bucket, bucket_metrics.requests, bucket_metrics.latency.sum)
+    """
+
+    __slots__ = ('bounds', 'buckets', 'global_cooldown')
+
+    enabled = True
+
+    #: The default upper bounds of the duration histograms in seconds.
+    BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, bounds: Sequence[float] = BOUNDS):
+        self.bounds = tuple(bounds)
+        self.buckets = {}  # type: Dict[str, BucketMetrics]
+        self.global_cooldown = Histogram(self.bounds)
+
+    def __repr__(self) -> str:
+        return '<RequestMetrics buckets={}>'.format(len(self.buckets))
+
+    def bucket(self, bucket: _Bucket) -> BucketMetrics:
+        """Gets the metrics of a bucket, creating them if necessary."""
+
+        label = _bucket_label(bucket)
+        metrics = self.buckets.get(label)
+        if metrics is None:
+            metrics = self.buckets[label] = BucketMetrics(self.bounds)
+
+        return metrics
+
+    def record_queue_wait(self, bucket: _Bucket, duration: float):
+        self.bucket(bucket).queue_wait.observe(duration)
+
+    def record_cooldown(self, bucket: Optional[_Bucket], duration: float):
+        if bucket is None:
+            self.global_cooldown.observe(duration)
+        else:
+            self.bucket(bucket).cooldown.observe(duration)
+
+    def record_request(self,
+                       bucket: _Bucket,
+                       method: str,
+                       status: int,
+                       duration: float,
+                       sent: int,
+                       received: int):
+        metrics = self.bucket(bucket)
+        metrics.responses[method, status] += 1
+        metrics.bytes_sent += sent
+        metrics.bytes_received += received
+        metrics.latency.observe(duration)
+
+    def record_parse(self, bucket: _Bucket, duration: float):
+        self.bucket(bucket).parse.observe(duration)
+
+    def record_retry(self, bucket: _Bucket, status: int):
+        self.bucket(bucket).retries[status] += 1
+
+    def clear(self):
+        """Discards all metrics collected so far."""
+
+        self.buckets.clear()
+        self.global_cooldown = Histogram(self.bounds)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join('{}="{}"'.format(k, _escape(str(v))) for k, v in sorted(labels.items()))
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class OpenMetricsExporter:
+    """Renders :class:`~clamor.rest.metrics.RequestMetrics` in the OpenMetrics text format.
+
+    The output can be served on a ``/metrics`` endpoint
+    for Prometheus and compatible systems to scrape.
+
+    .. seealso:: OpenMetrics https://openmetrics.io
+
+    Parameters
+    ----------
+    metrics : :class:`~clamor.rest.metrics.RequestMetrics`
+        The metrics to export.
+    prefix : str
+        The prefix of the metric names, defaults to ``clamor_http``.
+
+    Attributes
+    ----------
+    metrics : :class:`~clamor.rest.metrics.RequestMetrics`
+        The metrics to export.
+    prefix : str
+        The prefix of the metric names.
+    """
+
+    __slots__ = ('metrics', 'prefix')
+
+    #: The ``Content-Type`` of the rendered metrics.
+    CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+    def __init__(self, metrics: RequestMetrics, prefix: str = 'clamor_http'):
+        self.metrics = metrics
+        self.prefix = prefix
+
+    def __repr__(self) -> str:
+        return '<OpenMetricsExporter prefix={}>'.format(self.prefix)
+
+    def render(self) -> str:
+        """Renders the current state of the metrics.
+
+        Returns
+        -------
+        str
+            The metrics in the OpenMetrics text format.
+        """
+
+        lines = []
+        buckets = sorted(self.metrics.buckets.items())
+
+        def family(name, kind, description):
+            lines.append('# TYPE {}_{} {}'.format(self.prefix, name, kind))
+            lines.append('# HELP {}_{} {}'.format(self.prefix, name, description))
+
+        def sample(name, labels, value):
+            lines.append('{}_{}{{{}}} {}'.format(self.prefix, name, labels, _number(value)))
+
+        def histogram(name, labels, hist):
+            for bound, count in hist.cumulative():
+                le = _labels(le=_number(bound))
+                sample(name + '_bucket', ','.join(filter(None, (labels, le))), count)
+            sample(name + '_count', labels, hist.count)
+            sample(name + '_sum', labels, hist.sum)
+
+        family('requests', 'counter', 'Responses received from the API.')
+        for bucket, metrics in buckets:
+            for (method, status), count in sorted(metrics.responses.items()):
+                sample('requests_total', _labels(bucket=bucket, method=method, status=status),
+                       count)
+
+        family('retries', 'counter', 'Requests retried after a failed response.')
+        for bucket, metrics in buckets:
+            for status, count in sorted(metrics.retries.items()):
+                sample('retries_total', _labels(bucket=bucket, status=status), count)
+
+        family('sent_bytes', 'counter', 'Request body bytes sent.')
+        for bucket, metrics in buckets:
+            sample('sent_bytes_total', _labels(bucket=bucket), metrics.bytes_sent)
+
+        family('received_bytes', 'counter', 'Response body bytes received.')
+        for bucket, metrics in buckets:
+            sample('received_bytes_total', _labels(bucket=bucket), metrics.bytes_received)
+
+        for name, description in (
+            ('queue_wait', 'Time requests waited until they were allowed to be sent.'),
+            ('cooldown', 'Time requests cooled down rate limits.'),
+            ('latency', 'Time between sending requests and receiving responses.'),
+            ('parse', 'Time spent parsing responses.'),
+        ):
+            family(name + '_seconds', 'histogram', description)
+            for bucket, metrics in buckets:
+                histogram(name + '_seconds', _labels(bucket=bucket), getattr(metrics, name))
+
+            if name == 'cooldown':
+                histogram(name + '_seconds', _labels(bucket='global'),
+                          self.metrics.global_cooldown)
+
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
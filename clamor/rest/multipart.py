@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import mimetypes
+import mmap
+import os
+import ssl
+import uuid
+from pathlib import PurePath
+from typing import Any, AsyncIterable, BinaryIO, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+
+import anyio
+import h11
+from asks.req_structs import CaseInsensitiveDict
+from asks.response_objects import Response
+
+from .codec import json_dumps
+
+__all__ = (
+    'MultipartBody',
+    'stream_request',
+)
+
+logger = logging.getLogger(__name__)
+
+#: The amount of bytes read from sources at once.
+CHUNK_SIZE = 64 * 1024
+
+_Source = Union[bytes, str, PurePath, BinaryIO, AsyncIterable[bytes]]
+
+
+class _BytesSource:
+    __slots__ = ('data', '_sent')
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._sent = False
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def open(self):
+        self._sent = False
+
+    async def read(self) -> bytes:
+        if self._sent:
+            return b''
+
+        self._sent = True
+        return self.data
+
+    def close(self):
+        pass
+
+
+class _PathSource:
+    __slots__ = ('path', '_file', '_map', '_offset')
+
+    def __init__(self, path: Union[str, PurePath]):
+        self.path = str(path)
+        self._file = None
+        self._map = None
+        self._offset = 0
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def open(self):
+        self._file = open(self.path, 'rb')
+        self._offset = 0
+
+        # Pages of the mapping are read from the page cache on demand
+        # and can be reclaimed by the OS, so they don't count against
+        # the memory of the process like buffered reads would.
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    async def read(self) -> bytes:
+        if self._map is None:
+            return b''
+
+        chunk = self._map[self._offset:self._offset + CHUNK_SIZE]
+        self._offset += len(chunk)
+        return chunk
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _FileSource:
+    __slots__ = ('file', '_start')
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+
+        # Seekable files are rewound to where they were for retries.
+        self._start = file.tell() if file.seekable() else None
+
+    @property
+    def size(self) -> Optional[int]:
+        if self._start is None:
+            return None
+
+        position = self.file.tell()
+        try:
+            return self.file.seek(0, os.SEEK_END) - self._start
+        finally:
+            self.file.seek(position)
+
+    def open(self):
+        if self._start is not None:
+            self.file.seek(self._start)
+
+    async def read(self) -> bytes:
+        return self.file.read(CHUNK_SIZE)
+
+    def close(self):
+        pass
+
+
+class _IteratorSource:
+    __slots__ = ('iterable', '_iterator')
+
+    size = None
+
+    def __init__(self, iterable: AsyncIterable[bytes]):
+        self.iterable = iterable
+        self._iterator = None
+
+    def open(self):
+        if self._iterator is not None:
+            raise RuntimeError('Async iterators can only be sent once')
+
+        self._iterator = self.iterable.__aiter__()
+
+    async def read(self) -> bytes:
+        while True:
+            try:
+                chunk = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                return b''
+
+            # Empty chunks would be mistaken for the end.
+            if chunk:
+                return bytes(chunk) if isinstance(chunk, memoryview) else chunk
+
+    def close(self):
+        pass
+
+
+def _make_source(source: _Source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _BytesSource(bytes(source))
+
+    if isinstance(source, (str, PurePath)):
+        return _PathSource(source)
+
+    if hasattr(source, '__aiter__'):
+        return _IteratorSource(source)
+
+    if hasattr(source, 'read'):
+        return _FileSource(source)
+
+    raise TypeError('Unsupported source for multipart bodies: {!r}'.format(type(source)))
+
+
+def _quote(value: str) -> str:
+    return value.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+class _BodyReader:
+    """Reads a multipart body chunk by chunk."""
+
+    __slots__ = ('_parts', '_closing', '_source', '_done')
+
+    def __init__(self, parts: List[Tuple[bytes, Any]], closing: bytes):
+        self._parts = iter(parts)
+        self._closing = closing
+        self._source = None
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._source is not None:
+            chunk = await self._source.read()
+            if chunk:
+                return chunk
+
+            self._source.close()
+            self._source = None
+            return b'\r\n'
+
+        part = next(self._parts, None)
+        if part is not None:
+            header, self._source = part
+            self._source.open()
+            return header
+
+        if self._done:
+            raise StopAsyncIteration
+
+        self._done = True
+        return self._closing
+
+    def close(self):
+        """Releases the source that is currently read from, if any."""
+
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+
+class MultipartBody:
+    """A ``multipart/form-data`` request body that is streamed instead of buffered.
+
+    Files are read in chunks of 64 KiB while the request is sent, so
+    uploads take about the same amount of memory no matter how large
+    the files are. Files given by their path are memory-mapped.
+
+    Sources of parts can be:
+
+    - :class:`bytes`, sent as they are.
+    - :class:`str` or :class:`pathlib.PurePath` objects, the path of a file.
+    - Binary file objects, read from their current position.
+    - Async iterables of :class:`bytes`.
+
+    Bodies can be sent again, e.g. when a request is retried, unless
+    they contain async iterables or file objects that aren't seekable.
+    Since the size of these can't be known in advance, bodies
+    containing them are sent with chunked transfer encoding.
+
+    Parameters
+    ----------
+    boundary : str, optional
+        The boundary between parts. Defaults to a random one.
+
+    Attributes
+    ----------
+    boundary : str
+        The boundary between parts.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        body = MultipartBody()
+        body.add_field('payload_json', json_dumps({'content': 'Hello'}), 'application/json')
+        body.add_file('file', 'video.mp4', '/tmp/video.mp4')
+
+        await http.make_request(Routes.CREATE_MESSAGE, dict(channel=channel_id), data=body)
+    """
+
+    __slots__ = ('boundary', '_parts')
+
+    def __init__(self, boundary: str = None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self._parts = []  # type: List[Tuple[bytes, Any]]
+
+    def __repr__(self) -> str:
+        return '<MultipartBody parts={} length={}>'.format(len(self._parts), self.content_length)
+
+    def __aiter__(self) -> _BodyReader:
+        return _BodyReader(self._parts, '--{}--\r\n'.format(self.boundary).encode())
+
+    @classmethod
+    def from_files(cls, files: list, payload: dict = None) -> 'MultipartBody':
+        """Creates a body for the ``files`` of a message the way Discord expects them.
+
+        Parameters
+        ----------
+        files : list
+            The files to upload, as ``(filename, source)`` or
+            ``(filename, source, content_type)`` tuples, or paths.
+        payload : dict, optional
+            The JSON payload of the message, sent as ``payload_json``.
+
+        Returns
+        -------
+        :class:`~clamor.rest.multipart.MultipartBody`
+            The body.
+        """
+
+        body = cls()
+        if payload is not None:
+            body.add_field('payload_json', json_dumps(payload), 'application/json')
+
+        for index, file in enumerate(files):
+            if isinstance(file, (str, PurePath)):
+                file = (os.path.basename(str(file)), file)
+
+            body.add_file('file' if len(files) == 1 else 'file{}'.format(index), *file)
+
+        return body
+
+    @property
+    def content_type(self) -> str:
+        """The ``Content-Type`` header of the body."""
+
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """The size of the body in bytes, ``None`` if it can't be known in advance."""
+
+        length = len(self.boundary) + 6
+        for header, source in self._parts:
+            size = source.size
+            if size is None:
+                return None
+
+            length += len(header) + size + 2
+
+        return length
+
+    def add_field(self, name: str, value: Union[str, bytes], content_type: str = None):
+        """Adds a form field.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field.
+        value : Union[str, bytes]
+            The value of the field, encoded as UTF-8 if it is a string.
+        content_type : str, optional
+            The ``Content-Type`` of the value.
+        """
+
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+
+        self._add(name, None, _BytesSource(bytes(value)), content_type)
+
+    def add_file(self, name: str, filename: str, source: _Source, content_type: str = None):
+        """Adds a file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field.
+        filename : str
+            The name of the file as it is shown.
+        source : Union[bytes, str, pathlib.PurePath, BinaryIO, AsyncIterable[bytes]]
+            The content of the file.
+        content_type : str, optional
+            The ``Content-Type`` of the file. Guessed from the
+            filename by default.
+        """
+
+        if content_type is None:
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        self._add(name, filename, _make_source(source), content_type)
+
+    def _add(self, name: str, filename: Optional[str], source: Any, content_type: Optional[str]):
+        disposition = 'form-data; name="{}"'.format(_quote(name))
+        if filename is not None:
+            disposition += '; filename="{}"'.format(_quote(filename))
+
+        header = '--{}\r\nContent-Disposition: {}\r\n'.format(self.boundary, disposition)
+        if content_type is not None:
+            header += 'Content-Type: {}\r\n'.format(content_type)
+
+        self._parts.append(((header + '\r\n').encode('utf-8'), source))
+
+    async def read(self) -> bytes:
+        """Reads the whole body into memory.
+
+        This defeats the purpose of streaming, but is useful for tests.
+        """
+
+        chunks = []
+        reader = self.__aiter__()
+        try:
+            async for chunk in reader:
+                chunks.append(chunk)
+        finally:
+            reader.close()
+
+        return b''.join(chunks)
+
+
+async def _receive(stream, connection: h11.Connection):
+    while True:
+        event = connection.next_event()
+        if event is not h11.NEED_DATA:
+            return event
+
+        connection.receive_data(await stream.receive_some(CHUNK_SIZE))
+
+
+async def stream_request(method: str,
+                         url: str,
+                         body: MultipartBody,
+                         headers: Dict[str, str] = None,
+                         params: dict = None,
+                         timeout: float = None) -> Response:
+    """Performs a request with a streamed body on a connection of its own.
+
+    :class:`Session<asks:asks.Session>` objects encode request bodies
+    as a whole, so :class:`~clamor.rest.http.HTTP` sends
+    :class:`~clamor.rest.multipart.MultipartBody` objects with this
+    instead.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method.
+    url : str
+        The URL of the request.
+    body : :class:`~clamor.rest.multipart.MultipartBody`
+        The body to stream.
+    headers : Dict[str, str], optional
+        The headers of the request.
+    params : dict, optional
+        The query parameters of the request.
+    timeout : float, optional
+        The maximum amount of seconds for connecting, sending the
+        body and receiving the response. ``None`` waits forever.
+
+    Returns
+    -------
+    :class:`Response<asks:asks.response_objects.Response>`
+        The response.
+
+    Raises
+    ------
+    :exc:`TimeoutError`
+        Raised when the request didn't complete in time.
+    """
+
+    target = urlsplit(url)
+    https = target.scheme == 'https'
+
+    path = target.path or '/'
+    query = '&'.join(filter(None, (target.query, urlencode(params or {}))))
+    if query:
+        path += '?' + query
+
+    request_headers = CaseInsensitiveDict(headers or {})
+    request_headers['Host'] = target.netloc
+    request_headers['Content-Type'] = body.content_type
+    request_headers['Connection'] = 'close'
+
+    length = body.content_length
+    if length is None:
+        request_headers['Transfer-Encoding'] = 'chunked'
+    else:
+        request_headers['Content-Length'] = str(length)
+
+    connection = h11.Connection(our_role=h11.CLIENT)
+    async with anyio.fail_after(timeout):
+        stream = await anyio.connect_tcp(
+            target.hostname,
+            target.port or (443 if https else 80),
+            ssl_context=ssl.create_default_context() if https else None,
+            autostart_tls=https,
+            tls_standard_compatible=False,
+        )
+
+        async with stream:
+            await stream.send_all(connection.send(
+                h11.Request(method=method, target=path, headers=list(request_headers.items()))))
+
+            reader = body.__aiter__()
+            try:
+                async for chunk in reader:
+                    await stream.send_all(connection.send(h11.Data(data=chunk)))
+            finally:
+                reader.close()
+
+            await stream.send_all(connection.send(h11.EndOfMessage()))
+
+            response = await _receive(stream, connection)
+            if not isinstance(response, h11.Response):
+                raise h11.RemoteProtocolError('Expected a response, got {!r}'.format(response))
+
+            content = []
+            while True:
+                event = await _receive(stream, connection)
+                if isinstance(event, h11.EndOfMessage):
+                    break
+
+                content.append(event.data)
+
+    logger.debug('Streamed %s bytes to %s', length if length is not None else 'chunked', url)
+
+    return Response(
+        encoding='utf-8',
+        http_version=response.http_version.decode(),
+        status_code=response.status_code,
+        reason_phrase=response.reason.decode(),
+        headers=CaseInsensitiveDict(
+            (name.decode(), value.decode()) for name, value in response.headers),
+        body=b''.join(content),
+        method=method,
+        url=url,
+    )
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+import anyio
+
+__all__ = (
+    'Paginator',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Paginator:
+    """An async iterator that streams the items of a paginated endpoint.
+
+    Pages are requested one after another, using the ID of the last
+    item of a page as the cursor for the next one. Only a few pages
+    are held in memory at any time, no matter how many items are
+    iterated over.
+
+    When used as an async contextmanager, the next page is already
+    requested in the background while the current one is being
+    processed. Otherwise, pages are only requested once the previous
+    one has been consumed.
+
+    Instances of this class are returned by the ``iter_*`` methods of
+    the endpoint wrappers and shouldn't be created manually.
+
+    Parameters
+    ----------
+    fetch : Callable[[Optional[Union[int, str]], int], Awaitable[list]]
+        A coroutine function that requests a page given a cursor
+        and the amount of items to request.
+    key : Callable[[Any], Union[int, str]], optional
+        Extracts the ID from an item that is used as the cursor.
+        Defaults to the ``id`` field of the item.
+    after : bool
+        Whether pages are requested in ascending order of IDs.
+        Defaults to ``False``, which means descending order.
+    cursor : Union[int, str], optional
+        The ID to start after or before.
+    limit : int, optional
+        The maximum amount of items to return. Unlimited by default.
+    predicate : Callable[[Any], bool], optional
+        Iteration stops at the first item this returns ``False`` for.
+    page_size : int
+        The maximum amount of items to request per page, defaults to ``100``.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        async with channel.iter_channel_messages(limit=10000) as messages:
+            async for message in messages:
+                print(message['content'])
+    """
+
+    def __init__(self,
+                 fetch: Callable[[Optional[Union[int, str]], int], Awaitable[list]],
+                 key: Callable[[Any], Union[int, str]] = None,
+                 after: bool = False,
+                 cursor: Union[int, str] = None,
+                 limit: int = None,
+                 predicate: Callable[[Any], bool] = None,
+                 page_size: int = 100):
+        if page_size < 1:
+            raise ValueError('Page size must be a positive integer')
+
+        self._fetch = fetch
+        self._key = key or (lambda item: item['id'])
+        self._after = after
+        self._cursor = cursor
+        self._limit = limit
+        self._predicate = predicate
+        self._page_size = page_size
+
+        self._buffer = deque()
+        self._fetched = 0
+        self._returned = 0
+        self._exhausted = False
+        self._stopped = False
+
+        self._task_group = None
+        self._prefetch_scope = None
+        self._pages = None
+
+    def __repr__(self) -> str:
+        return '<Paginator returned={} fetched={}>'.format(self._returned, self._fetched)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._stopped:
+            raise StopAsyncIteration
+
+        if self._limit is not None and self._returned >= self._limit:
+            await self._stop()
+            raise StopAsyncIteration
+
+        while not self._buffer:
+            page = await self._next_page()
+            if not page:
+                await self._stop()
+                raise StopAsyncIteration
+
+            self._buffer.extend(page)
+
+        item = self._buffer.popleft()
+        if self._predicate is not None and not self._predicate(item):
+            await self._stop()
+            raise StopAsyncIteration
+
+        self._returned += 1
+        return item
+
+    async def __aenter__(self):
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+
+        # A capacity of one keeps a single page ready while the next
+        # one is already being requested.
+        self._pages = anyio.create_queue(1)
+        await self._task_group.spawn(self._prefetch)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._stop()
+        return await self._task_group.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def flatten(self) -> list:
+        """Consumes the iterator and returns all remaining items as a list."""
+
+        items = []
+        async for item in self:
+            items.append(item)
+
+        return items
+
+    def _sort_key(self, item: Any) -> int:
+        return int(self._key(item))
+
+    async def _fetch_page(self) -> Optional[List[Any]]:
+        if self._exhausted:
+            return None
+
+        size = self._page_size
+        if self._limit is not None:
+            size = min(size, self._limit - self._fetched)
+
+        if size <= 0:
+            self._exhausted = True
+            return None
+
+        page = await self._fetch(self._cursor, size)
+        if len(page) < size:
+            self._exhausted = True
+
+        if page:
+            # The API doesn't guarantee any order within pages.
+            page.sort(key=self._sort_key, reverse=not self._after)
+            self._cursor = self._key(page[-1])
+            self._fetched += len(page)
+
+        logger.debug('Fetched page of %d items, next cursor is %s', len(page), self._cursor)
+        return page
+
+    async def _prefetch(self):
+        # Only the prefetching is cancelled when iteration stops early,
+        # not the block the consumer is in.
+        async with anyio.open_cancel_scope() as self._prefetch_scope:
+            if self._stopped:
+                return
+
+            try:
+                while True:
+                    page = await self._fetch_page()
+                    await self._pages.put(page)
+
+                    if not page:
+                        return
+            except anyio.get_cancelled_exc_class():
+                raise
+            except Exception as error:
+                # Hand the error over to the consumer.
+                await self._pages.put(error)
+
+    async def _next_page(self) -> Optional[List[Any]]:
+        if self._pages is None:
+            return await self._fetch_page()
+
+        page = await self._pages.get()
+        if isinstance(page, Exception):
+            raise page
+
+        return page
+
+    async def _stop(self):
+        self._stopped = True
+        self._buffer.clear()
+
+        if self._prefetch_scope is not None:
+            await self._prefetch_scope.cancel()
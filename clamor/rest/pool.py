@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from .http import HTTP
+
+__all__ = (
+    'HTTPPool',
+    'default_pool',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPPool:
+    r"""A registry that shares one :class:`~clamor.rest.http.HTTP` instance per token.
+
+    Creating a new :class:`~clamor.rest.http.HTTP` object for every
+    endpoint wrapper means a new :class:`Session<asks:asks.Session>` and
+    a new, empty :class:`~clamor.rest.rate_limit.RateLimiter` each time.
+    This class keeps track of the clients it has created so connections
+    are reused and rate limit state is shared by everything that makes
+    requests with the same token.
+
+    Instances are lazily populated. The first lookup of a token creates
+    the client, all following lookups return the same object.
+
+    Clients hold locks and connections of the event loop they are
+    first used on, so a pool must not be shared across event loops.
+    Programs that run several loops, e.g. test suites, need a pool
+    per loop and should close it before the loop ends.
+
+    Parameters
+    ----------
+    \**kwargs : dict
+        Default keyword arguments for newly created
+        :class:`~clamor.rest.http.HTTP` instances.
+        ``connections`` defaults to ``10`` for pooled clients.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        pool = HTTPPool(connections=20)
+
+        channel = ChannelWrapper(token, channel_id, pool=pool)
+        guild = GuildWrapper(token, guild_id, pool=pool)
+
+        assert channel.http is guild.http
+
+        ...
+
+        await pool.close()
+    """
+
+    #: The default amount of concurrent connections per pooled client.
+    DEFAULT_CONNECTIONS = 10
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('connections', self.DEFAULT_CONNECTIONS)
+
+        self._options = kwargs
+        self._clients = {}
+        self._client_options = {}
+
+    def __repr__(self) -> str:
+        return '<HTTPPool clients={}>'.format(len(self._clients))
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, token: str, **kwargs) -> HTTP:
+        r"""Gets the shared client for a token, creating it if necessary.
+
+        Parameters
+        ----------
+        token : str
+            The token to use for API authorization.
+        \**kwargs : dict
+            Keyword arguments that override the pool's defaults
+            when a new client needs to be created.
+
+        Returns
+        -------
+        :class:`~clamor.rest.http.HTTP`
+            The client for the token.
+
+        Raises
+        ------
+        :exc:`ValueError`
+            Raised when a client for this token already exists,
+            but was created with different keyword arguments.
+        """
+
+        options = dict(self._options, **kwargs)
+
+        client = self._clients.get(token)
+        if client is None:
+            client = self._clients[token] = HTTP(token, **options)
+            self._client_options[token] = options
+            logger.debug('Created pooled HTTP client %r', client)
+        elif kwargs and options != self._client_options[token]:
+            raise ValueError('The pooled client for this token has different options')
+
+        return client
+
+    async def release(self, token: str):
+        """Closes and forgets the client for a given token.
+
+        Parameters
+        ----------
+        token : str
+            The token whose client should be released.
+        """
+
+        self._client_options.pop(token, None)
+        client = self._clients.pop(token, None)
+        if client is not None:
+            await client.close()
+
+    async def close(self):
+        """Closes all clients this pool holds."""
+
+        self._client_options.clear()
+        while self._clients:
+            _, client = self._clients.popitem()
+            await client.close()
+
+
+#: The process-wide pool used by endpoint wrappers by default.
+#: Its clients belong to the event loop that first used them, so
+#: programs that run more than one loop should pass their own pool.
+default_pool = HTTPPool()
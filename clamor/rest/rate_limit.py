@@ -1,17 +1,24 @@
 # -*- coding: utf-8 -*-
 
+import json
 import logging
-from datetime import datetime, timezone
+import time
 from email.utils import parsedate_to_datetime
-from typing import NewType, Tuple, Union
+from typing import Dict, NewType, Optional, Tuple, Union
 
 import anyio
 from async_generator import async_generator, asynccontextmanager, yield_
 from asks.response_objects import Response
 
+from .metrics import Metrics
+from .retry import retry_after
+from .routes import APIRoute
+
 __all__ = (
+    'MAJOR_PARAMETERS',
     'Bucket',
     'CooldownBucket',
+    'GlobalLimit',
     'RateLimiter',
 )
 
@@ -20,6 +27,9 @@ logger = logging.getLogger(__name__)
 #: A type to denote rate limit buckets.
 Bucket = NewType('Bucket', Union[Tuple[str, str], str])
 
+#: Route parameters that rate limits are scoped to.
+MAJOR_PARAMETERS = ('guild', 'channel', 'webhook')
+
 
 class CooldownBucket:
     """Wraps around a request bucket to handle rate limits.
@@ -31,11 +41,20 @@ class CooldownBucket:
     CooldownBuckets extract rate limit information from headers and provide
     properties and methods that make it easy to deal with them.
 
+    Reset times are stored as deadlines on the :func:`time.monotonic` clock,
+    so they are neither affected by the resolution of the ``Date`` header
+    nor by clock skew between the API and the local machine.
+
+    Between responses, the amount of remaining requests is tracked locally.
+    Every request reserves a slot through :meth:`~CooldownBucket.reserve`
+    before it is sent, so no more requests than the API allows are
+    in flight at the same time.
+
     Parameters
     ----------
     bucket : Union[Tuple[str, str], str]
         The bucket for the route that should be covered.
-    response : :class:`Response<asks:asks.response_objects.Response>`
+    response : :class:`Response<asks:asks.response_objects.Response>`, optional
         The initial response object to initialize this class with.
 
     Attributes
@@ -44,21 +63,33 @@ class CooldownBucket:
         The bucket for the route that should be covered.
     lock : :class:`~Lock<anyio:anyio.abc.Lock>`
         The lock that is used when cooling down a route.
+    cooled_down : float
+        The total duration in seconds the bucket has been cooled down for.
     """
 
-    __slots__ = ('bucket', '_date', '_remaining', '_reset', 'lock')
+    __slots__ = ('bucket', '_limit', '_remaining', '_reset_at', '_window',
+                 '_inflight', '_limited', '_released', 'lock', 'cooled_down')
 
-    def __init__(self, bucket: Bucket, response: Response):
+    def __init__(self, bucket: Bucket, response: Response = None):
         self.bucket = bucket
 
         # These values will be set later.
-        self._date = None
+        self._limit = None
         self._remaining = 0
-        self._reset = None
+        self._reset_at = None
+        self._window = None
+
+        # Whether the bucket is known to be rate limited.
+        # None until the first response has been received.
+        self._limited = None
+        self._inflight = 0
+        self._released = None
 
         self.lock = anyio.create_lock()
+        self.cooled_down = 0.0
 
-        self.update(response)
+        if response is not None:
+            self.update(response)
 
     def __repr__(self) -> str:
         return '<CooldownBucket bucket={}>'.format(
@@ -69,7 +100,38 @@ class CooldownBucket:
     def will_rate_limit(self) -> bool:
         """Whether the next request is going to exhaust a rate limit or not."""
 
-        return self._remaining == 0
+        return (
+            self._remaining == 0
+            and self._reset_at is not None
+            and self._reset_at > time.monotonic()
+        )
+
+    @property
+    def reset_after(self) -> float:
+        """The duration in seconds until the bucket resets, ``0`` if unknown."""
+
+        if self._reset_at is None:
+            return 0.0
+
+        return max(self._reset_at - time.monotonic(), 0.0)
+
+    @property
+    def discovered(self) -> bool:
+        """Whether a response has revealed if and how the bucket is limited."""
+
+        return self._limited is not None
+
+    @property
+    def limit(self) -> Optional[int]:
+        """The amount of requests the API allows per window, ``None`` if unknown or unlimited."""
+
+        return self._limit if self._limited else None
+
+    @property
+    def inflight(self) -> int:
+        """The amount of requests that reserved a slot and haven't been released yet."""
+
+        return self._inflight
 
     def update(self, response: Response):
         """Updates this instance given a response that holds rate limit headers.
@@ -88,11 +150,95 @@ class CooldownBucket:
         # to the other headers as well.
         # Therefore it is sufficient to check for one header.
         if 'X-RateLimit-Remaining' not in headers:
+            if self._limited is None:
+                self._limited = False
             return
 
-        self._date = parsedate_to_datetime(headers.get('Date'))
-        self._remaining = int(headers.get('X-RateLimit-Remaining'))
-        self._reset = datetime.fromtimestamp(int(headers.get('X-RateLimit-Reset')), timezone.utc)
+        self._limited = True
+        self._limit = int(headers.get('X-RateLimit-Limit', 0)) or None
+
+        # Prefer the relative reset header for its millisecond precision.
+        # Otherwise fall back to the absolute reset time, relative to the
+        # server's own clock so local clock skew doesn't matter.
+        if 'X-RateLimit-Reset-After' in headers:
+            reset_after = float(headers.get('X-RateLimit-Reset-After'))
+        else:
+            date = parsedate_to_datetime(headers.get('Date'))
+            reset_after = float(headers.get('X-RateLimit-Reset')) - date.timestamp()
+
+        # The absolute reset time identifies the rate limit window.
+        window = headers.get('X-RateLimit-Reset')
+
+        # Other requests that are still in flight have already
+        # reserved their slots but may not be counted by the API
+        # yet. Within the same window, the local counter already
+        # accounts for them and the header can only lower it.
+        remaining = int(headers.get('X-RateLimit-Remaining'))
+        if window is not None and window == self._window:
+            self._remaining = min(self._remaining, remaining)
+        else:
+            self._remaining = max(remaining - max(self._inflight - 1, 0), 0)
+
+        self._window = window
+        self._reset_at = time.monotonic() + max(reset_after, 0.0)
+
+    async def reserve(self) -> bool:
+        """Reserves a slot for a request to the bucket this instance holds.
+
+        This blocks until the bucket has capacity for another request.
+        The caller has to hold :attr:`CooldownBucket.lock` and has to
+        call :meth:`~CooldownBucket.release` once the response
+        has been processed.
+
+        Returns
+        -------
+        bool
+            Whether the request is a probe for a bucket with unknown
+            rate limits. In that case, the lock should be held until
+            the response has been processed so that concurrent requests
+            don't burst past a limit nobody knows yet.
+        """
+
+        while True:
+            if self._limited is None:
+                self._inflight += 1
+                return True
+
+            if not self._limited or self._remaining > 0:
+                break
+
+            if self._reset_at is not None:
+                # The window is exhausted, wait for it to reset.
+                # Since the lock is held, all other requests are
+                # queued up behind this one.
+                await self.cooldown()
+                self._remaining = self._limit or 1
+                # Until the next response, the new reset time is unknown.
+                self._reset_at = None
+                self._window = None
+
+            elif self._inflight > 0:
+                # The new window has been exhausted before any response
+                # arrived. Wait for one to tell us when it resets.
+                self._released = anyio.create_event()
+                await self._released.wait()
+
+            else:
+                # Nobody is left to tell us about the limits. Try our luck.
+                break
+
+        self._remaining = max(self._remaining - 1, 0)
+        self._inflight += 1
+        return False
+
+    async def release(self):
+        """Releases a slot previously reserved by :meth:`~CooldownBucket.reserve`."""
+
+        self._inflight -= 1
+
+        if self._released is not None:
+            event, self._released = self._released, None
+            await event.set()
 
     async def cooldown(self) -> float:
         """Cools down the bucket this instance holds.
@@ -103,13 +249,95 @@ class CooldownBucket:
             The duration the bucket has been cooled down for.
         """
 
-        delay = (self._reset - self._date).total_seconds() + .5
-        logger.debug('Cooling bucket %s for %d seconds', self, delay)
-        await anyio.sleep(delay)
+        delay = self.reset_after
+        if delay > 0:
+            logger.debug('Cooling bucket %s for %.3f seconds', self, delay)
+            await anyio.sleep(delay)
+            self.cooled_down += delay
 
         return delay
 
 
+class GlobalLimit:
+    """Keeps track of the global rate limit that applies to all requests.
+
+    Requests are spread out proactively using a token bucket that
+    refills at ``rate`` requests per second, so the global limit is
+    not hit in the first place. If it is hit anyway, the deadline the
+    API asks for is stored and all requests wait for it.
+
+    Slots are taken with :meth:`~GlobalLimit.reserve`, which never
+    blocks. Instead, it returns the duration the caller has to wait
+    before sending its request. When nothing is limited, that is
+    just some arithmetic on the :func:`time.monotonic` clock.
+
+    Parameters
+    ----------
+    rate : int
+        The amount of requests allowed per second.
+        ``0`` disables the proactive budget.
+
+    Attributes
+    ----------
+    rate : int
+        The amount of requests allowed per second.
+    """
+
+    __slots__ = ('rate', '_tokens', '_updated', '_reset_at')
+
+    def __init__(self, rate: int):
+        self.rate = rate
+
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._reset_at = 0.0
+
+    def __repr__(self) -> str:
+        return '<GlobalLimit rate={}>'.format(self.rate)
+
+    @property
+    def is_limited(self) -> bool:
+        """Whether the API has imposed a global rate limit that hasn't expired yet."""
+
+        return self._reset_at > time.monotonic()
+
+    def limit(self, delay: float):
+        """Stores a global rate limit imposed by the API.
+
+        Parameters
+        ----------
+        delay : float
+            The duration of the limit in seconds.
+        """
+
+        self._reset_at = max(self._reset_at, time.monotonic() + delay)
+
+    def reserve(self) -> float:
+        """Reserves a slot for a request.
+
+        Returns
+        -------
+        float
+            The duration in seconds to wait before the request may be sent.
+        """
+
+        now = time.monotonic()
+        delay = self._reset_at - now
+
+        if self.rate:
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens may go negative. Every request that is short of
+            # a token waits for its own share of the refill, which
+            # keeps them in order without the need for a lock.
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+
+        return max(delay, 0.0)
+
+
 class RateLimiter:
     """A rate limiter to keep track of per-bucket rate limits.
 
@@ -119,14 +347,35 @@ class RateLimiter:
     can be used for that. It can also be used as an async
     contextmanager.
 
+    When used as a contextmanager in proactive mode, which is the
+    default, a slot in the bucket is reserved before the request
+    is sent and released when the block is left. The remaining
+    requests of a bucket are tracked locally between responses,
+    so exactly as many requests as the API allows proceed
+    concurrently while the rest is queued until the bucket resets.
+
+    The global rate limit is handled by a :class:`~clamor.rest.rate_limit.GlobalLimit`.
+    It spreads requests out to stay within the global budget and
+    never blocks requests unless they actually have to wait.
+
+    The API groups routes into buckets that are identified by the
+    ``X-RateLimit-Bucket`` header. Routes are mapped to these hashes
+    as soon as they are known and rate limits are then tracked per
+    hash and major parameters. Until then, a route is tracked on its
+    own. The mapping can be persisted with
+    :meth:`~RateLimiter.save_bucket_hashes` and restored with
+    :meth:`~RateLimiter.load_bucket_hashes`.
+
     Buckets are stored in a dictionary as literal bucket and
     :class:`~clamor.rest.rate_limit.CooldownBucket` objects.
 
     .. code-block:: python3
 
         buckets = {
-            ('GET', '/channels/1234'): <CooldownBucket bucket=GET /channels/1234>,
-            ('PATCH', '/users/@me'): <CooldownBucket bucket=PATCH /users/@me>,
+            ('GET', '/channels/1234/messages/{message}'):
+                <CooldownBucket bucket=GET /channels/1234/messages/{message}>,
+            ('80c17d2f203122d936070c88c8d10f33', '1234'):
+                <CooldownBucket bucket=80c17d2f203122d936070c88c8d10f33 1234>,
             ...
         }
 
@@ -142,8 +391,7 @@ class RateLimiter:
         # Option 1:
 
         # Make sure no global rate limit is exhausted.
-        async with limiter.global_lock:
-            pass
+        await limiter.cooldown_global()
 
         await limiter.cooldown_bucket(bucket)  # Blocks if rate limit is exhausted.
         response = await asks.request(bucket[0],
@@ -157,33 +405,100 @@ class RateLimiter:
                                           'https://discordapp.com/api/' + bucket[1], ...)
             await limiter.update_bucket(bucket, response)
 
+    Parameters
+    ----------
+    proactive : bool
+        Whether to reserve slots before requests are made instead of
+        only reacting to exhausted buckets. Defaults to ``True``.
+    bucket_hashes : Dict[str, str], optional
+        A previously saved mapping of routes to bucket hashes.
+    global_rate : int
+        The amount of requests allowed per second across all
+        buckets, defaults to ``50``. ``0`` disables the proactive
+        global budget, global limits imposed by the API are still
+        respected.
+    metrics : :class:`~clamor.rest.metrics.Metrics`, optional
+        The instrumentation to report queue and cooldown times to.
+        Defaults to one that does nothing.
+
     Attributes
     ----------
-    global_lock : :class:`Lock<anyio:anyio.abc.Lock>`
-        Separate lock for global rate limits.
+    proactive : bool
+        Whether slots are reserved before requests are made.
+    global_limit : :class:`~clamor.rest.rate_limit.GlobalLimit`
+        The global rate limit shared by all buckets.
+    metrics : :class:`~clamor.rest.metrics.Metrics`
+        The instrumentation to report queue and cooldown times to.
     """
 
-    def __init__(self):
+    #: The amount of requests the API allows per second globally.
+    GLOBAL_RATE = 50
+
+    def __init__(self,
+                 proactive: bool = True,
+                 bucket_hashes: Dict[str, str] = None,
+                 global_rate: int = GLOBAL_RATE,
+                 metrics: Metrics = None):
         self._buckets = {}
-        self.global_lock = anyio.create_lock()
+        self._hashes = dict(bucket_hashes or {})
+        self.proactive = proactive
+        self.global_limit = GlobalLimit(global_rate)
+        self.metrics = metrics or Metrics()
 
     @asynccontextmanager
     @async_generator
     async def __call__(self, bucket: Bucket):
-        # If a global rate limit occurred, this is going to block
-        # until the lock has been released after a cooldown.
-        # If no global limit is exhausted, the lock will be
-        # released immediately.
-        async with self.global_lock:
-            pass
+        metrics = self.metrics
+        queued_at = time.monotonic() if metrics.enabled else None
 
-        try:
+        if not self.proactive:
+            await self.cooldown_global()
             if await self.cooldown_bucket(bucket) > 0:
                 logger.debug('Bucket %s cooled down', bucket)
 
+            if queued_at is not None:
+                metrics.record_queue_wait(bucket, time.monotonic() - queued_at)
+
+            await yield_(self)
+            return
+
+        cooldown_bucket = self._buckets.get(bucket)
+        if cooldown_bucket is None:
+            cooldown_bucket = self._buckets[bucket] = CooldownBucket(bucket)
+
+        # The global budget is checked after a slot in the bucket has
+        # been reserved, right before the request is actually sent.
+        async with cooldown_bucket.lock:
+            cooled_down = cooldown_bucket.cooled_down
+            probe = await cooldown_bucket.reserve()
+
+            # Cooldowns only happen while the lock is held,
+            # so they are all caused by this request.
+            if queued_at is not None and cooldown_bucket.cooled_down > cooled_down:
+                metrics.record_cooldown(bucket, cooldown_bucket.cooled_down - cooled_down)
+
+            if probe:
+                # Nothing is known about this bucket yet. Keep the lock
+                # until the response is in so concurrent requests don't
+                # burst past a limit that has yet to be discovered.
+                try:
+                    await self.cooldown_global()
+                    if queued_at is not None:
+                        metrics.record_queue_wait(bucket, time.monotonic() - queued_at)
+
+                    await yield_(self)
+                finally:
+                    await cooldown_bucket.release()
+                return
+
+        try:
+            await self.cooldown_global()
+            if queued_at is not None:
+                metrics.record_queue_wait(bucket, time.monotonic() - queued_at)
+
             await yield_(self)
         finally:
-            pass
+            await cooldown_bucket.release()
 
     @property
     def buckets(self) -> dict:
@@ -191,6 +506,115 @@ class RateLimiter:
 
         return self._buckets
 
+    @property
+    def bucket_hashes(self) -> Dict[str, str]:
+        """The routes mapped to the bucket hashes that have been learned so far."""
+
+        return self._hashes
+
+    @staticmethod
+    def _route_key(route: APIRoute) -> str:
+        return '{0[0].value} {0[1]}'.format(route)
+
+    def bucket_for(self, route: APIRoute, fmt: dict = None) -> Bucket:
+        """Gets the bucket a request to a route is tracked in.
+
+        Parameters
+        ----------
+        route : Tuple[:class:`~clamor.rest.routes.Method`, str]
+            A tuple containing HTTP method and the route to make the request to.
+        fmt : dict, optional
+            A dictionary holding endpoint parameters to dynamically format a route.
+
+        Returns
+        -------
+        Tuple[str, str]
+            Either a tuple of bucket hash and major parameters, or of
+            HTTP method and the route with its major parameters filled in
+            if the bucket hash is not known yet.
+        """
+
+        fmt = fmt or {}
+
+        bucket_hash = self._hashes.get(self._route_key(route))
+        if bucket_hash is not None:
+            major = ':'.join(str(fmt[key]) for key in MAJOR_PARAMETERS if key in fmt)
+            return bucket_hash, major
+
+        # Minor parameters are kept as placeholders so that different
+        # resources of the same route share one bucket.
+        bucket_fmt = {
+            key: value
+            if key in MAJOR_PARAMETERS else '{' + key + '}'
+            for key, value in fmt.items()
+        }
+        return route[0].value, route[1].format(**bucket_fmt)
+
+    def load_bucket_hashes(self, path: str):
+        """Loads a mapping of routes to bucket hashes from a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to load.
+        """
+
+        with open(path, encoding='utf-8') as f:
+            self._hashes.update(json.load(f))
+
+    def save_bucket_hashes(self, path: str):
+        """Saves the mapping of routes to bucket hashes to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to write to.
+        """
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self._hashes, f, indent=2, sort_keys=True)
+
+    def _learn_bucket_hash(self, bucket: Bucket, bucket_hash: str, route: APIRoute, fmt: dict):
+        route_key = self._route_key(route)
+        if self._hashes.get(route_key) != bucket_hash:
+            logger.debug('Route %s belongs to bucket %s', route_key, bucket_hash)
+            self._hashes[route_key] = bucket_hash
+
+        new_bucket = self.bucket_for(route, fmt)
+        if new_bucket == bucket:
+            return bucket, None
+
+        # Move the state over to the hashed bucket. If another route
+        # already created it, the previous state is only kept alive
+        # by requests that are still in flight.
+        cooldown_bucket = self._buckets.pop(bucket, None)
+        if cooldown_bucket is not None and new_bucket not in self._buckets:
+            cooldown_bucket.bucket = new_bucket
+            self._buckets[new_bucket] = cooldown_bucket
+            cooldown_bucket = None
+
+        return new_bucket, cooldown_bucket
+
+    async def cooldown_global(self) -> float:
+        """Reserves a slot in the global budget and waits for it if necessary.
+
+        If neither the global budget is exhausted nor a global
+        rate limit is active, this returns immediately.
+
+        Returns
+        -------
+        float
+            The duration that has been waited for.
+        """
+
+        delay = self.global_limit.reserve()
+        if delay > 0:
+            logger.debug('Waiting %.3f seconds for the global rate limit', delay)
+            await anyio.sleep(delay)
+            self.metrics.record_cooldown(None, delay)
+
+        return delay
+
     async def cooldown_bucket(self, bucket: Bucket) -> float:
         """Cools down a given bucket.
 
@@ -214,11 +638,17 @@ class RateLimiter:
         if bucket in self._buckets:
             async with self._buckets[bucket].lock:
                 if self._buckets[bucket].will_rate_limit:
-                    return await self._buckets[bucket].cooldown()
+                    delay = await self._buckets[bucket].cooldown()
+                    self.metrics.record_cooldown(bucket, delay)
+                    return delay
 
         return 0.0
 
-    async def update_bucket(self, bucket: Bucket, response: Response):
+    async def update_bucket(self,
+                            bucket: Bucket,
+                            response: Response,
+                            route: APIRoute = None,
+                            fmt: dict = None):
         """Updates a bucket by a given response.
 
         .. note::
@@ -232,13 +662,27 @@ class RateLimiter:
             The bucket to update.
         response : :class:`Response<asks:asks.response_objects.Response>`
             The response object to extract rate limit headers from.
+        route : Tuple[:class:`~clamor.rest.routes.Method`, str], optional
+            The route of the request. Required to learn bucket hashes.
+        fmt : dict, optional
+            The endpoint parameters of the request.
         """
 
+        # Only store the deadline. Requests wait for it when they
+        # reserve their global slot instead of all being blocked here.
         if 'X-RateLimit-Global' in response.headers:
-            async with self.global_lock:
-                await anyio.sleep(
-                    int(response.headers.get('Retry-After')) / 1000.0
-                )
+            delay = retry_after(response) or 0.0
+            logger.warning('Global rate limit exhausted for %.3f seconds', delay)
+            self.global_limit.limit(delay)
+
+        bucket_hash = response.headers.get('X-RateLimit-Bucket')
+        if bucket_hash is not None and route is not None:
+            bucket, stale = self._learn_bucket_hash(bucket, bucket_hash, route, fmt)
+
+            # Requests that are still waiting on the previous state
+            # shouldn't have to discover the limits again.
+            if stale is not None:
+                stale.update(response)
 
         if bucket in self._buckets:
             self._buckets[bucket].update(response)
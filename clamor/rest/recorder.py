@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import random
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from asks.response_objects import Response
+
+__all__ = (
+    'ResponseRecorder',
+    'ResponseRecording',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseRecording:
+    """A bounded buffer of recorded responses.
+
+    This behaves like a ring buffer. If either the capacity or
+    the byte budget is exceeded, the oldest responses are evicted
+    to make space for new ones.
+
+    Instances of this class are created by :meth:`ResponseRecorder.record`
+    and shouldn't be created manually.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum amount of responses to keep.
+    max_bytes : int, optional
+        The maximum amount of response body bytes to keep.
+    sample_rate : float
+        The probability for a response to be recorded, between ``0`` and ``1``.
+
+    Attributes
+    ----------
+    capacity : int
+        The maximum amount of responses to keep.
+    max_bytes : int, optional
+        The maximum amount of response body bytes to keep.
+    sample_rate : float
+        The probability for a response to be recorded.
+    dropped : int
+        The amount of responses that were evicted or rejected.
+    """
+
+    __slots__ = ('capacity', 'max_bytes', 'sample_rate', 'dropped', '_responses', '_nbytes')
+
+    def __init__(self, capacity: int, max_bytes: int = None, sample_rate: float = 1.0):
+        if capacity < 1:
+            raise ValueError('Capacity must be a positive integer')
+
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError('Sample rate must be between 0 and 1')
+
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.dropped = 0
+
+        self._responses = deque()
+        self._nbytes = 0
+
+    def __repr__(self) -> str:
+        return '<ResponseRecording responses={} bytes={}>'.format(len(self), self._nbytes)
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def __iter__(self) -> Iterator[Response]:
+        return (response for response, _ in self._responses)
+
+    def __getitem__(self, index: int) -> Response:
+        return self._responses[index][0]
+
+    @property
+    def nbytes(self) -> int:
+        """The amount of response body bytes currently held."""
+
+        return self._nbytes
+
+    @staticmethod
+    def _sizeof(response: Response) -> int:
+        # Streamed responses don't have their body in memory.
+        body = getattr(response, 'body', None)
+        if isinstance(body, (bytes, bytearray)):
+            return len(body)
+
+        return 0
+
+    def _evict(self):
+        _, size = self._responses.popleft()
+        self._nbytes -= size
+        self.dropped += 1
+
+    def add(self, response: Response):
+        """Records a response, evicting older ones if necessary.
+
+        Parameters
+        ----------
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The response to record.
+        """
+
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+
+        size = self._sizeof(response)
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug('Response of %d bytes exceeds the recording budget', size)
+            self.dropped += 1
+            return
+
+        while len(self._responses) >= self.capacity:
+            self._evict()
+
+        if self.max_bytes is not None:
+            while self._nbytes + size > self.max_bytes:
+                self._evict()
+
+        self._responses.append((response, size))
+        self._nbytes += size
+
+    def clear(self):
+        """Removes all recorded responses."""
+
+        self._responses.clear()
+        self._nbytes = 0
+
+
+class ResponseRecorder:
+    """Opt-in recording of the responses an :class:`~clamor.rest.http.HTTP` client receives.
+
+    Nothing is recorded by default. Recording is switched on
+    for the duration of a :meth:`ResponseRecorder.record` block
+    and every active block keeps its own bounded buffer, so
+    memory usage never grows with the total amount of requests.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        with http.recorder.record(capacity=50, max_bytes=2 ** 20) as responses:
+            await http.make_request(Routes.GET_GATEWAY)
+
+        for response in responses:
+            print(response.status_code, response.headers)
+    """
+
+    __slots__ = ('_recordings',)
+
+    def __init__(self):
+        self._recordings = []
+
+    def __repr__(self) -> str:
+        return '<ResponseRecorder recordings={}>'.format(len(self._recordings))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any recording is currently active."""
+
+        return bool(self._recordings)
+
+    @property
+    def current(self) -> ResponseRecording:
+        """The most recently started recording that is still active, if any."""
+
+        return self._recordings[-1] if self._recordings else None
+
+    @contextmanager
+    def record(self,
+               capacity: int = 100,
+               max_bytes: int = None,
+               sample_rate: float = 1.0) -> Iterator[ResponseRecording]:
+        """A contextmanager that records responses while it is active.
+
+        .. note::
+
+            If the client is shared between multiple tasks, the
+            responses to requests made by these tasks are recorded
+            as well.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum amount of responses to keep, defaults to ``100``.
+        max_bytes : int, optional
+            The maximum amount of response body bytes to keep.
+            Unlimited if not given.
+        sample_rate : float
+            The probability for a response to be recorded,
+            defaults to ``1.0``.
+
+        Yields
+        ------
+        :class:`~clamor.rest.recorder.ResponseRecording`
+            The buffer that holds the recorded responses.
+        """
+
+        recording = ResponseRecording(capacity, max_bytes, sample_rate)
+        self._recordings.append(recording)
+
+        try:
+            yield recording
+        finally:
+            self._recordings.remove(recording)
+
+    def add(self, response: Response):
+        """Hands a response to all active recordings.
+
+        Parameters
+        ----------
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The response to record.
+        """
+
+        for recording in self._recordings:
+            recording.add(response)
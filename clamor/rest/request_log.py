@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from typing import Optional
+
+from asks.response_objects import Response
+
+from .rate_limit import Bucket
+
+__all__ = (
+    'RequestLogger',
+    'TruncatedBody',
+)
+
+
+class TruncatedBody:
+    """A response body that is only decoded when it is formatted.
+
+    Parameters
+    ----------
+    body : bytes
+        The raw response body.
+    limit : int, optional
+        The maximum amount of bytes to show. ``None`` shows everything.
+    """
+
+    __slots__ = ('body', 'limit')
+
+    def __init__(self, body: bytes, limit: Optional[int]):
+        self.body = body or b''
+        self.limit = limit
+
+    def __repr__(self) -> str:
+        return '<TruncatedBody size={} limit={}>'.format(len(self.body), self.limit)
+
+    def __str__(self) -> str:
+        body = self.body
+        if self.limit is None or len(body) <= self.limit:
+            return body.decode('utf-8', 'replace')
+
+        text = body[:self.limit].decode('utf-8', 'replace')
+        return '{}... ({} more bytes)'.format(text, len(body) - self.limit)
+
+
+class RequestLogger:
+    """Logs the outcome of requests to the Discord API.
+
+    Nothing is formatted unless the logger is enabled for ``DEBUG``
+    records, so logging costs nothing but a level check otherwise.
+
+    Records are logged with the fields of a request as the
+    ``clamor_request`` attribute, so that handlers can process
+    them in a structured way instead of parsing messages.
+
+    Parameters
+    ----------
+    logger : :class:`logging.Logger`, optional
+        The logger to log to, defaults to the one of :mod:`clamor.rest.http`.
+    body_limit : int, optional
+        The maximum amount of bytes of response bodies to include in
+        messages, defaults to ``200``. ``None`` includes whole bodies.
+
+    Attributes
+    ----------
+    logger : :class:`logging.Logger`
+        The logger to log to.
+    body_limit : int, optional
+        The maximum amount of bytes of response bodies to include in messages.
+    """
+
+    #: The default maximum amount of bytes of response bodies to log.
+    BODY_LIMIT = 200
+
+    #: The log message format for successful requests.
+    LOG_SUCCESS = 'Success, %(bucket)s has received %(status)d: %(body)s'
+    #: The log message format for failed requests.
+    LOG_FAILURE = 'Request to %(bucket)s failed with %(status)d: %(body)s'
+
+    __slots__ = ('logger', 'body_limit')
+
+    def __init__(self, logger: logging.Logger = None, body_limit: Optional[int] = BODY_LIMIT):
+        self.logger = logger or logging.getLogger('clamor.rest.http')
+        self.body_limit = body_limit
+
+    def __repr__(self) -> str:
+        return '<RequestLogger logger={0.logger.name} body_limit={0.body_limit}>'.format(self)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are logged at all."""
+
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def success(self, bucket: Bucket, response: Response):
+        """Logs a successful request.
+
+        Parameters
+        ----------
+        bucket : Union[Tuple[str, str], str]
+            The bucket of the request.
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The response to the request.
+        """
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(self.LOG_SUCCESS, bucket, response)
+
+    def failure(self, bucket: Bucket, response: Response):
+        """Logs a failed request.
+
+        Parameters
+        ----------
+        bucket : Union[Tuple[str, str], str]
+            The bucket of the request.
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The response to the request.
+        """
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(self.LOG_FAILURE, bucket, response)
+
+    def _log(self, fmt: str, bucket: Bucket, response: Response):
+        fields = {
+            'method': response.method,
+            'url': response.url,
+            'bucket': bucket,
+            'status': response.status_code,
+            'size': len(response.body or b''),
+        }
+
+        args = dict(fields, body=TruncatedBody(response.body, self.body_limit))
+        self.logger.debug(fmt, args, extra={'clamor_request': fields})
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import sqlite3
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from asks.response_objects import Response
+
+from .routes import APIRoute, Routes
+
+__all__ = (
+    'CacheBackend',
+    'CachedResponse',
+    'MemoryBackend',
+    'ResponseCache',
+    'SQLiteBackend',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """The body of a cached response along with its validators.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request, without query parameters.
+    body : bytes
+        The raw response body.
+    content_type : str
+        The ``Content-Type`` of the body.
+    etag : str, optional
+        The ``ETag`` of the response, if it had one.
+    expires_at : float
+        The Unix timestamp at which the response becomes stale.
+
+    Attributes
+    ----------
+    url : str
+        The URL of the request, without query parameters.
+    body : bytes
+        The raw response body.
+    content_type : str
+        The ``Content-Type`` of the body.
+    etag : str, optional
+        The ``ETag`` of the response.
+    expires_at : float
+        The Unix timestamp at which the response becomes stale.
+    """
+
+    __slots__ = ('url', 'body', 'content_type', 'etag', 'expires_at')
+
+    def __init__(self,
+                 url: str,
+                 body: bytes,
+                 content_type: str,
+                 etag: Optional[str],
+                 expires_at: float):
+        self.url = url
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return '<CachedResponse url={0.url} etag={0.etag}>'.format(self)
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the response can be used without revalidating it."""
+
+        return time.time() < self.expires_at
+
+
+class CacheBackend:
+    """Base class for storages of cached responses.
+
+    Backends are used synchronously, so their operations should be fast.
+    """
+
+    __slots__ = ()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Gets a cached response by its key."""
+
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CachedResponse):
+        """Stores a response under a key."""
+
+        raise NotImplementedError
+
+    def invalidate(self, url: str, recursive: bool = True):
+        """Removes all responses of a URL and, if recursive, the URLs below it."""
+
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes all responses."""
+
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Keeps cached responses in memory, evicting them in LRU order.
+
+    Responses are indexed by their URL, so invalidating URLs
+    that nothing was cached for is cheap.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum amount of responses to keep, defaults to ``1024``.
+
+    Attributes
+    ----------
+    max_size : int
+        The maximum amount of responses to keep.
+    """
+
+    __slots__ = ('max_size', '_entries', '_keys', '_urls')
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # type: OrderedDict[str, CachedResponse]
+        self._keys = {}  # type: Dict[str, Set[str]]
+        self._urls = []  # type: List[str]
+
+    def __repr__(self) -> str:
+        return '<MemoryBackend size={} max_size={}>'.format(len(self._entries), self.max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+
+        return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._unindex(key, previous.url)
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._index(key, entry.url)
+
+        while len(self._entries) > self.max_size:
+            key, entry = self._entries.popitem(last=False)
+            self._unindex(key, entry.url)
+
+    def invalidate(self, url: str, recursive: bool = True):
+        urls = [url] if url in self._keys else []
+        if recursive:
+            # URLs below this one are adjacent in sorted order,
+            # and '0' is the character that follows '/'.
+            start = bisect_left(self._urls, url + '/')
+            end = bisect_left(self._urls, url + '0', start)
+            urls.extend(self._urls[start:end])
+
+        for affected in urls:
+            for key in self._keys.pop(affected):
+                del self._entries[key]
+            del self._urls[bisect_left(self._urls, affected)]
+
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+        del self._urls[:]
+
+    def _index(self, key: str, url: str):
+        keys = self._keys.get(url)
+        if keys is None:
+            keys = self._keys[url] = set()
+            insort(self._urls, url)
+
+        keys.add(key)
+
+    def _unindex(self, key: str, url: str):
+        keys = self._keys[url]
+        keys.discard(key)
+        if not keys:
+            del self._keys[url]
+            del self._urls[bisect_left(self._urls, url)]
+
+
+class SQLiteBackend(CacheBackend):
+    """Keeps cached responses in a SQLite database, so they survive restarts.
+
+    Queries are indexed by URL, but they still run on the event loop
+    and block it while the database is busy, e.g. on a slow disk.
+    Prefer :class:`~clamor.rest.response_cache.MemoryBackend` if
+    persistence isn't needed.
+
+    Parameters
+    ----------
+    path : str
+        The path of the database file, created if it doesn't exist.
+        ``:memory:`` keeps the database in memory.
+
+    Attributes
+    ----------
+    path : str
+        The path of the database file.
+    """
+
+    __slots__ = ('path', '_db')
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB NOT NULL, '
+            'content_type TEXT NOT NULL, etag TEXT, expires_at REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_url ON responses (url)')
+
+    def __repr__(self) -> str:
+        return '<SQLiteBackend path={}>'.format(self.path)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._db.execute(
+            'SELECT url, body, content_type, etag, expires_at FROM responses WHERE key = ?',
+            (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        url, body, content_type, etag, expires_at = row
+        return CachedResponse(url, bytes(body), content_type, etag, expires_at)
+
+    def set(self, key: str, entry: CachedResponse):
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+            (key, entry.url, entry.body, entry.content_type, entry.etag, entry.expires_at)
+        )
+
+    def invalidate(self, url: str, recursive: bool = True):
+        if not recursive:
+            self._db.execute('DELETE FROM responses WHERE url = ?', (url,))
+            return
+
+        # A range over the URLs below this one can use the index,
+        # '0' being the character that follows '/'.
+        self._db.execute('DELETE FROM responses WHERE url = ? OR (url >= ? AND url < ?)',
+                         (url, url + '/', url + '0'))
+
+    def clear(self):
+        self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        """Closes the database."""
+
+        self._db.close()
+
+
+def _cache_control(response: Response) -> Dict[str, Optional[str]]:
+    header = response.headers.get('Cache-Control') or ''
+
+    directives = {}
+    for directive in header.split(','):
+        name, _, value = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    return directives
+
+
+class ResponseCache:
+    """Caches responses of ``GET`` routes that rarely change.
+
+    How long responses stay fresh is taken from the ``Cache-Control``
+    header of the response or, if it doesn't have one, from the route's
+    TTL. Responses with an ``ETag`` are revalidated with a conditional
+    request once they are stale, which costs a request but no body.
+    Responses without either are never cached.
+
+    Successful or not, requests with other methods invalidate the cached
+    responses of the resource they target and everything below it, as
+    well as the one of the resource above it, e.g. the collection or
+    guild it belongs to.
+
+    Parameters
+    ----------
+    backend : :class:`~clamor.rest.response_cache.CacheBackend`, optional
+        The storage for responses. Defaults to a new
+        :class:`~clamor.rest.response_cache.MemoryBackend`.
+    ttls : Dict[Tuple[:class:`~clamor.rest.routes.Method`, str], float], optional
+        The amount of seconds responses of routes stay fresh.
+        Defaults to :attr:`Routes.CACHE_TTL<clamor.rest.routes.Routes.CACHE_TTL>`.
+
+    Attributes
+    ----------
+    backend : :class:`~clamor.rest.response_cache.CacheBackend`
+        The storage for responses.
+    ttls : Dict[Tuple[:class:`~clamor.rest.routes.Method`, str], float]
+        The amount of seconds responses of routes stay fresh.
+    hits : int
+        The amount of requests that were served from the cache,
+        including revalidated ones.
+    misses : int
+        The amount of requests that weren't.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        cache = ResponseCache(SQLiteBackend('responses.db'))
+        http = HTTP(token, response_cache=cache)
+
+        await http.make_request(Routes.LIST_VOICE_REGIONS)  # Makes a request.
+        await http.make_request(Routes.LIST_VOICE_REGIONS)  # Served from the cache.
+    """
+
+    __slots__ = ('backend', 'ttls', 'hits', 'misses')
+
+    def __init__(self, backend: CacheBackend = None, ttls: Dict[APIRoute, float] = None):
+        self.backend = backend or MemoryBackend()
+        self.ttls = Routes.CACHE_TTL if ttls is None else ttls
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return '<ResponseCache backend={0.backend!r} hits={0.hits} misses={0.misses}>'.format(self)
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Gets a cached response, fresh or not.
+
+        Parameters
+        ----------
+        key : str
+            The key of the request.
+
+        Returns
+        -------
+        :class:`~clamor.rest.response_cache.CachedResponse`, optional
+            The cached response, ``None`` if there is none or it is
+            stale and can't be revalidated.
+        """
+
+        entry = self.backend.get(key)
+        if entry is None or (not entry.fresh and entry.etag is None):
+            self.misses += 1
+            return None
+
+        if entry.fresh:
+            self.hits += 1
+
+        return entry
+
+    def store(self, route: APIRoute, key: str, url: str, response: Response):
+        """Caches a successful response if its headers or route allow it.
+
+        Parameters
+        ----------
+        route : Tuple[:class:`~clamor.rest.routes.Method`, str]
+            The route of the request.
+        key : str
+            The key of the request.
+        url : str
+            The URL of the request, without query parameters.
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The response to cache.
+        """
+
+        directives = _cache_control(response)
+        if 'no-store' in directives:
+            return
+
+        etag = response.headers.get('ETag')
+        ttl = self.ttls.get(route)
+        if 'no-cache' in directives:
+            ttl = 0.0
+        elif directives.get('max-age') is not None:
+            try:
+                ttl = float(directives['max-age'])
+            except ValueError:
+                pass
+
+        if ttl is None:
+            if etag is None:
+                return
+            ttl = 0.0
+
+        logger.debug('Caching response of %s for %.1f seconds', key, ttl)
+
+        content_type = response.headers.get('Content-Type') or ''
+        entry = CachedResponse(url, response.body or b'', content_type, etag, time.time() + ttl)
+        self.backend.set(key, entry)
+
+    def revalidated(self, route: APIRoute, key: str, entry: CachedResponse, response: Response):
+        """Marks a stale response as fresh after the API confirmed it is unchanged.
+
+        Parameters
+        ----------
+        route : Tuple[:class:`~clamor.rest.routes.Method`, str]
+            The route of the request.
+        key : str
+            The key of the request.
+        entry : :class:`~clamor.rest.response_cache.CachedResponse`
+            The cached response.
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The ``304 Not Modified`` response.
+        """
+
+        self.hits += 1
+
+        directives = _cache_control(response)
+        ttl = self.ttls.get(route, 0.0)
+        if directives.get('max-age') is not None:
+            try:
+                ttl = float(directives['max-age'])
+            except ValueError:
+                pass
+
+        entry.expires_at = time.time() + ttl
+        self.backend.set(key, entry)
+
+    def invalidate(self, url: str):
+        """Removes the cached responses affected by a write to a URL.
+
+        Parameters
+        ----------
+        url : str
+            The URL that was written to, without query parameters.
+        """
+
+        self.backend.invalidate(url)
+
+        # Writes to a resource change the collection it is listed in.
+        self.backend.invalidate(url.rsplit('/', 1)[0], recursive=False)
+
+    def clear(self):
+        """Removes all cached responses."""
+
+        self.backend.clear()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import random
+from typing import Optional, Union
+
+from asks.response_objects import Response
+
+__all__ = (
+    'RetryPolicy',
+    'retry_after',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def retry_after(response: Response,
+                data: Optional[Union[dict, list, str]] = None) -> Optional[float]:
+    """Extracts the duration the API asks to wait before retrying a request.
+
+    This checks the ``Retry-After`` header, the ``X-RateLimit-Reset-After``
+    header and the ``retry_after`` field of a JSON error body in that order.
+
+    Parameters
+    ----------
+    response : :class:`Response<asks:asks.response_objects.Response>`
+        The response to extract the duration from.
+    data : Union[dict, list, str], optional
+        The parsed response body.
+
+    Returns
+    -------
+    float, optional
+        The duration to wait in seconds, ``None`` if the
+        response doesn't tell.
+    """
+
+    headers = response.headers
+
+    # Both the header and the JSON field are in milliseconds.
+    if 'Retry-After' in headers:
+        return int(headers['Retry-After']) / 1000.0
+
+    if 'X-RateLimit-Reset-After' in headers:
+        return float(headers['X-RateLimit-Reset-After'])
+
+    if isinstance(data, dict) and 'retry_after' in data:
+        return data['retry_after'] / 1000.0
+
+    return None
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Rate limited requests are retried after the duration the API
+    asks for. All other failures are retried with capped exponential
+    backoff. With jitter enabled, the "full jitter" strategy is used,
+    which picks a random delay between zero and the backoff value so
+    that concurrent requests don't retry in lockstep.
+
+    Parameters
+    ----------
+    max_retries : int
+        The total amount of allowed retries, defaults to ``5``.
+    base : float
+        The backoff for the first retry in seconds, defaults to ``0.5``.
+    cap : float
+        The upper bound for backoff delays in seconds, defaults to ``30``.
+    jitter : bool
+        Whether to randomize backoff delays, defaults to ``True``.
+
+    Attributes
+    ----------
+    max_retries : int
+        The total amount of allowed retries.
+    base : float
+        The backoff for the first retry in seconds.
+    cap : float
+        The upper bound for backoff delays in seconds.
+    jitter : bool
+        Whether backoff delays are randomized.
+    """
+
+    __slots__ = ('max_retries', 'base', 'cap', 'jitter')
+
+    def __init__(self,
+                 max_retries: int = 5,
+                 base: float = 0.5,
+                 cap: float = 30.0,
+                 jitter: bool = True):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+
+    def __repr__(self) -> str:
+        return '<RetryPolicy max_retries={0.max_retries} base={0.base} cap={0.cap}>'.format(self)
+
+    def should_retry(self, retries: int) -> bool:
+        """Whether another attempt is allowed after ``retries`` retries."""
+
+        return retries < self.max_retries
+
+    def backoff(self, retries: int) -> float:
+        """Computes the exponential backoff delay for a retry.
+
+        Parameters
+        ----------
+        retries : int
+            The amount of retries that have yet been attempted.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+
+        delay = min(self.cap, self.base * 2 ** retries)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def delay(self,
+              retries: int,
+              response: Response,
+              data: Optional[Union[dict, list, str]] = None) -> float:
+        """Computes the delay before the next attempt of a failed request.
+
+        Parameters
+        ----------
+        retries : int
+            The amount of retries that have yet been attempted.
+        response : :class:`Response<asks:asks.response_objects.Response>`
+            The response for the failed request.
+        data : Union[dict, list, str], optional
+            The parsed response body.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+
+        if response.status_code == 429:
+            # Never cap these, retrying earlier only earns another 429.
+            delay = retry_after(response, data)
+            if delay is not None:
+                return delay
+
+        return self.backoff(retries)
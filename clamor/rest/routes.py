@@ -156,6 +156,16 @@ class Routes:
     GET_GATEWAY = (Method.GET, GATEWAY)
     GET_GATEWAY_BOT = (Method.GET, GATEWAY + '/bot')
 
+    #: The amount of seconds responses of routes that rarely change
+    #: stay fresh in a :class:`~clamor.rest.response_cache.ResponseCache`.
+    CACHE_TTL = {
+        LIST_VOICE_REGIONS: 3600.0,
+        GET_GUILD_VOICE_REGIONS: 3600.0,
+        GET_GATEWAY: 3600.0,
+        GET_CURRENT_APPLICATION_INFO: 600.0,
+        LIST_GUILD_EMOJIS: 300.0,
+    }
+
 
 #: A type to denote Discord API routes.
 APIRoute = NewType('Route', Tuple[Method, str])
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .rate_limit import Bucket
+from .routes import APIRoute
+
+__all__ = (
+    'RequestTrace',
+    'TraceConfig',
+)
+
+
+class RequestTrace:
+    """The timeline of a single attempt to perform a request.
+
+    Timestamps are taken from the :func:`time.monotonic` clock and
+    are ``None`` for phases that haven't been reached. Each retry of
+    a request is traced separately.
+
+    The phases are:
+
+    1. **Queue**, from :attr:`~RequestTrace.enqueued` to
+       :attr:`~RequestTrace.rate_limit_acquired`: waiting for the
+       rate limiter, including bucket and global cooldowns.
+    2. **Send**, up to :attr:`~RequestTrace.response_received`:
+       waiting for a connection of the session, sending the request
+       and reading the response's headers and body.
+    3. **Parse**, up to :attr:`~RequestTrace.parse_completed`:
+       decoding the response and handling its status code.
+
+    Attributes
+    ----------
+    route : Tuple[:class:`~clamor.rest.routes.Method`, str]
+        The route of the request.
+    method : str
+        The HTTP method of the request.
+    url : str
+        The URL of the request.
+    bucket : Union[Tuple[str, str], str]
+        The rate limit bucket of the request.
+    attempt : int
+        The amount of retries that preceded this attempt.
+    started_at : float
+        The Unix timestamp at which the attempt started,
+        for relating the timeline to other clocks.
+    enqueued : float
+        When the attempt started waiting for the rate limiter.
+    rate_limit_acquired : float, optional
+        When the rate limiter allowed the request to be sent.
+    response_received : float, optional
+        When the whole response has been received.
+    parse_completed : float, optional
+        When the response has been parsed.
+    status : int, optional
+        The status code of the response.
+    error : BaseException, optional
+        The exception the attempt failed with, if any.
+    context : dict
+        Arbitrary data of the trace callbacks, e.g. their spans.
+    """
+
+    __slots__ = ('route', 'method', 'url', 'bucket', 'attempt', 'started_at', 'enqueued',
+                 'rate_limit_acquired', 'response_received', 'parse_completed',
+                 'status', 'error', 'context')
+
+    def __init__(self, route: APIRoute, method: str, url: str, bucket: Bucket, attempt: int):
+        self.route = route
+        self.method = method
+        self.url = url
+        self.bucket = bucket
+        self.attempt = attempt
+
+        self.started_at = time.time()
+        self.enqueued = time.monotonic()
+        self.rate_limit_acquired = None  # type: Optional[float]
+        self.response_received = None  # type: Optional[float]
+        self.parse_completed = None  # type: Optional[float]
+
+        self.status = None  # type: Optional[int]
+        self.error = None  # type: Optional[BaseException]
+        self.context = {}
+
+    def __repr__(self) -> str:
+        return '<RequestTrace method={0.method} url={0.url} attempt={0.attempt}>'.format(self)
+
+    @staticmethod
+    def _between(start: Optional[float], end: Optional[float]) -> Optional[float]:
+        if start is None or end is None:
+            return None
+
+        return end - start
+
+    @property
+    def queue_time(self) -> Optional[float]:
+        """The duration in seconds spent waiting for the rate limiter."""
+
+        return self._between(self.enqueued, self.rate_limit_acquired)
+
+    @property
+    def send_time(self) -> Optional[float]:
+        """The duration in seconds spent performing the request itself."""
+
+        return self._between(self.rate_limit_acquired, self.response_received)
+
+    @property
+    def parse_time(self) -> Optional[float]:
+        """The duration in seconds spent parsing the response."""
+
+        return self._between(self.response_received, self.parse_completed)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """The duration in seconds of the whole attempt."""
+
+        return self._between(self.enqueued, self.parse_completed)
+
+
+_TraceCallback = Callable[[Any, RequestTrace], Awaitable[None]]
+
+
+class TraceConfig:
+    """Callbacks that are notified about the requests of a :class:`~clamor.rest.http.HTTP`.
+
+    Callbacks are coroutine functions that take the
+    :class:`~clamor.rest.http.HTTP` instance and the
+    :class:`~clamor.rest.tracing.RequestTrace` of an attempt. They are
+    awaited in order before the attempt is queued and after it ended,
+    successfully or not. Exceptions raised by callbacks propagate to
+    the caller of the request.
+
+    Requests that are served from the response cache or by another
+    caller's identical request aren't sent and therefore aren't traced.
+
+    Attributes
+    ----------
+    on_request_start : List[Callable[[HTTP, RequestTrace], Awaitable[None]]]
+        The callbacks for attempts that are about to start.
+    on_request_end : List[Callable[[HTTP, RequestTrace], Awaitable[None]]]
+        The callbacks for attempts that ended.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        async def on_request_end(http, trace):
+            if trace.duration > 1.0:
+                print('Slow request to', trace.url, trace.queue_time, trace.send_time)
+
+        config = TraceConfig()
+        config.on_request_end.append(on_request_end)
+
+        http = HTTP(token, trace_configs=[config])
+    """
+
+    __slots__ = ('on_request_start', 'on_request_end')
+
+    def __init__(self):
+        self.on_request_start = []  # type: List[_TraceCallback]
+        self.on_request_end = []  # type: List[_TraceCallback]
+
+    def __repr__(self) -> str:
+        return '<TraceConfig on_request_start={} on_request_end={}>'.format(
+            len(self.on_request_start), len(self.on_request_end))
+
+    async def send_request_start(self, http, trace: RequestTrace):
+        """Notifies the callbacks of an attempt that is about to start."""
+
+        for callback in self.on_request_start:
+            await callback(http, trace)
+
+    async def send_request_end(self, http, trace: RequestTrace):
+        """Notifies the callbacks of an attempt that ended."""
+
+        for callback in self.on_request_end:
+            await callback(http, trace)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Iterable, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = (
+    'DISCORD_EPOCH',
+    'Snowflake',
+    'snowflake_array',
+    'snowflake_timestamps',
+    'snowflakes_between',
+)
+
+#: The first millisecond of 2015 as a Unix timestamp, the epoch of all snowflakes.
+DISCORD_EPOCH = 1420070400000
+
+_TIMESTAMP_SHIFT = 22
+_LOWER_BITS = (1 << _TIMESTAMP_SHIFT) - 1
+_MAX = (1 << 64) - 1
+
+_Bound = Union[datetime, int, str, None]
+
+
+class Snowflake(int):
+    """A unique ID of a Discord entity.
+
+    Snowflakes are integers that encode when they were generated,
+    so they can be compared and sorted by their creation time.
+    Since this is a subclass of :class:`int`, snowflakes can be
+    used everywhere IDs are accepted.
+
+    .. seealso:: Snowflakes https://discordapp.com/developers/docs/reference#snowflakes
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        message_id = Snowflake('175928847299117063')
+        print(message_id.created_at)  # 2016-04-30 11:18:25.796000+00:00
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'Snowflake({})'.format(int.__repr__(self))
+
+    # Otherwise formatting would fall back to __repr__.
+    __str__ = int.__repr__
+
+    @property
+    def timestamp(self) -> int:
+        """The Unix timestamp in milliseconds at which the snowflake was generated."""
+
+        return (self >> _TIMESTAMP_SHIFT) + DISCORD_EPOCH
+
+    @property
+    def created_at(self) -> datetime:
+        """The aware UTC datetime at which the snowflake was generated."""
+
+        return datetime.fromtimestamp(self.timestamp / 1000, timezone.utc)
+
+    @property
+    def worker_id(self) -> int:
+        """The ID of the worker that generated the snowflake."""
+
+        return (self >> 17) & 0x1F
+
+    @property
+    def process_id(self) -> int:
+        """The ID of the process that generated the snowflake."""
+
+        return (self >> 12) & 0x1F
+
+    @property
+    def increment(self) -> int:
+        """The amount of snowflakes the process generated before this one."""
+
+        return self & 0xFFF
+
+    @classmethod
+    def from_timestamp(cls, timestamp: int, high: bool = False) -> 'Snowflake':
+        """Creates the lowest or highest snowflake of a millisecond.
+
+        Parameters
+        ----------
+        timestamp : int
+            A Unix timestamp in milliseconds.
+        high : bool
+            Whether to create the highest snowflake instead, defaults to ``False``.
+
+        Returns
+        -------
+        :class:`~Snowflake`
+            The snowflake.
+        """
+
+        value = max(timestamp - DISCORD_EPOCH, 0) << _TIMESTAMP_SHIFT
+        return cls(value | _LOWER_BITS if high else value)
+
+    @classmethod
+    def from_datetime(cls, dt: datetime, high: bool = False) -> 'Snowflake':
+        """Creates the lowest or highest snowflake of a point in time.
+
+        Useful as ``before`` and ``after`` bounds for pagination.
+        Naive datetimes are considered to be in UTC.
+
+        Parameters
+        ----------
+        dt : :class:`datetime.datetime`
+            The point in time.
+        high : bool
+            Whether to create the highest snowflake instead, defaults to ``False``.
+
+        Returns
+        -------
+        :class:`~Snowflake`
+            The snowflake.
+        """
+
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+
+        return cls.from_timestamp(int(dt.timestamp() * 1000), high)
+
+
+def _bound(value: _Bound, high: bool) -> int:
+    if isinstance(value, datetime):
+        return Snowflake.from_datetime(value, high)
+
+    return int(value)
+
+
+def _is_ndarray(ids: Any) -> bool:
+    return numpy is not None and isinstance(ids, numpy.ndarray)
+
+
+def snowflake_array(ids: Iterable[Union[int, str]]) -> array:
+    """Packs IDs into an array of unsigned 64-bit integers.
+
+    An array holds millions of IDs at 8 bytes each,
+    instead of a list of strings at about 70 bytes each.
+
+    Parameters
+    ----------
+    ids : Iterable[Union[int, str]]
+        The IDs, as integers or strings.
+
+    Returns
+    -------
+    :class:`array.array`
+        The IDs with the typecode ``Q``.
+    """
+
+    return array('Q', map(int, ids))
+
+
+def snowflake_timestamps(ids: Union[array, 'numpy.ndarray']) -> Union[array, 'numpy.ndarray']:
+    """Extracts the Unix timestamps in milliseconds of many IDs at once.
+
+    NumPy arrays are processed vectorized.
+
+    Parameters
+    ----------
+    ids : Union[:class:`array.array`, :class:`numpy.ndarray`]
+        The IDs.
+
+    Returns
+    -------
+    Union[:class:`array.array`, :class:`numpy.ndarray`]
+        The timestamps, of the same type as the IDs.
+    """
+
+    if _is_ndarray(ids):
+        return (ids.astype(numpy.uint64) >> numpy.uint64(_TIMESTAMP_SHIFT)) + \
+            numpy.uint64(DISCORD_EPOCH)
+
+    return array('Q', [(i >> _TIMESTAMP_SHIFT) + DISCORD_EPOCH for i in ids])
+
+
+def snowflakes_between(ids: Union[array, 'numpy.ndarray'],
+                       after: _Bound = None,
+                       before: _Bound = None,
+                       ordered: bool = False) -> Union[array, 'numpy.ndarray']:
+    """Selects the IDs that were generated in a range of time.
+
+    Since snowflakes are ordered by their creation time, this
+    compares IDs directly instead of extracting their timestamps.
+    NumPy arrays are processed vectorized and sorted IDs are
+    searched by bisection.
+
+    Parameters
+    ----------
+    ids : Union[:class:`array.array`, :class:`numpy.ndarray`]
+        The IDs.
+    after : Union[:class:`datetime.datetime`, int, str], optional
+        The lower bound, inclusive for datetimes and exclusive for IDs.
+    before : Union[:class:`datetime.datetime`, int, str], optional
+        The upper bound, inclusive for datetimes and exclusive for IDs.
+    ordered : bool
+        Whether the IDs are sorted in ascending order, defaults to ``False``.
+
+    Returns
+    -------
+    Union[:class:`array.array`, :class:`numpy.ndarray`]
+        The selected IDs, of the same type and order as the given ones.
+    """
+
+    # Datetime bounds are turned into the lowest and highest snowflakes
+    # of their millisecond, so that IDs of that millisecond are included.
+    low = 0 if after is None else _bound(after, False)
+    high = _MAX if before is None else _bound(before, True)
+    if after is not None and not isinstance(after, datetime):
+        low += 1
+    if before is not None and not isinstance(before, datetime):
+        high -= 1
+
+    if _is_ndarray(ids):
+        low, high = numpy.uint64(min(low, _MAX)), numpy.uint64(max(high, 0))
+        if ordered:
+            return ids[ids.searchsorted(low, 'left'):ids.searchsorted(high, 'right')]
+
+        return ids[(ids >= low) & (ids <= high)]
+
+    if ordered:
+        return ids[bisect_left(ids, low):bisect_right(ids, high)]
+
+    return array(ids.typecode, [i for i in ids if low <= i <= high])
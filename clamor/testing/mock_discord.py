@@ -0,0 +1,627 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import itertools
+import logging
+import random
+import re
+import time
+from email.utils import formatdate
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import anyio
+import h11
+from asks.req_structs import CaseInsensitiveDict
+
+from ..rest.codec import json_dumps, json_loads
+from ..rest.multipart import MultipartBody
+from ..rest.rate_limit import MAJOR_PARAMETERS
+from ..rest.routes import APIRoute, Method, Routes
+
+__all__ = (
+    'MockDiscord',
+    'MockRequest',
+    'MockResponse',
+    'MockServer',
+    'MockSession',
+)
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r'{(\w+)}')
+
+_Handler = Callable[['MockRequest'], Any]
+
+
+def _compile_routes() -> List[Tuple[APIRoute, Pattern]]:
+    routes = []
+    for value in vars(Routes).values():
+        if not (isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], Method)):
+            continue
+
+        # Splitting yields literal parts and placeholder names in turns.
+        parts = _PLACEHOLDER.split(value[1])
+        pattern = ''.join(re.escape(part) if i % 2 == 0 else '(?P<{}>[^/]+)'.format(part)
+                          for i, part in enumerate(parts))
+        routes.append((value, re.compile('^' + pattern + '$')))
+
+    # Literal segments like @me take precedence over placeholders.
+    routes.sort(key=lambda item: item[0][1].count('{'))
+    return routes
+
+
+class MockRequest:
+    """A request the mock API received.
+
+    Attributes
+    ----------
+    method : str
+        The HTTP method.
+    path : str
+        The path below the API prefix.
+    route : Tuple[:class:`~clamor.rest.routes.Method`, str], optional
+        The route that matched the path, ``None`` if none did.
+    params : Dict[str, str]
+        The parameters of the route, e.g. ``{'channel': '1'}``.
+    query : Dict[str, str]
+        The query parameters.
+    headers : :class:`CaseInsensitiveDict<asks:asks.req_structs.CaseInsensitiveDict>`
+        The request headers.
+    body : bytes
+        The raw request body.
+    """
+
+    __slots__ = ('method', 'path', 'route', 'params', 'query', 'headers', 'body')
+
+    def __init__(self,
+                 method: str,
+                 path: str,
+                 route: Optional[APIRoute],
+                 params: Dict[str, str],
+                 query: Dict[str, str],
+                 headers: Dict[str, str],
+                 body: bytes):
+        self.method = method
+        self.path = path
+        self.route = route
+        self.params = params
+        self.query = query
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+
+    def __repr__(self) -> str:
+        return '<MockRequest {0.method} {0.path}>'.format(self)
+
+    @property
+    def json(self) -> Any:
+        """The decoded JSON body, ``None`` if there is none."""
+
+        if not self.body or 'json' not in self.headers.get('Content-Type', ''):
+            return None
+
+        return json_loads(self.body)
+
+
+class MockResponse:
+    """A response of the mock API that looks like one of asks.
+
+    Attributes
+    ----------
+    method : str
+        The HTTP method of the request.
+    url : str
+        The URL of the request.
+    status_code : int
+        The HTTP status code.
+    headers : :class:`CaseInsensitiveDict<asks:asks.req_structs.CaseInsensitiveDict>`
+        The response headers.
+    body : bytes
+        The raw response body.
+    """
+
+    __slots__ = ('method', 'url', 'status_code', 'headers', 'body')
+
+    def __init__(self, method: str, url: str, status_code: int, headers: dict, body: bytes):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+
+    def __repr__(self) -> str:
+        return '<MockResponse {0.status_code}>'.format(self)
+
+    @property
+    def content(self) -> bytes:
+        return self.body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8')
+
+    def json(self, **kwargs) -> Any:
+        return json_loads(self.body)
+
+
+class _Window:
+    __slots__ = ('remaining', 'reset_at')
+
+    def __init__(self, remaining: int, reset_at: float):
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+class MockDiscord:
+    r"""An offline imitation of the Discord REST API.
+
+    Every route of :class:`~clamor.rest.routes.Routes` is served
+    with a plausible default response that can be replaced with
+    :meth:`~MockDiscord.respond`. Rate limits are enforced per
+    bucket and globally, with the same headers Discord sends, so
+    the rate limiting of clients can be tested and benchmarked
+    without touching the real API.
+
+    Requests are handled by :meth:`~MockDiscord.handle`, either
+    in-process through a :class:`~MockSession` or over HTTP
+    through a :class:`~MockServer`.
+
+    Parameters
+    ----------
+    \**kwargs : dict
+        See below.
+
+    Keyword Arguments
+    -----------------
+    bucket_limit : int
+        The amount of requests per bucket and window, defaults to ``5``.
+    bucket_reset : float
+        The duration of a bucket's window in seconds, defaults to ``1``.
+    limits : Dict[Tuple[:class:`~clamor.rest.routes.Method`, str], Tuple[int, float]], optional
+        The limits and windows of specific routes.
+    global_limit : int, optional
+        The amount of requests per second across all buckets,
+        defaults to ``50``. ``None`` disables the global limit.
+    latency : Union[float, Tuple[float, float]]
+        The seconds to wait before responding, either fixed or as bounds
+        of a uniform distribution. Defaults to ``0``.
+    error_rate : float
+        The probability for a request to fail with a server error, defaults to ``0``.
+    error_status : int
+        The status code of injected server errors, defaults to ``502``.
+    seed : int, optional
+        The seed for latency and errors, to make runs reproducible.
+
+    Attributes
+    ----------
+    requests : int
+        The amount of requests that were handled.
+    rate_limited : int
+        The amount of requests that were answered with ``429``.
+    global_rate_limited : int
+        The amount of those that exceeded the global limit.
+    injected_errors : int
+        The amount of requests that failed with an injected server error.
+    history : List[:class:`~MockRequest`]
+        The most recent requests, up to :attr:`~MockDiscord.HISTORY_SIZE`.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        api = MockDiscord(bucket_limit=2, latency=0.01)
+        api.respond(Routes.GET_CHANNEL, lambda request: {'id': request.params['channel']})
+
+        http = HTTP('token', session=MockSession(api))
+        await http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+    """
+
+    #: The path all routes are below.
+    API_PREFIX = '/api/v7'
+    #: The gateway URL that is handed out.
+    GATEWAY_URL = 'wss://gateway.discord.gg'
+    #: The maximum amount of requests kept in the history.
+    HISTORY_SIZE = 1000
+
+    _routes = None
+
+    def __init__(self, **kwargs):
+        self.bucket_limit = kwargs.get('bucket_limit', 5)
+        self.bucket_reset = kwargs.get('bucket_reset', 1.0)
+        self.limits = dict(kwargs.get('limits') or {})
+        self.global_limit = kwargs.get('global_limit', 50)
+        self.latency = kwargs.get('latency', 0.0)
+        self.error_rate = kwargs.get('error_rate', 0.0)
+        self.error_status = kwargs.get('error_status', 502)
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.global_rate_limited = 0
+        self.injected_errors = 0
+        self.history = []  # type: List[MockRequest]
+
+        self._random = random.Random(kwargs.get('seed'))
+        self._ids = itertools.count(1)
+        self._handlers = {}  # type: Dict[APIRoute, _Handler]
+        self._windows = {}  # type: Dict[Tuple[str, str], _Window]
+        self._global = _Window(0, 0.0)
+
+        if MockDiscord._routes is None:
+            MockDiscord._routes = _compile_routes()
+
+    def __repr__(self) -> str:
+        return '<MockDiscord requests={0.requests} rate_limited={0.rate_limited}>'.format(self)
+
+    def respond(self, route: APIRoute, response: Union[_Handler, Any]):
+        """Replaces the default response of a route.
+
+        Parameters
+        ----------
+        route : Tuple[:class:`~clamor.rest.routes.Method`, str]
+            The route to respond to.
+        response : Union[Callable[[:class:`~MockRequest`], Any], Any]
+            Either the JSON serializable data to respond with or a function
+            that returns it for a request. Functions may also return a
+            tuple of status code, data and optionally extra headers.
+        """
+
+        self._handlers[route] = response if callable(response) else lambda request: response
+
+    def reset(self):
+        """Forgets all rate limit windows, statistics and history."""
+
+        self._windows.clear()
+        self._global = _Window(0, 0.0)
+        self.requests = self.rate_limited = self.global_rate_limited = self.injected_errors = 0
+        del self.history[:]
+
+    def match(self, method: str, path: str) -> Tuple[Optional[APIRoute], Dict[str, str]]:
+        """Finds the route of a request.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        path : str
+            The path below the API prefix.
+
+        Returns
+        -------
+        Tuple[Tuple[:class:`~clamor.rest.routes.Method`, str], Dict[str, str]]
+            The route, ``None`` if none matches, and its parameters.
+        """
+
+        method = method.upper()
+        for route, pattern in self._routes:
+            if route[0].value != method:
+                continue
+
+            match = pattern.match(path)
+            if match is not None:
+                return route, match.groupdict()
+
+        return None, {}
+
+    async def handle(self,
+                     method: str,
+                     target: str,
+                     headers: Dict[str, str],
+                     body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Handles a request.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        target : str
+            The path and query of the request.
+        headers : Dict[str, str]
+            The request headers.
+        body : bytes
+            The raw request body.
+
+        Returns
+        -------
+        Tuple[int, Dict[str, str], bytes]
+            The status code, headers and body of the response.
+        """
+
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency > 0:
+            await anyio.sleep(latency)
+
+        url = urlsplit(target)
+        path = url.path
+        if path.startswith(self.API_PREFIX):
+            path = path[len(self.API_PREFIX):]
+
+        route, params = self.match(method, path)
+        request = MockRequest(method.upper(), path, route, params,
+                              dict(parse_qsl(url.query)), headers, body)
+
+        self.requests += 1
+        self.history.append(request)
+        if len(self.history) > self.HISTORY_SIZE:
+            del self.history[0]
+
+        if route is None:
+            return self._json(404, {'message': '404: Not Found', 'code': 0})
+
+        now = time.monotonic()
+
+        if self.global_limit is not None:
+            if now >= self._global.reset_at:
+                self._global = _Window(self.global_limit, now + 1.0)
+
+            if self._global.remaining <= 0:
+                self.rate_limited += 1
+                self.global_rate_limited += 1
+                return self._too_many_requests(self._global.reset_at - now, True)
+
+            self._global.remaining -= 1
+
+        limit, reset = self.limits.get(route, (self.bucket_limit, self.bucket_reset))
+        bucket_hash = hashlib.sha1('{0[0].value} {0[1]}'.format(route).encode()).hexdigest()[:16]
+        major = ':'.join(params[key] for key in MAJOR_PARAMETERS if key in params)
+
+        window = self._windows.get((bucket_hash, major))
+        if window is None or now >= window.reset_at:
+            window = self._windows[bucket_hash, major] = _Window(limit, now + reset)
+
+        rate_limit_headers = {
+            'X-RateLimit-Limit': str(limit),
+            'X-RateLimit-Reset': '{:.3f}'.format(time.time() + window.reset_at - now),
+            'X-RateLimit-Reset-After': '{:.3f}'.format(window.reset_at - now),
+            'X-RateLimit-Bucket': bucket_hash,
+        }
+
+        if window.remaining <= 0:
+            self.rate_limited += 1
+            status, headers, body = self._too_many_requests(window.reset_at - now, False)
+            headers.update(rate_limit_headers, **{'X-RateLimit-Remaining': '0'})
+            return status, headers, body
+
+        window.remaining -= 1
+        rate_limit_headers['X-RateLimit-Remaining'] = str(window.remaining)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.injected_errors += 1
+            return self._json(self.error_status, {'message': 'Injected server error'})
+
+        status, headers, body = self._respond(request)
+        headers.update(rate_limit_headers)
+        return status, headers, body
+
+    def _json(self, status: int, data: Any) -> Tuple[int, Dict[str, str], bytes]:
+        headers = {'Date': formatdate(usegmt=True)}
+        if data is None:
+            return status, headers, b''
+
+        headers['Content-Type'] = 'application/json'
+        return status, headers, json_dumps(data)
+
+    def _too_many_requests(self,
+                           retry_after: float,
+                           is_global: bool) -> Tuple[int, Dict[str, str], bytes]:
+        retry_after = max(int(retry_after * 1000), 1)
+        status, headers, body = self._json(429, {
+            'message': 'You are being rate limited.',
+            'retry_after': retry_after,
+            'global': is_global,
+        })
+
+        headers['Retry-After'] = str(retry_after)
+        if is_global:
+            headers['X-RateLimit-Global'] = 'true'
+
+        return status, headers, body
+
+    def _respond(self, request: MockRequest) -> Tuple[int, Dict[str, str], bytes]:
+        handler = self._handlers.get(request.route)
+        if handler is not None:
+            result = handler(request)
+            if isinstance(result, tuple):
+                status, headers, body = self._json(*result[:2])
+                headers.update(*result[2:])
+                return status, headers, body
+
+            return self._json(200 if result is not None else 204, result)
+
+        route = request.route
+        if route == Routes.GET_GATEWAY:
+            return self._json(200, {'url': self.GATEWAY_URL})
+        if route == Routes.GET_GATEWAY_BOT:
+            return self._json(200, {
+                'url': self.GATEWAY_URL,
+                'shards': 1,
+                'session_start_limit': {'total': 1000, 'remaining': 1000, 'reset_after': 0},
+            })
+
+        method = request.method
+        if method == 'DELETE':
+            return self._json(204, None)
+
+        if method == 'GET':
+            # Routes that end with a parameter return single objects, others lists.
+            if route[1].endswith('}'):
+                last = _PLACEHOLDER.findall(route[1])[-1]
+                return self._json(200, {'id': request.params[last]})
+
+            return self._json(200, [])
+
+        data = request.json
+        if isinstance(data, dict):
+            data = dict(data)
+            data.setdefault('id', str(next(self._ids)))
+
+        return self._json(200, data if data is not None else {})
+
+
+class MockSession:
+    """Passes requests straight to a mock API, without any networking.
+
+    Meant to be given to :class:`~clamor.rest.http.HTTP` as its session.
+
+    Parameters
+    ----------
+    api : :class:`~MockDiscord`
+        The mock API to send requests to.
+
+    Attributes
+    ----------
+    api : :class:`~MockDiscord`
+        The mock API to send requests to.
+    """
+
+    __slots__ = ('api',)
+
+    def __init__(self, api: MockDiscord):
+        self.api = api
+
+    def __repr__(self) -> str:
+        return '<MockSession api={!r}>'.format(self.api)
+
+    async def request(self, method: str, url: str, **kwargs) -> MockResponse:
+        target = urlsplit(url)
+        query = list(parse_qsl(target.query))
+        query.extend((key, str(value)) for key, value in (kwargs.get('params') or {}).items())
+
+        path = target.path
+        if query:
+            path += '?' + urlencode(query)
+
+        body = kwargs.get('data') or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        elif isinstance(body, MultipartBody):
+            body = await body.read()
+
+        status, headers, body = await self.api.handle(method, path, kwargs.get('headers') or {},
+                                                      body)
+        return MockResponse(method, url, status, headers, body)
+
+    async def close(self):
+        pass
+
+
+class MockServer:
+    """Serves a mock API over HTTP/1.1 on a local TCP port.
+
+    Parameters
+    ----------
+    api : :class:`~MockDiscord`
+        The mock API to serve.
+    host : str
+        The interface to listen on, defaults to ``127.0.0.1``.
+    port : int
+        The port to listen on, defaults to a free one.
+
+    Attributes
+    ----------
+    api : :class:`~MockDiscord`
+        The mock API that is served.
+    host : str
+        The interface to listen on.
+    port : int
+        The port that is listened on, once listening.
+
+    Example
+    -------
+
+    .. code-block:: python3
+
+        server = MockServer(MockDiscord())
+        async with anyio.create_task_group() as tg:
+            await tg.spawn(server.serve)
+            await server.wait_listening()
+
+            http = HTTP('token', base_url=server.base_url)
+            await http.make_request(Routes.GET_GATEWAY)
+
+            await tg.cancel_scope.cancel()
+    """
+
+    #: The maximum amount of bytes to read from a connection at once.
+    RECEIVE_SIZE = 65536
+
+    def __init__(self, api: MockDiscord, host: str = '127.0.0.1', port: int = 0):
+        self.api = api
+        self.host = host
+        self.port = port
+
+        self._listening = anyio.create_event()
+
+    def __repr__(self) -> str:
+        return '<MockServer host={0.host} port={0.port}>'.format(self)
+
+    @property
+    def base_url(self) -> str:
+        """The URL to pass to :class:`~clamor.rest.http.HTTP` as ``base_url``."""
+
+        return 'http://{}:{}{}'.format(self.host, self.port, self.api.API_PREFIX)
+
+    async def wait_listening(self):
+        """Waits until the server accepts connections."""
+
+        await self._listening.wait()
+
+    async def serve(self):
+        """Accepts connections until cancelled."""
+
+        async with await anyio.create_tcp_server(self.port, self.host) as server:
+            self.port = server.port
+            await self._listening.set()
+            logger.debug('Serving mock API on %s', self.base_url)
+
+            async with anyio.create_task_group() as tg:
+                async for stream in server.accept_connections():
+                    await tg.spawn(self._serve_connection, stream)
+
+    async def _serve_connection(self, stream):
+        connection = h11.Connection(h11.SERVER)
+
+        async with stream:
+            while True:
+                request = None
+                body = bytearray()
+
+                while True:
+                    event = connection.next_event()
+                    if event is h11.NEED_DATA:
+                        data = await stream.receive_some(self.RECEIVE_SIZE)
+                        connection.receive_data(data)
+                        continue
+
+                    if isinstance(event, h11.ConnectionClosed):
+                        return
+                    if isinstance(event, h11.Request):
+                        request = event
+                    elif isinstance(event, h11.Data):
+                        body += event.data
+                    elif isinstance(event, h11.EndOfMessage):
+                        break
+
+                headers = {name.decode('latin-1'): value.decode('latin-1')
+                           for name, value in request.headers}
+                status, headers, data = await self.api.handle(
+                    request.method.decode('ascii'), request.target.decode('ascii'),
+                    headers, bytes(body))
+
+                headers['Content-Length'] = str(len(data))
+                response = h11.Response(status_code=status, headers=list(headers.items()))
+                try:
+                    await stream.send_all(connection.send(response))
+                    if data:
+                        await stream.send_all(connection.send(h11.Data(data=data)))
+                    await stream.send_all(connection.send(h11.EndOfMessage()))
+                except ConnectionError:
+                    # The client gave up on the response, e.g. after a timeout.
+                    return
+
+                if connection.our_state is h11.MUST_CLOSE:
+                    return
+
+                connection.start_next_cycle()
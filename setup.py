@@ -20,7 +20,12 @@ with open(str(ROOT / 'README.rst'), encoding='utf-8') as f:
 with open(str(ROOT / 'requirements.txt'), encoding='utf-8') as f:
     REQUIREMENTS = f.read().splitlines()
 
-EXTRAS_REQUIRE = {}
+EXTRAS_REQUIRE = {
+    # Faster JSON encoding and decoding
+    'speedups': ['orjson'],
+    # Vectorized processing of snowflakes
+    'numpy': ['numpy'],
+}
 
 
 setup(
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+from unittest import mock
+
+import anyio
+
+from clamor import HTTP, Routes
+from clamor.cache import Cache, EntityStore
+from clamor.rest.endpoints import GuildWrapper
+from clamor.testing import MockDiscord, MockSession
+
+
+class EntityStoreTests(unittest.TestCase):
+    def test_lru_eviction(self):
+        store = EntityStore(max_size=2)
+        store.set(1, 'a')
+        store.set(2, 'b')
+        store.get(1)
+        store.set(3, 'c')
+
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get(2))
+        self.assertEqual(store.get(1), 'a')
+
+    def test_ttl(self):
+        store = EntityStore(ttl=10)
+        store.set(1, 'a')
+
+        with mock.patch('time.monotonic', return_value=time.monotonic() + 11):
+            self.assertIsNone(store.get(1))
+
+        self.assertEqual(len(store), 0)
+
+    def test_children(self):
+        store = EntityStore(max_size=3)
+        self.assertIsNone(store.children(1))
+
+        store.set_children(1, [(10, 'a'), (11, 'b')])
+        self.assertEqual(sorted(store.children(1)), ['a', 'b'])
+
+        # Evicting a child makes the set incomplete.
+        store.set(20, 'c')
+        store.set(21, 'd')
+        self.assertIsNone(store.children(1))
+
+    def test_disabled(self):
+        store = EntityStore(max_size=0)
+        store.set(1, 'a')
+        store.set_children(2, [(3, 'b')])
+
+        self.assertFalse(store.enabled)
+        self.assertEqual(len(store), 0)
+        self.assertIsNone(store.children(2))
+
+
+class CacheTests(unittest.TestCase):
+    def test_add_guild(self):
+        cache = Cache()
+        cache.add_guild({
+            'id': '1',
+            'roles': [{'id': '1'}, {'id': '2'}],
+            'channels': [{'id': '3'}],
+            'members': [{'user': {'id': '4'}}],
+        })
+
+        self.assertEqual(len(cache.get_roles(1)), 2)
+        self.assertEqual(cache.get_channel('3'), {'id': '3'})
+        self.assertEqual(cache.get_user(4), {'id': '4'})
+        self.assertIsNotNone(cache.get_member(1, 4))
+
+        cache.remove_guild(1)
+        self.assertIsNone(cache.get_guild(1))
+        self.assertIsNone(cache.get_roles(1))
+        self.assertIsNone(cache.get_member(1, 4))
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            Cache(ttls={'stickers': 10})
+
+    def test_wrapper(self):
+        async def main():
+            api = MockDiscord()
+            api.respond(Routes.GET_GUILD_ROLES, [{'id': '1'}, {'id': '2'}])
+            cache = Cache()
+            wrapper = GuildWrapper('token', 1, http=HTTP('token', session=MockSession(api)),
+                                   cache=cache)
+
+            first = await wrapper.get_guild_roles()
+            second = await wrapper.get_guild_roles()
+            self.assertEqual(first, second)
+            self.assertEqual(api.requests, 1)
+
+            await wrapper.delete_guild_role(2)
+            self.assertIsNone(cache.get_roles(1))
+            self.assertEqual(cache.get_role(1), {'id': '1'})
+
+        anyio.run(main)
+
+    def test_no_cache(self):
+        async def main():
+            api = MockDiscord()
+            api.respond(Routes.GET_GUILD_ROLES, [{'id': '1'}])
+            wrapper = GuildWrapper('token', 1, http=HTTP('token', session=MockSession(api)))
+
+            await wrapper.get_guild_roles()
+            await wrapper.get_guild_roles()
+            self.assertEqual(api.requests, 2)
+
+        anyio.run(main)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+from anyio.exceptions import IncompleteRead
+
+try:
+    from clamor.cluster import IPCClient, IPCServer, SharedRateLimiter, split_shards
+except ImportError:  # anysocks is not installed
+    IPCClient = None
+
+from clamor.rest.routes import Routes
+
+
+class MemoryStream:
+    """One end of an in-memory byte stream pair."""
+
+    def __init__(self, incoming, outgoing):
+        self._incoming = incoming
+        self._outgoing = outgoing
+        self._buffer = bytearray()
+
+    @classmethod
+    def pair(cls):
+        a, b = anyio.create_queue(100), anyio.create_queue(100)
+        return cls(a, b), cls(b, a)
+
+    async def send_all(self, data):
+        await self._outgoing.put(bytes(data))
+
+    async def receive_exactly(self, size):
+        while len(self._buffer) < size:
+            chunk = await self._incoming.get()
+            if chunk is None:
+                raise IncompleteRead
+            self._buffer.extend(chunk)
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def close(self):
+        await self._outgoing.put(None)
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.status_code = 200
+        self.headers = headers
+
+
+@unittest.skipIf(IPCClient is None, 'anysocks is not installed')
+class ClusterTests(unittest.TestCase):
+    def test_split_shards(self):
+        self.assertEqual(split_shards(5, 2), [[0, 1, 2], [3, 4]])
+        self.assertEqual(split_shards(2, 4), [[0], [1]])
+
+    def test_shared_state(self):
+        async def main():
+            server = IPCServer('unused')
+
+            async with anyio.create_task_group() as tg:
+                clients = []
+                for cluster_id in range(2):
+                    server_end, client_end = MemoryStream.pair()
+                    await tg.spawn(server._serve_peer, server_end)
+
+                    client = IPCClient('unused', cluster_id)
+                    await client.connect(client_end)
+                    await tg.spawn(client.run)
+                    clients.append(client)
+
+                received = []
+
+                async def on_broadcast(sender, data):
+                    received.append((sender, data))
+
+                async def on_query(sender, data):
+                    return data * 2
+
+                clients[1].on_broadcast = on_broadcast
+                clients[1].on_query = on_query
+
+                limiter = SharedRateLimiter(clients[0])
+                route = Routes.GET_CHANNEL
+                fmt = {'channel': 1234}
+
+                bucket = limiter.bucket_for(route, fmt)
+                async with limiter(bucket):
+                    await limiter.update_bucket(bucket, FakeResponse({
+                        'X-RateLimit-Limit': '5',
+                        'X-RateLimit-Remaining': '4',
+                        'X-RateLimit-Reset-After': '1',
+                        'X-RateLimit-Bucket': 'abcd',
+                    }), route, fmt)
+
+                self.assertEqual(limiter.bucket_for(route, fmt), ('abcd', '1234'))
+                self.assertIn(('abcd', '1234'), server.rate_limiter.buckets)
+
+                await clients[0].broadcast({'hello': 'world'})
+                self.assertEqual(await clients[0].query(21, timeout=1), [42])
+                self.assertEqual(received, [(0, {'hello': 'world'})])
+
+                for client in clients:
+                    await client.close()
+
+        anyio.run(main)
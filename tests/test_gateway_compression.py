@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import zlib
+
+try:
+    from clamor.gateway import ZlibStreamInflater
+except ImportError:  # anysocks is not installed
+    ZlibStreamInflater = None
+
+
+@unittest.skipIf(ZlibStreamInflater is None, 'anysocks is not installed')
+class ZlibStreamInflaterTests(unittest.TestCase):
+    def test_split_frames(self):
+        compressor = zlib.compressobj()
+        inflater = ZlibStreamInflater()
+
+        for payload in (b'{"op":10}', b'{"op":0,"d":"' + b'x' * 10000 + b'"}', b'{"op":11}'):
+            data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            frames = [data[i:i + 16] for i in range(0, len(data), 16)]
+
+            for frame in frames[:-1]:
+                self.assertIsNone(inflater.feed(frame))
+            self.assertEqual(inflater.feed(frames[-1]), payload)
+
+        self.assertGreater(inflater.ratio, 1)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+import json
+import unittest
+import zlib
+from unittest import mock
+
+import anyio
+
+from clamor import RetryPolicy
+
+try:
+    from clamor.gateway import GatewayConnection, Opcode, ZlibStreamInflater
+except ImportError:  # anysocks is not installed
+    GatewayConnection = None
+
+
+class FakeSocket:
+    def __init__(self, *messages):
+        self.messages = list(messages)
+        self.sent = []
+        self.closed = None
+
+    async def get_message(self):
+        if not self.messages:
+            raise OSError('Connection reset')
+        return self.messages.pop(0)
+
+    async def send_message(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self, code, reason=''):
+        self.closed = code
+
+
+class RecordingPolicy(RetryPolicy):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = []
+
+    def backoff(self, retries):
+        delay = super().backoff(retries)
+        self.delays.append(delay)
+        return delay
+
+
+class FakeGateway:
+    """Hands out connections that drop right after the session is ready."""
+
+    def __init__(self, connection, sessions):
+        self.connection = connection
+        self.sessions = sessions
+        self.socket = None
+
+    def __call__(self, url):
+        return self
+
+    async def __aenter__(self):
+        if self.sessions == 0:
+            await self.connection.close()
+            raise OSError('Closed')
+
+        self.sessions -= 1
+        self.socket = FakeSocket(
+            json.dumps({'op': Opcode.HELLO, 'd': {'heartbeat_interval': 60000}}),
+            json.dumps({'op': Opcode.DISPATCH, 's': 1, 't': 'READY',
+                        'd': {'session_id': 'abc'}}))
+        return self.socket
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+@unittest.skipIf(GatewayConnection is None, 'anysocks is not installed')
+class GatewayConnectionTests(unittest.TestCase):
+    def test_dispatch(self):
+        async def main():
+            connection = GatewayConnection('token', 'wss://gateway.discord.gg')
+            connection._con = FakeSocket()
+
+            await connection._handle({
+                'op': Opcode.DISPATCH, 's': 1, 't': 'READY', 'd': {'session_id': 'abc'}})
+            await connection._handle({
+                'op': Opcode.DISPATCH, 's': 2, 't': 'MESSAGE_CREATE', 'd': {'content': 'Hi'}})
+
+            self.assertEqual(connection.session_id, 'abc')
+            self.assertEqual(connection.sequence, 2)
+            self.assertEqual(await connection.get_event(), ('READY', {'session_id': 'abc'}))
+            self.assertEqual(await connection.get_event(), ('MESSAGE_CREATE', {'content': 'Hi'}))
+
+        anyio.run(main)
+
+    def test_heartbeat(self):
+        async def main():
+            connection = GatewayConnection('token', 'wss://gateway.discord.gg')
+            connection._con = FakeSocket()
+            connection.sequence = 42
+
+            await connection._handle({'op': Opcode.HEARTBEAT, 'd': None})
+            self.assertEqual(connection._con.sent, [{'op': Opcode.HEARTBEAT, 'd': 42}])
+
+            await connection._handle({'op': Opcode.HEARTBEAT_ACK})
+            self.assertIsNotNone(connection.latency)
+
+            await connection._handle({'op': Opcode.RECONNECT})
+            self.assertEqual(connection._con.closed, 4000)
+
+        anyio.run(main)
+
+    def test_compressed_receive(self):
+        async def main():
+            compressor = zlib.compressobj()
+            data = compressor.compress(b'{"op":11,"d":null}')
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+
+            connection = GatewayConnection('token', 'wss://gateway.discord.gg')
+            connection._inflater = ZlibStreamInflater()
+            connection._con = FakeSocket(data[:5], data[5:])
+
+            self.assertEqual(await connection._receive(), {'op': 11, 'd': None})
+
+        anyio.run(main)
+
+    def test_reconnect_backoff(self):
+        async def main():
+            connection = GatewayConnection('token', 'wss://gateway.discord.gg', compress=False)
+            connection._backoff = RecordingPolicy(base=0.01, cap=60.0, jitter=False)
+
+            with mock.patch('clamor.gateway.connection.open_connection',
+                            FakeGateway(connection, 3)):
+                await connection.run()
+
+            # Every connection got ready, so none of them counts as a failure.
+            self.assertEqual(connection._backoff.delays, [0.01] * 3)
+
+        anyio.run(main)
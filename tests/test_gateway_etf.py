@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import unittest
+import zlib
+
+try:
+    from clamor.gateway import etf
+except ImportError:  # anysocks is not installed
+    etf = None
+
+
+@unittest.skipIf(etf is None, 'anysocks is not installed')
+class ETFTests(unittest.TestCase):
+    def test_decode(self):
+        # term_to_binary(#{op => 10, d => #{<<"heartbeat_interval">> => 41250}, s => nil})
+        data = (b'\x83t\x00\x00\x00\x03d\x00\x02opa\nd\x00\x01dt\x00\x00\x00\x01'
+                b'm\x00\x00\x00\x12heartbeat_intervalb\x00\x00\xa1"d\x00\x01sd\x00\x03nil')
+
+        self.assertEqual(etf.decode(data), {
+            'op': 10,
+            'd': {'heartbeat_interval': 41250},
+            's': None,
+        })
+
+    def test_round_trip(self):
+        payload = {
+            'op': 0,
+            't': 'MESSAGE_CREATE',
+            'd': {
+                'id': '543200000000000000',
+                'permissions': 2 ** 53,
+                'content': 'Hällo',
+                'pinned': False,
+                'embeds': [],
+                'nonce': -1234567890123,
+                'score': 0.5,
+            },
+        }
+
+        self.assertEqual(etf.decode(etf.encode(payload)), payload)
+
+    def test_compressed(self):
+        payload = {'op': 0, 't': 'GUILD_CREATE', 'd': {'members': [{'id': '1'}] * 100}}
+
+        # term_to_binary(Term, [compressed])
+        term = etf.encode(payload)[1:]
+        data = b'\x83P' + struct.pack('>I', len(term)) + zlib.compress(term)
+
+        self.assertEqual(etf.decode(data), payload)
+
+    def test_atom_cache_bound(self):
+        count = etf._MAX_ATOMS + 100
+        keys = ['key{}'.format(i) for i in range(count)]
+
+        # A map of distinct atom keys, as a peer could send it.
+        data = b'\x83t' + struct.pack('>I', count)
+        for key in keys:
+            data += b'w' + bytes([len(key)]) + key.encode() + b'a\x01'
+
+        self.assertEqual(sorted(etf.decode(data)), sorted(keys))
+        self.assertLessEqual(len(etf._atoms), etf._MAX_ATOMS)
+
+    def test_malformed(self):
+        with self.assertRaises(ValueError):
+            etf.decode(b'\x82a\x01')
+        with self.assertRaises(ValueError):
+            etf.decode(b'\x83m\x00\x00\x00\x09abc')
+        with self.assertRaises(ValueError):
+            etf.decode(b'\x83\xff')
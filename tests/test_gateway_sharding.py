@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+from unittest import mock
+
+import anyio
+
+try:
+    from clamor.gateway import IdentifyLimiter, ShardManager
+except ImportError:  # anysocks is not installed
+    IdentifyLimiter = ShardManager = None
+
+
+class FakeGateway:
+    async def get_gateway_bot(self):
+        return {
+            'url': 'wss://gateway.discord.gg',
+            'shards': 4,
+            'session_start_limit': {
+                'total': 1000, 'remaining': 1000, 'reset_after': 0, 'max_concurrency': 2},
+        }
+
+
+@unittest.skipIf(IdentifyLimiter is None, 'anysocks is not installed')
+class ShardingTests(unittest.TestCase):
+    def test_identify_concurrency(self):
+        async def main():
+            limiter = IdentifyLimiter(2, interval=0.2)
+            times = {}
+
+            async def identify(shard_id):
+                await limiter.wait(shard_id)
+                times[shard_id] = time.monotonic()
+
+            start = time.monotonic()
+            async with anyio.create_task_group() as tg:
+                for shard_id in range(4):
+                    await tg.spawn(identify, shard_id)
+
+            self.assertLess(times[0] - start, 0.1)
+            self.assertLess(times[1] - start, 0.1)
+            self.assertGreaterEqual(times[2] - start, 0.19)
+            self.assertGreaterEqual(times[3] - start, 0.19)
+
+        anyio.run(main)
+
+    def test_event_fan_in(self):
+        async def main():
+            manager = ShardManager('token', gateway=FakeGateway(), shard_ids=[0, 1])
+
+            async def run(self):
+                await self._events.put(('READY', {'shard': list(self.shard)}))
+                await self._events.put(None)
+
+            with mock.patch('clamor.gateway.connection.GatewayConnection.run', run):
+                async with anyio.create_task_group() as tg:
+                    await tg.spawn(manager.run)
+                    events = []
+                    async for event in manager.events():
+                        events.append(event)
+
+            self.assertEqual(manager.shard_count, 4)
+            self.assertEqual(sorted(events), [
+                (0, 'READY', {'shard': [0, 4]}),
+                (1, 'READY', {'shard': [1, 4]}),
+            ])
+
+        anyio.run(main)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from clamor.models import Guild, Member, Message, Role, User
+
+
+class ModelTests(unittest.TestCase):
+    def test_slots(self):
+        user = User.from_dict({'id': '1', 'username': 'someone', 'discriminator': '0001'})
+
+        self.assertFalse(hasattr(user, '__dict__'))
+        with self.assertRaises(AttributeError):
+            user.nickname = 'someone else'
+
+    def test_conversion(self):
+        member = Member.from_dict({
+            'user': {'id': '80351110224678912', 'username': 'Nelly', 'discriminator': '1337'},
+            'roles': ['41771983423143936', '41771983423143937'],
+            'deaf': False,
+            'unknown': 'dropped',
+        })
+
+        self.assertEqual(member.user.id, 80351110224678912)
+        self.assertEqual(member.roles, (41771983423143936, 41771983423143937))
+        self.assertIsNone(member.nick)
+        self.assertFalse(member.deaf)
+        self.assertEqual(str(member.user), 'Nelly#1337')
+        self.assertNotIn('unknown', member.to_dict())
+
+    def test_interned(self):
+        first, second = (User.from_dict({'id': str(i), 'username': ''.join(['some', 'one'])})
+                         for i in range(2))
+
+        self.assertIs(first.username, second.username)
+
+    def test_lazy(self):
+        guild = Guild.from_dict({'id': '1', 'roles': [{'id': '2', 'name': '@everyone'}]})
+
+        self.assertIsInstance(guild._roles, list)
+        self.assertEqual(guild.roles, (Role.from_dict({'id': '2'}),))
+        self.assertIsInstance(guild._roles, tuple)
+        self.assertIsNone(guild.members)
+
+    def test_nested(self):
+        message = Message.from_dict({
+            'id': '3',
+            'author': {'id': '4', 'username': 'someone'},
+            'mentions': [{'id': '5'}],
+        })
+
+        self.assertEqual(message.author.username, 'someone')
+        self.assertEqual([user.id for user in message.mentions], [5])
+        self.assertEqual(message.to_dict(), {
+            'id': 3,
+            'author': {'id': 4, 'username': 'someone'},
+            'mentions': [{'id': 5}],
+        })
+
+    def test_equality(self):
+        self.assertEqual(User.from_dict({'id': '1'}), User.from_dict({'id': 1, 'bot': True}))
+        self.assertNotEqual(User.from_dict({'id': '1'}), Role.from_dict({'id': '1'}))
+        self.assertEqual(len({User.from_dict({'id': '1'}), User.from_dict({'id': '1'})}), 1)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from functools import partial
+
+import anyio
+
+from clamor import HTTP, BulkExecutor, Routes
+from clamor.exceptions import NotFound
+from clamor.rest.endpoints import GuildWrapper
+from clamor.testing import MockDiscord, MockSession
+
+
+class BulkTests(unittest.TestCase):
+    def test_bulk_executor(self):
+        async def main():
+            api = MockDiscord(bucket_limit=5, bucket_reset=0.05, latency=0.005)
+            http = HTTP('token', session=MockSession(api))
+            guild = GuildWrapper('token', 1, http=http)
+
+            running = peak = 0
+
+            def ban(user_id):
+                async def operation():
+                    nonlocal running, peak
+                    running += 1
+                    peak = max(peak, running)
+                    try:
+                        return await guild.create_guild_ban(user_id, reason='Raid')
+                    finally:
+                        running -= 1
+
+                return operation
+
+            api.respond(Routes.CREATE_GUILD_BAN, lambda request: (
+                (404, {}) if request.params['user'] == '13' else (204, None)))
+
+            progress = []
+            executor = BulkExecutor(http, Routes.CREATE_GUILD_BAN,
+                                    [ban(user_id) for user_id in range(30)], dict(guild=1),
+                                    progress=lambda e: progress.append(e.completed))
+            results = await executor.gather()
+
+            self.assertEqual(sorted(r.index for r in results), list(range(30)))
+            failed = [r for r in results if not r.ok]
+            self.assertEqual([r.index for r in failed], [13])
+            self.assertIsInstance(failed[0].error, NotFound)
+            self.assertEqual((executor.succeeded, executor.failed), (29, 1))
+            self.assertEqual(progress, list(range(1, 31)))
+
+            # The bucket is saturated, but never exceeded.
+            self.assertEqual(peak, 5)
+            self.assertEqual(api.rate_limited, 0)
+
+        anyio.run(main)
+
+    def test_cancel(self):
+        async def main():
+            api = MockDiscord(latency=0.01)
+            http = HTTP('token', session=MockSession(api))
+
+            def operations():
+                for user_id in range(1000):
+                    yield partial(http.make_request, Routes.CREATE_GUILD_BAN,
+                                  dict(guild=1, user=user_id))
+
+            executor = BulkExecutor(http, Routes.CREATE_GUILD_BAN, operations(), dict(guild=1),
+                                    concurrency=2)
+            self.assertIsNone(executor.total)
+
+            results = []
+            async with executor:
+                async for result in executor:
+                    results.append(result)
+                    if len(results) == 3:
+                        await executor.cancel()
+
+            self.assertTrue(executor.cancelled)
+            self.assertLess(len(results), 10)
+            self.assertLess(api.requests, 10)
+
+        anyio.run(main)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import HTTP, RequestCoalescer, Routes
+from clamor.exceptions import NotFound
+from clamor.testing import MockDiscord, MockSession
+
+
+class CoalesceTests(unittest.TestCase):
+    def test_concurrent_gets(self):
+        async def main():
+            api = MockDiscord(latency=0.05)
+            http = HTTP('token', session=MockSession(api))
+            results = []
+
+            async def get(params=None):
+                results.append(await http.make_request(Routes.GET_CHANNEL, dict(channel=1),
+                                                       params=params))
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(5):
+                    await tg.spawn(get)
+                await tg.spawn(get, {'limit': 1})
+
+            self.assertEqual(api.requests, 2)
+            self.assertEqual(len(results), 6)
+            self.assertIs(results[0], results[1])
+            self.assertEqual(http.coalescer.coalesced, 4)
+            self.assertEqual(len(http.coalescer), 0)
+
+            # Completed requests are never reused.
+            await get()
+            self.assertEqual(api.requests, 3)
+
+        anyio.run(main)
+
+    def test_writes_and_disabled(self):
+        async def main():
+            api = MockDiscord(latency=0.05)
+            http = HTTP('token', session=MockSession(api), coalesce=False)
+            self.assertIsNone(http.coalescer)
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(3):
+                    await tg.spawn(http.make_request, Routes.GET_CHANNEL, dict(channel=1))
+                    await tg.spawn(http.make_request, Routes.DELETE_CHANNEL, dict(channel=1))
+
+            self.assertEqual(api.requests, 6)
+
+        anyio.run(main)
+
+    def test_shared_errors(self):
+        async def main():
+            api = MockDiscord(latency=0.05)
+            api.respond(Routes.GET_CHANNEL,
+                        lambda request: (404, {'code': 10003, 'message': 'Unknown Channel'}))
+            http = HTTP('token', session=MockSession(api))
+            errors = []
+
+            async def get():
+                try:
+                    await http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+                except NotFound as error:
+                    errors.append(error)
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(3):
+                    await tg.spawn(get)
+
+            self.assertEqual(api.requests, 1)
+            self.assertEqual(len(errors), 3)
+
+        anyio.run(main)
+
+    def test_cancelled_leader(self):
+        async def main():
+            coalescer = RequestCoalescer()
+            calls = []
+            results = []
+
+            async def request():
+                calls.append(None)
+                await anyio.sleep(0.05)
+                return len(calls)
+
+            async def leader():
+                async with anyio.move_on_after(0.01):
+                    await coalescer.run('key', request)
+
+            async def follower():
+                await anyio.sleep(0.001)
+                results.append(await coalescer.run('key', request))
+
+            async with anyio.create_task_group() as tg:
+                await tg.spawn(leader)
+                await tg.spawn(follower)
+
+            self.assertEqual(results, [2])
+
+        anyio.run(main)
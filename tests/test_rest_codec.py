@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import HTTP, Routes, get_json_codec, json_dumps, json_loads, set_json_codec
+from clamor.testing import MockDiscord, MockSession
+
+
+class CodecTests(unittest.TestCase):
+    def setUp(self):
+        self.codec = get_json_codec()
+
+    def tearDown(self):
+        set_json_codec(self.codec)
+
+    def test_codecs(self):
+        payload = {'content': 'Hällo', 'embeds': [], 'tts': False, 'nonce': None}
+
+        for name in ('orjson', 'ujson', 'rapidjson', 'json'):
+            try:
+                codec = set_json_codec(name)
+            except ImportError:
+                continue
+
+            self.assertEqual(codec.name, name)
+            self.assertIsInstance(json_dumps(payload), bytes)
+            self.assertEqual(json_loads(json_dumps(payload)), payload)
+
+        with self.assertRaises(ValueError):
+            set_json_codec('simplejson')
+
+    def test_stdlib_bytes(self):
+        set_json_codec('json')
+
+        data = '{"content":"Hällo"}'.encode('utf-8')
+        self.assertEqual(json_loads(data), {'content': 'Hällo'})
+        self.assertEqual(json_loads(bytearray(data)), {'content': 'Hällo'})
+        self.assertEqual(json_loads(data.decode('utf-8')), {'content': 'Hällo'})
+
+    def test_request_body(self):
+        async def main():
+            api = MockDiscord()
+            api.respond(Routes.CREATE_MESSAGE, {'id': '1'})
+            http = HTTP('token', session=MockSession(api))
+
+            data = await http.make_request(Routes.CREATE_MESSAGE, dict(channel=1),
+                                           json={'content': 'Hi'})
+            self.assertEqual(data, {'id': '1'})
+
+            # The body was encoded by the codec rather than by asks.
+            request = api.history[0]
+            self.assertEqual(json_loads(request.body), {'content': 'Hi'})
+            self.assertEqual(request.headers['Content-Type'], 'application/json')
+
+        anyio.run(main)
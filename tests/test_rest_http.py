@@ -5,7 +5,14 @@ import unittest
 
 import anyio
 
-from clamor import __url__, __version__, HTTP, Routes
+from clamor import __url__, __version__, HTTP, RetryPolicy, Routes
+from clamor.exceptions import RequestFailed
+from clamor.testing import MockDiscord, MockServer, MockSession
+
+
+def replies(*responses):
+    responses = list(responses)
+    return lambda request: responses.pop(0)
 
 
 class HTTPTests(unittest.TestCase):
@@ -38,15 +45,74 @@ class HTTPTests(unittest.TestCase):
         self.assertEqual(route[0].value.lower(), 'post')
         self.assertIsInstance(route[1], str)
 
-    def test_http_request(self):
+    def test_retry_after(self):
         async def main():
-            http = HTTP('secret')
-            self.assertIsInstance(http, HTTP)
+            api = MockDiscord()
+            api.respond(Routes.GET_GATEWAY, replies(
+                (429, {'retry_after': 10}, {'Retry-After': '10'}),
+                (200, {'url': 'wss://gateway.discord.gg'}),
+            ))
+            http = HTTP('secret', session=MockSession(api))
 
             resp = await http.make_request(Routes.GET_GATEWAY)
-            self.assertIsInstance(resp, dict)
             self.assertEqual(resp['url'], 'wss://gateway.discord.gg')
+            self.assertEqual(api.requests, 2)
+
+        anyio.run(main)
+
+    def test_retry_policy_per_route(self):
+        async def main():
+            api = MockDiscord()
+            api.respond(Routes.GET_GATEWAY, lambda request: (502, {}))
+            http = HTTP('secret', session=MockSession(api))
+            http.retry_policies[Routes.GET_GATEWAY] = RetryPolicy(max_retries=2, base=0.001)
+
+            with self.assertRaises(RequestFailed):
+                await http.make_request(Routes.GET_GATEWAY)
+
+            # The initial attempt and two retries.
+            self.assertEqual(api.requests, 3)
+
+        anyio.run(main)
+
+    def test_reason_header(self):
+        async def main():
+            api = MockDiscord()
+            http = HTTP('secret', session=MockSession(api))
+
+            await http.make_request(Routes.DELETE_CHANNEL, dict(channel=1234), reason='spam')
+            await http.make_request(Routes.DELETE_CHANNEL, dict(channel=1234))
+
+            self.assertEqual(api.history[0].headers['X-Audit-Log-Reason'], 'spam')
+            self.assertNotIn('X-Audit-Log-Reason', api.history[1].headers)
+            self.assertNotIn('X-Audit-Log-Reason', http.headers)
+
+        anyio.run(main)
+
+    def test_backoff(self):
+        policy = RetryPolicy(base=1.0, cap=4.0, jitter=False)
+        self.assertEqual([policy.backoff(i) for i in range(4)], [1.0, 2.0, 4.0, 4.0])
+
+        policy.jitter = True
+        for i in range(10):
+            self.assertLessEqual(policy.backoff(i), 4.0)
+
+    def test_http_request(self):
+        async def main():
+            server = MockServer(MockDiscord())
+
+            async with anyio.create_task_group() as tg:
+                await tg.spawn(server.serve)
+                await server.wait_listening()
+
+                http = HTTP('secret', base_url=server.base_url)
+                self.assertIsInstance(http, HTTP)
+
+                resp = await http.make_request(Routes.GET_GATEWAY)
+                self.assertIsInstance(resp, dict)
+                self.assertEqual(resp['url'], 'wss://gateway.discord.gg')
 
-            await http.close()
+                await http.close()
+                await tg.cancel_scope.cancel()
 
         anyio.run(main)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import (HTTP, Histogram, Metrics, OpenMetricsExporter, RequestMetrics, RetryPolicy,
+                    Routes)
+from clamor.testing import MockDiscord, MockSession
+
+
+class MetricsTests(unittest.TestCase):
+    def test_histogram(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(list(histogram.cumulative()),
+                         [(0.1, 2), (1.0, 3), (float('inf'), 4)])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+    def test_disabled_by_default(self):
+        http = HTTP('token')
+        self.assertIs(type(http.metrics), Metrics)
+        self.assertFalse(http.metrics.enabled)
+
+    def test_request_metrics(self):
+        async def main():
+            api = MockDiscord(bucket_limit=2, bucket_reset=0.05)
+            metrics = RequestMetrics()
+            http = HTTP('token', session=MockSession(api), metrics=metrics,
+                        retry_policy=RetryPolicy(3, base=0.0))
+            self.assertIs(http.rate_limiter.metrics, metrics)
+
+            for _ in range(3):
+                await http.make_request(Routes.CREATE_MESSAGE, dict(channel=1),
+                                        json={'content': 'Hi'})
+
+            responses = [(502, {}), (200, {'id': '1'})]
+            api.respond(Routes.GET_CHANNEL, lambda request: responses.pop(0))
+            await http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+
+            # The first request is tracked by route until the bucket hash is known.
+            probe = metrics.bucket(('POST', '/channels/1/messages'))
+            messages = metrics.bucket(
+                http.rate_limiter.bucket_for(Routes.CREATE_MESSAGE, dict(channel=1)))
+            self.assertEqual(probe.responses, {('POST', 200): 1})
+            self.assertEqual(messages.responses, {('POST', 200): 2})
+            self.assertEqual(messages.bytes_sent, 2 * len(b'{"content":"Hi"}'))
+            self.assertGreater(messages.bytes_received, 0)
+            self.assertEqual(messages.latency.count, 2)
+            self.assertEqual(messages.queue_wait.count, 2)
+            self.assertEqual(messages.parse.count, 2)
+
+            # The third message had to wait for the bucket to reset.
+            self.assertEqual(messages.cooldown.count, 1)
+
+            channel = metrics.bucket(('GET', '/channels/1'))
+            self.assertEqual(channel.responses, {('GET', 502): 1})
+            self.assertEqual(channel.retries, {502: 1})
+            channel = metrics.bucket(
+                http.rate_limiter.bucket_for(Routes.GET_CHANNEL, dict(channel=1)))
+            self.assertEqual(channel.responses, {('GET', 200): 1})
+
+        anyio.run(main)
+
+    def test_openmetrics(self):
+        metrics = RequestMetrics(bounds=(1.0,))
+        metrics.record_request(('GET', '/channels/1'), 'GET', 200, 0.5, 0, 10)
+        metrics.record_cooldown(None, 2.0)
+
+        lines = OpenMetricsExporter(metrics).render().splitlines()
+        self.assertIn('# TYPE clamor_http_requests counter', lines)
+        self.assertIn(
+            'clamor_http_requests_total{bucket="GET /channels/1",method="GET",status="200"} 1',
+            lines)
+        self.assertIn('clamor_http_received_bytes_total{bucket="GET /channels/1"} 10', lines)
+        self.assertIn('clamor_http_latency_seconds_bucket{bucket="GET /channels/1",le="1.0"} 1',
+                      lines)
+        self.assertIn('clamor_http_latency_seconds_sum{bucket="GET /channels/1"} 0.5', lines)
+        self.assertIn('clamor_http_cooldown_seconds_bucket{bucket="global",le="+Inf"} 1', lines)
+        self.assertEqual(lines[-1], '# EOF')
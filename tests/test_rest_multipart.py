@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import anyio
+
+from clamor import HTTP, MultipartBody, Routes
+from clamor.rest.endpoints import ChannelWrapper
+from clamor.rest.multipart import CHUNK_SIZE
+from clamor.testing import MockDiscord, MockServer, MockSession
+
+
+class Chunks:
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+
+def parts(body: bytes, boundary: str) -> list:
+    delimiter = b'--' + boundary.encode()
+    assert body.endswith(delimiter + b'--\r\n')
+
+    result = []
+    for part in body.split(delimiter)[1:-1]:
+        headers, _, content = part[2:-2].partition(b'\r\n\r\n')
+        result.append((headers.decode(), content))
+
+    return result
+
+
+class MultipartTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.png')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(3 * CHUNK_SIZE + 17))
+
+        with open(self.path, 'rb') as f:
+            self.content = f.read()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_sources(self):
+        async def main():
+            body = MultipartBody()
+            body.add_field('payload_json', '{}', 'application/json')
+            body.add_file('file0', 'image.png', self.path)
+            body.add_file('file1', 'notes.txt', io.BytesIO(b'Notes'))
+            body.add_file('file2', 'empty.bin', b'')
+
+            data = await body.read()
+            self.assertEqual(len(data), body.content_length)
+            self.assertEqual(body.content_type,
+                             'multipart/form-data; boundary=' + body.boundary)
+
+            (field, payload), (image, content), (notes, text), (_, empty) = \
+                parts(data, body.boundary)
+            self.assertIn('name="payload_json"', field)
+            self.assertEqual(payload, b'{}')
+            self.assertIn('filename="image.png"', image)
+            self.assertIn('Content-Type: image/png', image)
+            self.assertEqual(content, self.content)
+            self.assertIn('Content-Type: text/plain', notes)
+            self.assertEqual(text, b'Notes')
+            self.assertEqual(empty, b'')
+
+            # Bodies can be sent again, e.g. for retries.
+            self.assertEqual(await body.read(), data)
+
+            # Files are read in chunks instead of all at once.
+            chunks = []
+            async for chunk in body:
+                chunks.append(chunk)
+            self.assertLessEqual(max(map(len, chunks)), CHUNK_SIZE)
+
+        anyio.run(main)
+
+    def test_async_iterator(self):
+        async def main():
+            body = MultipartBody()
+            body.add_file('file', 'stream.bin', Chunks(b'ab', b'', b'cd'))
+            self.assertIsNone(body.content_length)
+
+            (_, content), = parts(await body.read(), body.boundary)
+            self.assertEqual(content, b'abcd')
+
+            with self.assertRaises(RuntimeError):
+                await body.read()
+
+        anyio.run(main)
+
+    def test_create_message(self):
+        async def main():
+            api = MockDiscord()
+            requests = []
+
+            def create_message(request):
+                requests.append(request)
+                return {'id': '1'}
+
+            api.respond(Routes.CREATE_MESSAGE, create_message)
+
+            http = HTTP('token', session=MockSession(api))
+            channel = ChannelWrapper('token', 1, http=http)
+            await channel.create_message('Hello', files=[('a.txt', b'A'), self.path])
+
+            request = requests[0]
+            boundary = request.headers['Content-Type'].partition('boundary=')[2]
+            (_, payload), (first, a), (second, content) = parts(request.body, boundary)
+            self.assertEqual(json.loads(payload.decode())['content'], 'Hello')
+            self.assertIn('name="file0"; filename="a.txt"', first)
+            self.assertEqual(a, b'A')
+            self.assertIn('name="file1"; filename="{}"'.format(os.path.basename(self.path)),
+                          second)
+            self.assertEqual(content, self.content)
+
+        anyio.run(main)
+
+    def test_stream_request(self):
+        async def main():
+            api = MockDiscord()
+            requests = []
+
+            def execute_webhook(request):
+                requests.append(request)
+                return {'id': '1'}
+
+            api.respond(Routes.EXECUTE_WEBHOOK, execute_webhook)
+            server = MockServer(api)
+
+            async with anyio.create_task_group() as tg:
+                await tg.spawn(server.serve)
+                await server.wait_listening()
+
+                http = HTTP('token', base_url=server.base_url)
+
+                body = MultipartBody()
+                body.add_file('file', 'stream.bin', Chunks(b'ab', b'cd'))
+                response = await http.make_request(Routes.EXECUTE_WEBHOOK,
+                                                   dict(webhook=1, token='secret'),
+                                                   data=body, params={'wait': True})
+                self.assertEqual(response, {'id': '1'})
+
+                await http.close()
+                await tg.cancel_scope.cancel()
+
+            request = requests[0]
+            self.assertEqual(request.query, {'wait': 'True'})
+            self.assertEqual(request.headers['Transfer-Encoding'], 'chunked')
+            (_, content), = parts(request.body, body.boundary)
+            self.assertEqual(content, b'abcd')
+
+        anyio.run(main)
+
+    def test_upload_limits(self):
+        async def main():
+            api = MockDiscord(latency=0.05)
+            server = MockServer(api)
+
+            async def upload(http):
+                body = MultipartBody()
+                body.add_file('file', 'a.txt', b'A')
+                await http.make_request(Routes.CREATE_MESSAGE, dict(channel=1), data=body)
+
+            async with anyio.create_task_group() as tg:
+                await tg.spawn(server.serve)
+                await server.wait_listening()
+
+                # Uploads share the connection limit of the session.
+                http = HTTP('token', base_url=server.base_url, connections=1)
+                started = time.monotonic()
+                async with anyio.create_task_group() as uploads:
+                    for _ in range(3):
+                        await uploads.spawn(upload, http)
+                self.assertGreaterEqual(time.monotonic() - started, 0.15)
+                await http.close()
+
+                http = HTTP('token', base_url=server.base_url, upload_timeout=0.01)
+                with self.assertRaises(TimeoutError):
+                    await upload(http)
+                await http.close()
+
+                # Let the server finish the abandoned request first.
+                await anyio.sleep(0.1)
+                await tg.cancel_scope.cancel()
+
+        anyio.run(main)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import Paginator
+
+
+class FakeChannel:
+    def __init__(self, count: int):
+        self.messages = [{'id': str(i)} for i in range(1, count + 1)]
+        self.requests = 0
+
+    async def fetch_before(self, cursor, size):
+        self.requests += 1
+        cursor = int(cursor) if cursor is not None else len(self.messages) + 1
+        page = [m for m in self.messages if int(m['id']) < cursor][-size:]
+        return list(reversed(page))
+
+    async def fetch_after(self, cursor, size):
+        self.requests += 1
+        cursor = int(cursor) if cursor is not None else 0
+        # The API returns pages in descending order anyway.
+        return list(reversed([m for m in self.messages if int(m['id']) > cursor][:size]))
+
+
+class PaginatorTests(unittest.TestCase):
+    def test_before(self):
+        async def main():
+            channel = FakeChannel(250)
+            messages = await Paginator(channel.fetch_before).flatten()
+
+            self.assertEqual([int(m['id']) for m in messages], list(range(250, 0, -1)))
+            self.assertEqual(channel.requests, 3)
+
+        anyio.run(main)
+
+    def test_after(self):
+        async def main():
+            channel = FakeChannel(250)
+            messages = await Paginator(channel.fetch_after, after=True, cursor=50).flatten()
+
+            self.assertEqual([int(m['id']) for m in messages], list(range(51, 251)))
+
+        anyio.run(main)
+
+    def test_limit(self):
+        async def main():
+            channel = FakeChannel(1000)
+            messages = await Paginator(channel.fetch_before, limit=150).flatten()
+
+            self.assertEqual(len(messages), 150)
+            self.assertEqual(channel.requests, 2)
+
+        anyio.run(main)
+
+    def test_predicate(self):
+        async def main():
+            channel = FakeChannel(1000)
+            paginator = Paginator(channel.fetch_before, predicate=lambda m: int(m['id']) > 900)
+            messages = await paginator.flatten()
+
+            self.assertEqual(len(messages), 100)
+
+        anyio.run(main)
+
+    def test_prefetch(self):
+        async def main():
+            channel = FakeChannel(1000)
+            count = 0
+
+            async with Paginator(channel.fetch_before, limit=350) as messages:
+                async for _ in messages:
+                    count += 1
+
+                # Stopping early must not cancel the rest of the block.
+                await anyio.sleep(0.01)
+
+            self.assertEqual(count, 350)
+            self.assertLessEqual(channel.requests, 4)
+
+        anyio.run(main)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import HTTPPool
+from clamor.rest.endpoints import ChannelWrapper, GuildWrapper
+
+
+class HTTPPoolTests(unittest.TestCase):
+    def test_shared_client(self):
+        async def main():
+            pool = HTTPPool()
+
+            channel = ChannelWrapper('secret', 1234, pool=pool)
+            guild = GuildWrapper('secret', 5678, pool=pool)
+            self.assertIs(channel.http, guild.http)
+            self.assertIs(channel.http.rate_limiter, guild.http.rate_limiter)
+
+            other = ChannelWrapper('other secret', 1234, pool=pool)
+            self.assertIsNot(channel.http, other.http)
+            self.assertEqual(len(pool), 2)
+
+            await pool.close()
+            self.assertEqual(len(pool), 0)
+
+        anyio.run(main)
+
+    def test_explicit_client(self):
+        async def main():
+            pool = HTTPPool()
+            http = pool.get('secret')
+
+            channel = ChannelWrapper('secret', 1234, http=http)
+            self.assertIs(channel.http, http)
+
+            await pool.close()
+
+        anyio.run(main)
+
+    def test_conflicting_options(self):
+        async def main():
+            pool = HTTPPool()
+            http = pool.get('secret', connections=5)
+
+            self.assertIs(pool.get('secret'), http)
+            self.assertIs(pool.get('secret', connections=5), http)
+            with self.assertRaises(ValueError):
+                pool.get('secret', connections=20)
+
+            await pool.release('secret')
+            self.assertIsNot(pool.get('secret', connections=20), http)
+
+            await pool.close()
+
+        anyio.run(main)
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import os
+import tempfile
+import time
 import unittest
 from datetime import datetime, timezone
 from email.utils import format_datetime
@@ -7,7 +10,12 @@ from random import randint
 
 import anyio
 
-from clamor import RateLimiter
+from clamor import GlobalLimit, RateLimiter, Routes
+
+
+class FakeResponse:
+    def __init__(self, headers: dict):
+        self.headers = headers
 
 
 class RateLimitTests(unittest.TestCase):
@@ -17,13 +25,13 @@ class RateLimitTests(unittest.TestCase):
             self.assertIsInstance(limiter, RateLimiter)
 
             # Hack a fake response object.
-            response = object()
-            response.headers = {
+            response = FakeResponse({
                 'Date': format_datetime(datetime.now(timezone.utc)),
                 'X-RateLimit-Remaining': randint(1, 10),
                 # 2 minutes in the future.
                 'X-RateLimit-Reset': datetime.now(timezone.utc).timestamp() + (2 * 60),
-            }
+                'X-RateLimit-Reset-After': 0.1,
+            })
 
             bucket = ('POST', '/random')
 
@@ -33,7 +41,8 @@ class RateLimitTests(unittest.TestCase):
 
                 # The loop is supposed to be interrupted
                 # before this is no longer true.
-                self.assertGreaterEqual(limiter.buckets[bucket]._remaining, 0)
+                if bucket in limiter.buckets:
+                    self.assertGreaterEqual(limiter.buckets[bucket]._remaining, 0)
 
                 # Update headers
                 response.headers['Date'] = format_datetime(datetime.now(timezone.utc))
@@ -42,4 +51,166 @@ class RateLimitTests(unittest.TestCase):
                 # Update the limiter
                 await limiter.update_bucket(bucket, response)
 
-            anyio.run(main)
+        anyio.run(main)
+
+    def test_monotonic_cooldown(self):
+        async def main():
+            limiter = RateLimiter()
+            bucket = ('GET', '/random')
+
+            # The Date header is far off, but only the relative reset matters.
+            await limiter.update_bucket(bucket, FakeResponse({
+                'Date': format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc)),
+                'X-RateLimit-Limit': '5',
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset': '946684801.250',
+                'X-RateLimit-Reset-After': '0.250',
+            }))
+
+            cooldown_bucket = limiter.buckets[bucket]
+            self.assertTrue(cooldown_bucket.will_rate_limit)
+            self.assertLessEqual(cooldown_bucket.reset_after, 0.25)
+
+            start = time.monotonic()
+            await limiter.cooldown_bucket(bucket)
+            elapsed = time.monotonic() - start
+
+            self.assertGreaterEqual(elapsed, 0.2)
+            self.assertLess(elapsed, 0.5)
+            self.assertFalse(cooldown_bucket.will_rate_limit)
+
+        anyio.run(main)
+
+    def test_proactive_reservation(self):
+        async def main():
+            limiter = RateLimiter()
+            self.assertTrue(limiter.proactive)
+
+            bucket = ('POST', '/random')
+            server = {
+                'remaining': 3,
+                'reset': int(datetime.now(timezone.utc).timestamp()) + 1,
+                'concurrent': 0,
+                'peak': 0,
+            }
+
+            def respond():
+                now = datetime.now(timezone.utc)
+                if now.timestamp() >= server['reset']:
+                    server['remaining'] = 3
+                    server['reset'] = int(now.timestamp()) + 1
+
+                # Nobody may get past an exhausted bucket.
+                self.assertGreaterEqual(server['remaining'], 1)
+                server['remaining'] -= 1
+
+                return FakeResponse({
+                    'Date': format_datetime(now),
+                    'X-RateLimit-Limit': '3',
+                    'X-RateLimit-Remaining': str(server['remaining']),
+                    'X-RateLimit-Reset': str(server['reset']),
+                })
+
+            async def request():
+                async with limiter(bucket):
+                    server['concurrent'] += 1
+                    server['peak'] = max(server['peak'], server['concurrent'])
+                    await anyio.sleep(0.01)
+                    server['concurrent'] -= 1
+
+                    await limiter.update_bucket(bucket, respond())
+
+            # The first request discovers the limits of the bucket.
+            await request()
+            self.assertEqual(limiter.buckets[bucket].inflight, 0)
+
+            # Two slots are left, the other requests have to wait for the reset.
+            async with anyio.create_task_group() as tg:
+                for _ in range(4):
+                    await tg.spawn(request)
+
+            self.assertEqual(server['peak'], 2)
+            self.assertEqual(limiter.buckets[bucket].inflight, 0)
+
+        anyio.run(main)
+
+    def test_bucket_hashes(self):
+        async def main():
+            limiter = RateLimiter()
+
+            def respond(remaining: int):
+                return FakeResponse({
+                    'X-RateLimit-Bucket': 'abcd',
+                    'X-RateLimit-Limit': '5',
+                    'X-RateLimit-Remaining': str(remaining),
+                    'X-RateLimit-Reset': '1470173023.123',
+                    'X-RateLimit-Reset-After': '1.5',
+                })
+
+            # Minor parameters don't split buckets, major parameters do.
+            get = limiter.bucket_for(Routes.GET_CHANNEL_MESSAGE, dict(channel=1, message=2))
+            self.assertEqual(get, ('GET', '/channels/1/messages/{message}'))
+
+            async with limiter(get):
+                await limiter.update_bucket(get, respond(4),
+                                            Routes.GET_CHANNEL_MESSAGE,
+                                            dict(channel=1, message=2))
+
+            self.assertNotIn(get, limiter.buckets)
+            self.assertIn(('abcd', '1'), limiter.buckets)
+
+            # Another route in the same bucket shares its state once it's known.
+            limiter.bucket_hashes['GET /channels/{channel}/messages'] = 'abcd'
+            messages = limiter.bucket_for(Routes.GET_CHANNEL_MESSAGES, dict(channel=1))
+            self.assertEqual(messages, ('abcd', '1'))
+
+            other = limiter.bucket_for(Routes.GET_CHANNEL_MESSAGES, dict(channel=3))
+            self.assertEqual(other, ('abcd', '3'))
+
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'buckets.json')
+                limiter.save_bucket_hashes(path)
+
+                restored = RateLimiter()
+                restored.load_bucket_hashes(path)
+                self.assertEqual(restored.bucket_hashes, limiter.bucket_hashes)
+
+        anyio.run(main)
+
+    def test_global_limit(self):
+        limit = GlobalLimit(50)
+
+        # A full second worth of requests passes immediately.
+        self.assertEqual([limit.reserve() for _ in range(50)], [0.0] * 50)
+
+        # The next ones have to wait for their share of the refill.
+        first, second = limit.reserve(), limit.reserve()
+        self.assertGreater(first, 0.0)
+        self.assertAlmostEqual(second - first, 1 / 50, places=2)
+
+        # A limit imposed by the API makes everyone wait.
+        limit = GlobalLimit(0)
+        self.assertEqual(limit.reserve(), 0.0)
+        limit.limit(0.5)
+        self.assertTrue(limit.is_limited)
+        self.assertGreater(limit.reserve(), 0.4)
+
+    def test_global_rate_limit_response(self):
+        async def main():
+            limiter = RateLimiter()
+            bucket = ('GET', '/random')
+
+            start = time.monotonic()
+            await limiter.update_bucket(bucket, FakeResponse({
+                'X-RateLimit-Global': 'true',
+                'Retry-After': '100',
+            }))
+
+            # Updating doesn't block, only the next request waits.
+            self.assertLess(time.monotonic() - start, 0.05)
+            self.assertTrue(limiter.global_limit.is_limited)
+
+            async with limiter(bucket):
+                self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+        anyio.run(main)
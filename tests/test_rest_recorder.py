@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import HTTP, ResponseRecorder, Routes
+from clamor.testing import MockDiscord, MockSession
+
+
+class FakeResponse:
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+class ResponseRecorderTests(unittest.TestCase):
+    def test_disabled_by_default(self):
+        recorder = ResponseRecorder()
+        self.assertFalse(recorder.enabled)
+
+        recorder.add(FakeResponse(b'{}'))
+        self.assertIsNone(recorder.current)
+
+    def test_capacity(self):
+        recorder = ResponseRecorder()
+
+        with recorder.record(capacity=3) as responses:
+            for i in range(10):
+                recorder.add(FakeResponse(str(i).encode()))
+
+            self.assertEqual(len(responses), 3)
+            self.assertEqual([r.body for r in responses], [b'7', b'8', b'9'])
+            self.assertEqual(responses.dropped, 7)
+
+        self.assertFalse(recorder.enabled)
+
+    def test_byte_budget(self):
+        recorder = ResponseRecorder()
+
+        with recorder.record(capacity=100, max_bytes=10) as responses:
+            for _ in range(5):
+                recorder.add(FakeResponse(b'1234'))
+
+            self.assertEqual(len(responses), 2)
+            self.assertLessEqual(responses.nbytes, 10)
+
+            # Responses bigger than the budget are never recorded.
+            recorder.add(FakeResponse(b'x' * 11))
+            self.assertEqual(len(responses), 2)
+
+    def test_sampling(self):
+        recorder = ResponseRecorder()
+
+        with recorder.record(sample_rate=0.0) as responses:
+            recorder.add(FakeResponse(b'{}'))
+            self.assertEqual(len(responses), 0)
+
+    def test_nested_scopes(self):
+        recorder = ResponseRecorder()
+
+        with recorder.record() as outer:
+            recorder.add(FakeResponse(b'a'))
+
+            with recorder.record() as inner:
+                recorder.add(FakeResponse(b'b'))
+                self.assertIs(recorder.current, inner)
+
+            self.assertIs(recorder.current, outer)
+
+        self.assertEqual(len(outer), 2)
+        self.assertEqual(len(inner), 1)
+
+    def test_http_responses(self):
+        async def main():
+            http = HTTP('token', session=MockSession(MockDiscord()))
+            self.assertEqual(http.responses, ())
+
+            with http.recorder.record():
+                # The recording is returned before it has any responses.
+                responses = http.responses
+                self.assertIs(responses, http.recorder.current)
+
+                await http.make_request(Routes.GET_GATEWAY)
+                self.assertEqual(len(responses), 1)
+
+        anyio.run(main)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest
+
+from clamor import RequestLogger, TruncatedBody
+
+
+class FakeResponse:
+    method = 'GET'
+    url = 'https://discordapp.com/api/v7/guilds/1/members'
+    status_code = 200
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+class ExplodingResponse:
+    @property
+    def body(self):
+        raise AssertionError('The response should not have been touched')
+
+
+class RequestLoggerTests(unittest.TestCase):
+    def test_truncation(self):
+        self.assertEqual(str(TruncatedBody(b'abcdef', 3)), 'abc... (3 more bytes)')
+        self.assertEqual(str(TruncatedBody(b'abc', 3)), 'abc')
+        self.assertEqual(str(TruncatedBody(b'abcdef', None)), 'abcdef')
+
+    def test_disabled(self):
+        logger = logging.getLogger('clamor.tests.request_log.disabled')
+        logger.setLevel(logging.INFO)
+
+        request_logger = RequestLogger(logger)
+        self.assertFalse(request_logger.enabled)
+
+        request_logger.success(('GET', '/guilds/1/members'), ExplodingResponse())
+        request_logger.failure(('GET', '/guilds/1/members'), ExplodingResponse())
+
+    def test_structured(self):
+        logger = logging.getLogger('clamor.tests.request_log.enabled')
+        logger.setLevel(logging.DEBUG)
+
+        request_logger = RequestLogger(logger, body_limit=10)
+
+        with self.assertLogs(logger, logging.DEBUG) as logs:
+            request_logger.success(('GET', '/guilds/1/members'), FakeResponse(b'x' * 100))
+
+        record, = logs.records
+        self.assertIn('xxxxxxxxxx... (90 more bytes)', record.getMessage())
+        self.assertEqual(record.clamor_request['status'], 200)
+        self.assertEqual(record.clamor_request['size'], 100)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+
+import anyio
+
+from clamor import HTTP, CachedResponse, MemoryBackend, ResponseCache, Routes, SQLiteBackend
+from clamor.testing import MockDiscord, MockSession
+
+BASE = HTTP.BASE_URL
+
+
+def replies(*responses):
+    responses = list(responses)
+    return lambda request: responses.pop(0)
+
+
+class BackendTests(unittest.TestCase):
+    def check_backend(self, backend):
+        for key, url in (('a', BASE + '/guilds/1'), ('b', BASE + '/guilds/1/emojis'),
+                         ('c', BASE + '/guilds/12'), ('d', BASE + '/guilds')):
+            backend.set(key, CachedResponse(url, b'[]', 'application/json', None, 0.0))
+
+        self.assertEqual(backend.get('a').body, b'[]')
+
+        backend.invalidate(BASE + '/guilds', recursive=False)
+        self.assertIsNone(backend.get('d'))
+        self.assertIsNotNone(backend.get('a'))
+
+        backend.invalidate(BASE + '/guilds/1')
+        self.assertIsNone(backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+        self.assertIsNotNone(backend.get('c'))
+
+        backend.clear()
+        self.assertIsNone(backend.get('c'))
+
+    def test_memory(self):
+        self.check_backend(MemoryBackend())
+
+        backend = MemoryBackend(max_size=1)
+        backend.set('a', CachedResponse('a', b'', '', None, 0.0))
+        backend.set('b', CachedResponse('b', b'', '', None, 0.0))
+        self.assertIsNone(backend.get('a'))
+
+        # Evicted and replaced responses leave the URL index as well.
+        backend.invalidate('b')
+        backend.set('a', CachedResponse(BASE + '/guilds/1', b'', '', None, 0.0))
+        backend.set('a', CachedResponse(BASE + '/users/1', b'', '', None, 0.0))
+        backend.invalidate(BASE + '/guilds')
+        self.assertIsNotNone(backend.get('a'))
+        backend.invalidate(BASE + '/users')
+        self.assertEqual(len(backend), 0)
+
+    def test_sqlite(self):
+        backend = SQLiteBackend(':memory:')
+        self.check_backend(backend)
+        backend.close()
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.api = MockDiscord()
+        self.http = HTTP('token', session=MockSession(self.api))
+
+    def test_route_ttl(self):
+        async def main():
+            self.api.respond(Routes.LIST_VOICE_REGIONS,
+                             replies((200, [{'id': 'us-east'}]), (200, [{'id': 'us-west'}])))
+
+            first = await self.http.make_request(Routes.LIST_VOICE_REGIONS)
+            second = await self.http.make_request(Routes.LIST_VOICE_REGIONS)
+            self.assertEqual(first, second)
+            self.assertIsNot(first, second)
+            self.assertEqual(self.api.requests, 1)
+            self.assertEqual(self.http.response_cache.hits, 1)
+
+        anyio.run(main)
+
+    def test_uncached_routes(self):
+        async def main():
+            self.api.respond(Routes.GET_CHANNEL, replies(
+                (200, {'id': '1'}), (200, {'id': '1'}),
+                (200, {'id': '1'}, {'Cache-Control': 'no-store'}), (200, {'id': '1'})))
+
+            for _ in range(2):
+                await self.http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+
+            ttls = {Routes.GET_CHANNEL: 60.0}
+            http = HTTP('token', session=MockSession(self.api),
+                        response_cache=ResponseCache(ttls=ttls))
+            for _ in range(2):
+                await http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+
+            self.assertEqual(self.api.requests, 4)
+
+        anyio.run(main)
+
+    def test_revalidation(self):
+        async def main():
+            self.api.respond(Routes.GET_CHANNEL, replies(
+                (200, {'id': '1'}, {'ETag': '"v1"'}),
+                (304, None, {'Cache-Control': 'max-age=60'}),
+                (200, {'id': '2'})))
+
+            await self.http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+            data = await self.http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+            self.assertEqual(data, {'id': '1'})
+            self.assertEqual(self.api.history[1].headers['If-None-Match'], '"v1"')
+
+            # Revalidated for another minute.
+            data = await self.http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+            self.assertEqual(data, {'id': '1'})
+            self.assertEqual(self.api.requests, 2)
+
+        anyio.run(main)
+
+    def test_invalidation(self):
+        async def main():
+            self.api.respond(Routes.LIST_GUILD_EMOJIS, replies((200, []), (200, [{'id': '1'}])))
+            fmt = dict(guild=1)
+
+            await self.http.make_request(Routes.LIST_GUILD_EMOJIS, fmt)
+            await self.http.make_request(Routes.CREATE_GUILD_EMOJI, fmt, json={'name': 'e'})
+            emojis = await self.http.make_request(Routes.LIST_GUILD_EMOJIS, fmt)
+
+            self.assertEqual(emojis, [{'id': '1'}])
+            self.assertEqual(self.api.requests, 3)
+
+        anyio.run(main)
+
+    def test_expiry(self):
+        cache = ResponseCache()
+        cache.backend.set('key', CachedResponse('url', b'', '', None, time.time() - 1))
+
+        self.assertIsNone(cache.lookup('key'))
+        self.assertEqual(cache.misses, 1)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import HTTP, RetryPolicy, Routes, TraceConfig
+from clamor.exceptions import NotFound
+from clamor.testing import MockDiscord, MockSession
+
+
+class TracingTests(unittest.TestCase):
+    def test_trace_phases(self):
+        async def main():
+            started, ended = [], []
+
+            async def on_request_start(http, trace):
+                self.assertIsNone(trace.rate_limit_acquired)
+                trace.context['span'] = len(started)
+                started.append(trace)
+
+            async def on_request_end(http, trace):
+                ended.append(trace)
+
+            config = TraceConfig()
+            config.on_request_start.append(on_request_start)
+            config.on_request_end.append(on_request_end)
+
+            api = MockDiscord(latency=0.01)
+            http = HTTP('token', session=MockSession(api), trace_configs=[config],
+                        retry_policy=RetryPolicy(3, base=0.0))
+
+            responses = [(502, {}), (200, {'id': '1'})]
+            api.respond(Routes.GET_CHANNEL, lambda request: responses.pop(0))
+            await http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+
+            # Every attempt is traced on its own.
+            self.assertEqual(started, ended)
+            self.assertEqual([(t.attempt, t.status) for t in ended], [(0, 502), (1, 200)])
+
+            trace = ended[1]
+            self.assertEqual(trace.context, {'span': 1})
+            self.assertEqual((trace.method, trace.route), ('GET', Routes.GET_CHANNEL))
+            self.assertTrue(trace.enqueued <= trace.rate_limit_acquired <=
+                            trace.response_received <= trace.parse_completed)
+            self.assertGreaterEqual(trace.send_time, 0.01)
+            self.assertAlmostEqual(trace.duration,
+                                   trace.queue_time + trace.send_time + trace.parse_time)
+            self.assertIsNone(trace.error)
+
+            api.respond(Routes.GET_USER, lambda request: (404, {}))
+            with self.assertRaises(NotFound):
+                await http.make_request(Routes.GET_USER, dict(user=1))
+
+            self.assertIsInstance(ended[-1].error, NotFound)
+            self.assertEqual(ended[-1].status, 404)
+
+        anyio.run(main)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import anyio
+
+from clamor import Snowflake, snowflake_array, snowflake_timestamps, snowflakes_between
+from clamor.rest.endpoints import ChannelWrapper
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SnowflakeTests(unittest.TestCase):
+    def test_accessors(self):
+        snowflake = Snowflake('175928847299117063')
+
+        self.assertEqual(snowflake, 175928847299117063)
+        self.assertEqual(snowflake.timestamp, 1462015105796)
+        self.assertEqual(snowflake.created_at,
+                         datetime(2016, 4, 30, 11, 18, 25, 796000, timezone.utc))
+        self.assertEqual(snowflake.worker_id, 1)
+        self.assertEqual(snowflake.process_id, 0)
+        self.assertEqual(snowflake.increment, 7)
+        self.assertEqual('{}'.format(snowflake), '175928847299117063')
+
+    def test_from_datetime(self):
+        dt = datetime(2016, 4, 30, 11, 18, 25, 796000)
+        low = Snowflake.from_datetime(dt)
+        high = Snowflake.from_datetime(dt, high=True)
+
+        self.assertLessEqual(low, 175928847299117063)
+        self.assertGreaterEqual(high, 175928847299117063)
+        self.assertEqual(low.created_at, high.created_at)
+
+    def test_batch(self):
+        ids = snowflake_array(['175928847299117063', 41771983423143937, 80351110224678912])
+
+        self.assertEqual(ids.typecode, 'Q')
+        self.assertEqual(snowflake_timestamps(ids)[0], 1462015105796)
+
+        selected = snowflakes_between(ids, after=datetime(2016, 1, 1))
+        self.assertEqual(list(selected), [175928847299117063])
+
+        ordered = array('Q', sorted(ids))
+        self.assertEqual(list(snowflakes_between(ordered, after=ordered[0], ordered=True)),
+                         list(ordered[1:]))
+        self.assertEqual(list(snowflakes_between(ordered, before=ordered[2])),
+                         list(ordered[:2]))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        ids = numpy.array([175928847299117063, 41771983423143937], dtype=numpy.uint64)
+
+        self.assertEqual(snowflake_timestamps(ids)[0], 1462015105796)
+        self.assertEqual(list(snowflakes_between(ids, after=datetime(2016, 1, 1))),
+                         [175928847299117063])
+
+    def test_bulk_delete_limits(self):
+        async def main():
+            channel = ChannelWrapper('token', 1, http=None)
+            recent = Snowflake.from_datetime(datetime.now(timezone.utc) - timedelta(days=1))
+
+            with self.assertRaises(ValueError):
+                await channel.bulk_delete_messages([recent])
+            with self.assertRaises(ValueError):
+                await channel.bulk_delete_messages([recent, '175928847299117063'])
+
+        anyio.run(main)
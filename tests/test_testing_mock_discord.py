@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import anyio
+
+from clamor import HTTP, RetryPolicy, Routes
+from clamor.exceptions import NotFound
+from clamor.testing import MockDiscord, MockSession
+
+
+class MockDiscordTests(unittest.TestCase):
+    def test_routes(self):
+        api = MockDiscord()
+
+        self.assertEqual(api.match('GET', '/users/@me'), (Routes.GET_CURRENT_USER, {}))
+        self.assertEqual(api.match('GET', '/users/1'), (Routes.GET_USER, {'user': '1'}))
+        self.assertEqual(api.match('GET', '/nowhere'), (None, {}))
+
+    def test_default_responses(self):
+        async def main():
+            api = MockDiscord()
+            http = HTTP('token', session=MockSession(api))
+
+            gateway = await http.make_request(Routes.GET_GATEWAY)
+            self.assertEqual(gateway['url'], MockDiscord.GATEWAY_URL)
+
+            channel = await http.make_request(Routes.GET_CHANNEL, dict(channel=42))
+            self.assertEqual(channel, {'id': '42'})
+
+            message = await http.make_request(Routes.CREATE_MESSAGE, dict(channel=42),
+                                              json={'content': 'Hi'})
+            self.assertEqual(message['content'], 'Hi')
+            self.assertIn('id', message)
+
+            api.respond(Routes.GET_USER, lambda request: (404, {'message': 'Unknown User'}))
+            with self.assertRaises(NotFound):
+                await http.make_request(Routes.GET_USER, dict(user=1))
+
+            self.assertEqual(api.history[-1].params, {'user': '1'})
+
+        anyio.run(main)
+
+    def test_bucket_limits(self):
+        async def main():
+            api = MockDiscord(bucket_limit=2, bucket_reset=0.05)
+            http = HTTP('token', session=MockSession(api), cache_responses=False)
+
+            for _ in range(4):
+                await http.make_request(Routes.GET_CHANNEL, dict(channel=1))
+
+            # The client learns the limit from the first response.
+            self.assertEqual(api.requests, 4)
+            self.assertEqual(api.rate_limited, 0)
+
+            # Another channel is another bucket.
+            await http.make_request(Routes.GET_CHANNEL, dict(channel=2))
+            self.assertEqual(len(api._windows), 2)
+
+        anyio.run(main)
+
+    def test_rate_limited(self):
+        async def main():
+            api = MockDiscord(bucket_limit=1, bucket_reset=0.05)
+            status, headers, _ = await api.handle('GET', '/api/v7/channels/1', {}, b'')
+            self.assertEqual((status, headers['X-RateLimit-Remaining']), (200, '0'))
+
+            status, headers, _ = await api.handle('GET', '/api/v7/channels/1', {}, b'')
+            self.assertEqual(status, 429)
+            self.assertLessEqual(int(headers['Retry-After']), 50)
+
+            api = MockDiscord(global_limit=1)
+            await api.handle('GET', '/api/v7/channels/1', {}, b'')
+            status, headers, _ = await api.handle('GET', '/api/v7/channels/2', {}, b'')
+            self.assertEqual(status, 429)
+            self.assertEqual(headers['X-RateLimit-Global'], 'true')
+            self.assertEqual(api.global_rate_limited, 1)
+
+        anyio.run(main)
+
+    def test_injected_errors(self):
+        async def main():
+            api = MockDiscord(error_rate=0.5, seed=1, bucket_limit=100)
+            http = HTTP('token', session=MockSession(api),
+                        retry_policy=RetryPolicy(max_retries=10, base=0.001))
+
+            for _ in range(10):
+                await http.make_request(Routes.DELETE_MESSAGE, dict(channel=1, message=2))
+
+            self.assertGreater(api.injected_errors, 0)
+            self.assertEqual(api.requests, 10 + api.injected_errors)
+
+        anyio.run(main)